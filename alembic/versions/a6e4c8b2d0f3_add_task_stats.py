@@ -0,0 +1,64 @@
+"""add task stats rollup
+
+Creates the ``task_stats`` counters read by the task summary report and
+fills them from the existing tasks. Later changes keep them up to date from
+the task repository; ``python -m app.domain.tasks.stats`` rebuilds them.
+
+Revision ID: a6e4c8b2d0f3
+Revises: f1d3a7c9e5b2
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e4c8b2d0f3'
+down_revision: Union[str, Sequence[str], None] = 'f1d3a7c9e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_stats',
+        sa.Column('scope', sa.String(length=16), nullable=False),
+        sa.Column('scope_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'scope_id', 'status', 'priority'),
+    )
+    op.execute(
+        """
+        WITH contributions AS (
+            SELECT t.id,
+                   t.assigned_user_id,
+                   t.priority,
+                   CASE WHEN t.deleted_at IS NOT NULL THEN 'archived'
+                        ELSE t.status::text END AS status
+            FROM tasks t
+        )
+        INSERT INTO task_stats (scope, scope_id, status, priority, count)
+        SELECT scope, scope_id, status, priority, count(*)
+        FROM (
+            SELECT 'all' AS scope, 0 AS scope_id, c.status, c.priority FROM contributions c
+            UNION ALL
+            SELECT 'user', c.assigned_user_id, c.status, c.priority
+            FROM contributions c WHERE c.assigned_user_id IS NOT NULL
+            UNION ALL
+            SELECT 'family', u.family_id, c.status, c.priority
+            FROM contributions c JOIN users u ON u.id = c.assigned_user_id
+            WHERE u.family_id IS NOT NULL
+            UNION ALL
+            SELECT 'group', tg.group_id, c.status, c.priority
+            FROM contributions c JOIN task_groups tg ON tg.task_id = c.id
+        ) AS rows
+        GROUP BY scope, scope_id, status, priority
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_stats')
@@ -0,0 +1,80 @@
+"""add user task counters
+
+Adds per-user completion counters, maintained on every task write, so that
+achievement checks and progress reports stop counting a user's task
+history. The counters are filled from the existing tasks.
+
+Revision ID: a7c2e9f4b1d6
+Revises: f5a1c3e7b9d2
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e9f4b1d6'
+down_revision: Union[str, Sequence[str], None] = 'f5a1c3e7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_task_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('completed_tasks', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('reward_points', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('current_streak', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('longest_streak', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_completed_on', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.execute(
+        """
+        WITH completed AS (
+            SELECT t.assigned_user_id AS user_id,
+                   t.reward_points,
+                   (timezone(u.timezone, t.completed_at))::date AS day
+            FROM tasks t JOIN users u ON u.id = t.assigned_user_id
+            WHERE t.status = 'completed' AND t.deleted_at IS NULL
+        ),
+        totals AS (
+            SELECT user_id, count(*) AS completed_tasks, sum(reward_points) AS reward_points
+            FROM completed
+            GROUP BY user_id
+        ),
+        runs AS (
+            SELECT user_id, day,
+                   day - (row_number() OVER (PARTITION BY user_id ORDER BY day))::int AS run
+            FROM (SELECT DISTINCT user_id, day FROM completed WHERE day IS NOT NULL) AS days
+        ),
+        run_lengths AS (
+            SELECT user_id, count(*) AS days, max(day) AS last_day
+            FROM runs
+            GROUP BY user_id, run
+        ),
+        streaks AS (
+            SELECT user_id,
+                   (array_agg(days ORDER BY last_day DESC))[1] AS current_streak,
+                   max(days) AS longest_streak,
+                   max(last_day) AS last_completed_on
+            FROM run_lengths
+            GROUP BY user_id
+        )
+        INSERT INTO user_task_counters (
+            user_id, completed_tasks, reward_points,
+            current_streak, longest_streak, last_completed_on
+        )
+        SELECT totals.user_id, totals.completed_tasks, totals.reward_points,
+               coalesce(streaks.current_streak, 0), coalesce(streaks.longest_streak, 0),
+               streaks.last_completed_on
+        FROM totals LEFT JOIN streaks ON streaks.user_id = totals.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_task_counters')
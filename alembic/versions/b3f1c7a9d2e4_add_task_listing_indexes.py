@@ -0,0 +1,63 @@
+"""add task listing indexes
+
+Merges the outstanding heads and adds the composite indexes behind the
+filtered, keyset-paginated task listing.
+
+Revision ID: b3f1c7a9d2e4
+Revises: 1b7e0d2c431e, 2c0c26e660d5, 3a9f2f1d6c5b, 673cb1639efc, 8b1e2f91e9e7, 94eedaa9c884, 9d7c0c4a4b8c, a1b2c3d4e5f6, a2a8cfb93f7b, c5c3a0a73a9b
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f1c7a9d2e4'
+down_revision: Union[str, Sequence[str], None] = (
+    '1b7e0d2c431e',
+    '2c0c26e660d5',
+    '3a9f2f1d6c5b',
+    '673cb1639efc',
+    '8b1e2f91e9e7',
+    '94eedaa9c884',
+    '9d7c0c4a4b8c',
+    'a1b2c3d4e5f6',
+    'a2a8cfb93f7b',
+    'c5c3a0a73a9b',
+)
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_live_assignee_status',
+        'tasks',
+        ['assigned_user_id', 'status', 'id'],
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_tasks_live_status_priority',
+        'tasks',
+        ['status', 'priority', 'id'],
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_tasks_live_due_date',
+        'tasks',
+        ['due_date', 'id'],
+        postgresql_where=sa.text('deleted_at IS NULL'),
+    )
+    op.create_index(
+        'ix_task_groups_group_id_task_id',
+        'task_groups',
+        ['group_id', 'task_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_groups_group_id_task_id', table_name='task_groups')
+    op.drop_index('ix_tasks_live_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_live_status_priority', table_name='tasks')
+    op.drop_index('ix_tasks_live_assignee_status', table_name='tasks')
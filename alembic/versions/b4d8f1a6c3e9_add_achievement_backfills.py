@@ -0,0 +1,40 @@
+"""add achievement backfills
+
+Adds the checkpoint table of the achievement backfill, which awards
+automatic achievements to existing users in resumable chunks.
+
+Revision ID: b4d8f1a6c3e9
+Revises: a7c2e9f4b1d6
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d8f1a6c3e9'
+down_revision: Union[str, Sequence[str], None] = 'a7c2e9f4b1d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'achievement_backfills',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('last_user_id', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('awarded', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column(
+            'started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column(
+            'updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False
+        ),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('achievement_backfills')
@@ -0,0 +1,59 @@
+"""derive family and global task stats
+
+Drops the ``all`` and ``family`` counters of ``task_stats``, which report
+reads now sum from the per-user rows, and counts unassigned tasks in the
+sharded ``unassigned`` scope instead.
+
+Revision ID: c2e6a9d4f8b1
+Revises: b4d8f1a6c3e9
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e6a9d4f8b1'
+down_revision: Union[str, Sequence[str], None] = 'b4d8f1a6c3e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.domain.tasks.stats.UNASSIGNED_SHARDS.
+UNASSIGNED_SHARDS = 16
+
+
+def upgrade() -> None:
+    op.execute("DELETE FROM task_stats WHERE scope IN ('all', 'family')")
+    op.execute(
+        f"""
+        INSERT INTO task_stats (scope, scope_id, status, priority, count, points)
+        SELECT 'unassigned',
+               t.id % {UNASSIGNED_SHARDS},
+               CASE WHEN t.deleted_at IS NOT NULL THEN 'archived'
+                    ELSE t.status::text END AS status,
+               t.priority,
+               count(*),
+               sum(t.reward_points)
+        FROM tasks t
+        WHERE t.assigned_user_id IS NULL
+        GROUP BY 1, 2, 3, 4
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO task_stats (scope, scope_id, status, priority, count, points)
+        SELECT 'all', 0, s.status, s.priority, sum(s.count), sum(s.points)
+        FROM task_stats s
+        WHERE s.scope IN ('user', 'unassigned')
+        GROUP BY s.status, s.priority
+        UNION ALL
+        SELECT 'family', u.family_id, s.status, s.priority, sum(s.count), sum(s.points)
+        FROM task_stats s JOIN users u ON u.id = s.scope_id
+        WHERE s.scope = 'user' AND u.family_id IS NOT NULL
+        GROUP BY u.family_id, s.status, s.priority
+        """
+    )
+    op.execute("DELETE FROM task_stats WHERE scope = 'unassigned'")
@@ -0,0 +1,40 @@
+"""add task completion index
+
+Backs the completion trend report, which reads each assignee's live
+completions by ``completed_at`` range with an index-only scan.
+
+Revision ID: c8f2a4e6b1d9
+Revises: a6e4c8b2d0f3
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a4e6b1d9'
+down_revision: Union[str, Sequence[str], None] = 'a6e4c8b2d0f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_assigned_user_id_completed_at',
+            'tasks',
+            ['assigned_user_id', 'completed_at'],
+            postgresql_where=sa.text('completed_at IS NOT NULL AND deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_assigned_user_id_completed_at',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
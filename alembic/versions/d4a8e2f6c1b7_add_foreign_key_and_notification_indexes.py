@@ -0,0 +1,65 @@
+"""add foreign key and notification indexes
+
+Indexes the task foreign keys and notifications.user_id, which are filtered
+on by reports and achievement checks and scanned when a user is deleted.
+Built with CREATE INDEX CONCURRENTLY so the tables stay writable.
+
+tasks.status and tasks.deleted_at are already served by the partial indexes
+from b3f1c7a9d2e4, and group_memberships.user_id leads that table's primary
+key, so none of them get a separate index.
+
+Revision ID: d4a8e2f6c1b7
+Revises: b3f1c7a9d2e4
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8e2f6c1b7'
+down_revision: Union[str, Sequence[str], None] = 'b3f1c7a9d2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_assigned_user_id_status',
+            'tasks',
+            ['assigned_user_id', 'status'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_tasks_assigned_by_user_id',
+            'tasks',
+            ['assigned_by_user_id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_notifications_user_id_created_at',
+            'notifications',
+            ['user_id', 'created_at'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_notifications_user_id_created_at',
+            table_name='notifications',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_assigned_by_user_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_tasks_assigned_user_id_status',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
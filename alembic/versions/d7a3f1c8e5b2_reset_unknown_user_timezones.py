@@ -0,0 +1,34 @@
+"""reset unknown user timezones
+
+User time zones used to be stored unchecked. Completion counters, streaks
+and the completion trend convert timestamps with them in SQL, and Postgres
+rejects names it does not know, so such users are moved to UTC.
+
+Revision ID: d7a3f1c8e5b2
+Revises: c2e6a9d4f8b1
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a3f1c8e5b2'
+down_revision: Union[str, Sequence[str], None] = 'c2e6a9d4f8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE users
+        SET timezone = 'UTC'
+        WHERE timezone NOT IN (SELECT name FROM pg_timezone_names)
+        """
+    )
+
+
+def downgrade() -> None:
+    # The original names are not kept.
+    pass
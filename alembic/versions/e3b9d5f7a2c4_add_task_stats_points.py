@@ -0,0 +1,69 @@
+"""add task stats points
+
+Adds a reward point total to every ``task_stats`` counter and fills it from
+the existing tasks. Leaderboards rank members by the points of their
+completed tasks.
+
+Revision ID: e3b9d5f7a2c4
+Revises: c8f2a4e6b1d9
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9d5f7a2c4'
+down_revision: Union[str, Sequence[str], None] = 'c8f2a4e6b1d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'task_stats',
+        sa.Column('points', sa.BigInteger(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        WITH contributions AS (
+            SELECT t.id,
+                   t.assigned_user_id,
+                   t.priority,
+                   t.reward_points,
+                   CASE WHEN t.deleted_at IS NOT NULL THEN 'archived'
+                        ELSE t.status::text END AS status
+            FROM tasks t
+        ),
+        totals AS (
+            SELECT scope, scope_id, status, priority, sum(reward_points) AS points
+            FROM (
+                SELECT 'all' AS scope, 0 AS scope_id, c.status, c.priority, c.reward_points
+                FROM contributions c
+                UNION ALL
+                SELECT 'user', c.assigned_user_id, c.status, c.priority, c.reward_points
+                FROM contributions c WHERE c.assigned_user_id IS NOT NULL
+                UNION ALL
+                SELECT 'family', u.family_id, c.status, c.priority, c.reward_points
+                FROM contributions c JOIN users u ON u.id = c.assigned_user_id
+                WHERE u.family_id IS NOT NULL
+                UNION ALL
+                SELECT 'group', tg.group_id, c.status, c.priority, c.reward_points
+                FROM contributions c JOIN task_groups tg ON tg.task_id = c.id
+            ) AS rows
+            GROUP BY scope, scope_id, status, priority
+        )
+        UPDATE task_stats s
+        SET points = totals.points
+        FROM totals
+        WHERE s.scope = totals.scope
+          AND s.scope_id = totals.scope_id
+          AND s.status = totals.status
+          AND s.priority = totals.priority
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('task_stats', 'points')
@@ -0,0 +1,47 @@
+"""add task reminders
+
+Adds the reminder watermark table and the partial index over open tasks by
+due date that reminder sweeps range-scan.
+
+Revision ID: e7c2b5d9a3f1
+Revises: d4a8e2f6c1b7
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2b5d9a3f1'
+down_revision: Union[str, Sequence[str], None] = 'd4a8e2f6c1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_reminder_watermarks',
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('kind'),
+    )
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_open_due_date',
+            'tasks',
+            ['due_date'],
+            postgresql_where=sa.text("deleted_at IS NULL AND status <> 'completed'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_open_due_date',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
+    op.drop_table('task_reminder_watermarks')
@@ -0,0 +1,83 @@
+"""add task reminder markers
+
+Replaces the per-kind reminder watermarks, which skipped tasks created or
+rescheduled with a due date below the watermark, with a column per kind
+recording the due date each task was last reminded for. Tasks due up to
+the old watermark are marked as reminded, so the first sweep does not
+repeat reminders already sent.
+
+Revision ID: e9b4c2f7a1d3
+Revises: d7a3f1c8e5b2
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b4c2f7a1d3'
+down_revision: Union[str, Sequence[str], None] = 'd7a3f1c8e5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KINDS = ('due_soon', 'overdue')
+
+
+def upgrade() -> None:
+    for kind in KINDS:
+        op.add_column(
+            'tasks', sa.Column(f'{kind}_reminded_for', sa.DateTime(timezone=True), nullable=True)
+        )
+        # Without a watermark no sweep has run, and nothing already due is
+        # reminded of, as before.
+        op.execute(
+            f"""
+            UPDATE tasks
+            SET {kind}_reminded_for = due_date
+            WHERE due_date <= COALESCE(
+                (SELECT watermark FROM task_reminder_watermarks WHERE kind = '{kind}'),
+                now()
+            )
+            """
+        )
+    op.drop_table('task_reminder_watermarks')
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for kind in KINDS:
+            op.create_index(
+                f'ix_tasks_{kind}_reminder_pending',
+                'tasks',
+                ['due_date'],
+                postgresql_where=sa.text(
+                    "deleted_at IS NULL AND status <> 'completed' AND status <> 'cancelled'"
+                    " AND assigned_user_id IS NOT NULL"
+                    f" AND {kind}_reminded_for IS DISTINCT FROM due_date"
+                ),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for kind in KINDS:
+            op.drop_index(
+                f'ix_tasks_{kind}_reminder_pending',
+                table_name='tasks',
+                postgresql_concurrently=True,
+            )
+    op.create_table(
+        'task_reminder_watermarks',
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('kind'),
+    )
+    for kind in KINDS:
+        op.execute(
+            f"""
+            INSERT INTO task_reminder_watermarks (kind, watermark)
+            SELECT '{kind}', max({kind}_reminded_for) FROM tasks
+            HAVING max({kind}_reminded_for) IS NOT NULL
+            """
+        )
+        op.drop_column('tasks', f'{kind}_reminded_for')
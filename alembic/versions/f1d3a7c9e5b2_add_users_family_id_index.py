@@ -0,0 +1,34 @@
+"""add users family_id index
+
+Lets family-scoped reports resolve the family's members without scanning
+the users table.
+
+Revision ID: f1d3a7c9e5b2
+Revises: e7c2b5d9a3f1
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d3a7c9e5b2'
+down_revision: Union[str, Sequence[str], None] = 'e7c2b5d9a3f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_family_id',
+            'users',
+            ['family_id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_users_family_id', table_name='users', postgresql_concurrently=True)
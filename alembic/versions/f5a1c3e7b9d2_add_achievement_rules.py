@@ -0,0 +1,38 @@
+"""add achievement rules
+
+Lets achievements declare a metric and a threshold at which they are
+awarded automatically. The hard-coded "First Task Completed" milestone
+becomes a rule on the completed task count.
+
+Revision ID: f5a1c3e7b9d2
+Revises: e3b9d5f7a2c4
+Create Date: 2026-10-17 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a1c3e7b9d2'
+down_revision: Union[str, Sequence[str], None] = 'e3b9d5f7a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('achievements', sa.Column('metric', sa.String(length=32), nullable=True))
+    op.add_column('achievements', sa.Column('threshold', sa.Integer(), nullable=True))
+    op.create_check_constraint(
+        'ck_achievements_rule', 'achievements', '(metric IS NULL) = (threshold IS NULL)'
+    )
+    op.execute(
+        "UPDATE achievements SET metric = 'completed_tasks', threshold = 1"
+        " WHERE name = 'First Task Completed'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_achievements_rule', 'achievements', type_='check')
+    op.drop_column('achievements', 'threshold')
+    op.drop_column('achievements', 'metric')
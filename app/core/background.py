@@ -0,0 +1,57 @@
+"""Periodic background jobs tied to the application lifespan."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Run a coroutine function repeatedly with a pause between runs.
+
+    The first run starts after ``initial_delay_seconds``. Failures are logged
+    and the job keeps running; :meth:`stop` cancels it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[object]],
+        interval_seconds: float,
+        initial_delay_seconds: float = 0,
+    ) -> None:
+        self.name = name
+        self.job = job
+        self.interval_seconds = interval_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Schedule the job on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """Cancel the job and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        if self.initial_delay_seconds:
+            await asyncio.sleep(self.initial_delay_seconds)
+        while True:
+            try:
+                await self.job()
+            except Exception:
+                logger.exception("Background job %s failed", self.name)
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,153 @@
+"""In-process result caches with a TTL, LRU eviction and tag invalidation.
+
+Every entry carries tags naming the rows it was computed from, such as
+``("user", 5)``. Writers call :func:`invalidate_after_commit` with the tags
+they touched and, once their transaction commits, matching entries are
+dropped from every cache. The TTL bounds how stale an entry can get through
+writes this process does not see, for example from another worker.
+"""
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Set, Tuple
+from weakref import WeakValueDictionary
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.transactions import after_commit
+
+Tag = Tuple[str, Hashable]
+
+_caches: "WeakValueDictionary[str, TTLCache]" = WeakValueDictionary()
+
+
+@dataclass
+class CacheStats:
+    """Counters of one cache since it was created."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    tags: Tuple[Tag, ...]
+
+
+class TTLCache:
+    """LRU cache whose entries expire after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._keys_by_tag: Dict[Tag, Set[Hashable]] = {}
+        # Bumped on every invalidation, so loads that raced one are not stored.
+        self._generation = 0
+        _caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            self._discard(key)
+            self.stats.expirations += 1
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return True, entry.value
+
+    def _store(self, key: Hashable, value: Any, tags: Iterable[Tag]) -> None:
+        if key in self._entries:
+            self._discard(key)
+        entry = _Entry(value, self._clock() + self.ttl_seconds, tuple(set(tags)))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Tuple[Any, Iterable[Tag]]]]
+    ) -> Any:
+        """
+        Return the cached value for ``key``, loading and storing it on a miss.
+
+        ``loader`` returns the value together with the tags it depends on.
+        A value is not stored if an invalidation happened while it loaded,
+        since it may predate the write that caused it.
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+        generation = self._generation
+        value, tags = await loader()
+        if generation == self._generation:
+            self._store(key, value, tags)
+        return value
+
+    def invalidate(self, tags: Iterable[Tag]) -> None:
+        """Drop every entry carrying one of ``tags``."""
+        self._generation += 1
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._discard(key)
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+
+def invalidate(tags: Iterable[Tag]) -> None:
+    """Drop entries carrying one of ``tags`` from every cache."""
+    tags = set(tags)
+    for cache in list(_caches.values()):
+        cache.invalidate(tags)
+
+
+def invalidate_after_commit(session: AsyncSession, tags: Iterable[Tag]) -> None:
+    """Invalidate ``tags`` in every cache once the session's transaction commits."""
+    tags = set(tags)
+    if tags:
+        after_commit(session, lambda: invalidate(tags))
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return the counters and current size of every live cache by name."""
+    return {
+        name: {**asdict(cache.stats), "size": len(cache)}
+        for name, cache in sorted(_caches.items())
+    }
@@ -21,6 +21,42 @@ class BaseConfig(BaseModel):
     cors_allow_methods: List[str] = ["*"]
     cors_allow_headers: List[str] = ["*"]
 
+    query_count_header: bool = True
+
+    reminders_enabled: bool = True
+    reminder_interval_seconds: int = 60
+    reminder_lead_time_minutes: int = 24 * 60
+    reminder_batch_size: int = 1000
+
+    report_cache_max_entries: int = 1024
+    report_cache_ttl_seconds: float = 30
+    # Reports one dashboard request may run at once, each on its own
+    # connection. Keep it well below the connection pool size.
+    dashboard_concurrency: int = 3
+
+    # Leaderboards are updated in place by this process's writes and fully
+    # reloaded at this interval to pick up everything else.
+    leaderboard_reload_seconds: int = 300
+
+    # Achievements of users completing tasks are evaluated after the request
+    # by this many workers, up to a batch of users at a time. Completions
+    # arriving while max_pending users are already waiting are dropped.
+    achievement_workers: int = 2
+    achievement_batch_size: int = 100
+    achievement_queue_max_pending: int = 10_000
+    achievement_drain_seconds: float = 10
+
+    # Password hashing runs on this many threads per process. Logins and
+    # password changes beyond that wait, up to password_hash_max_queue of
+    # them; any more are answered with 503.
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64
+
+    # Authenticated users' id, role and status are cached per process. A
+    # change made through another worker takes up to the TTL to apply here.
+    principal_cache_max_entries: int = 10_000
+    principal_cache_ttl_seconds: float = 30
+
 
 class DevConfig(BaseConfig):
     pass
@@ -28,10 +64,12 @@ class DevConfig(BaseConfig):
 
 class ProdConfig(BaseConfig):
     cors_allow_origins: List[str] = []
+    query_count_header: bool = False
 
 
 class TestConfig(BaseConfig):
     db_name: str = "tasks_test_db"
+    reminders_enabled: bool = False
 
 
 class Settings(BaseSettings):
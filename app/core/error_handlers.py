@@ -7,22 +7,30 @@ from app.core.exceptions import (
     AuthenticationError,
     AuthorizationError,
     NotFoundError,
+    ServiceUnavailableError,
 )
 
 logger = logging.getLogger(__name__)
 
+# Sent with 503 responses; overload from a burst clears within seconds.
+RETRY_AFTER_SECONDS = 1
+
 
 async def exception_handler(request: Request, exc: AppError) -> JSONResponse:
     """Handle application-level exceptions and return JSON responses."""
     status_code = status.HTTP_400_BAD_REQUEST
+    headers = None
     if isinstance(exc, AuthenticationError):
         status_code = status.HTTP_401_UNAUTHORIZED
     elif isinstance(exc, AuthorizationError):
         status_code = status.HTTP_403_FORBIDDEN
     elif isinstance(exc, NotFoundError):
         status_code = status.HTTP_404_NOT_FOUND
+    elif isinstance(exc, ServiceUnavailableError):
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        headers = {"Retry-After": str(RETRY_AFTER_SECONDS)}
     detail = str(exc) or exc.__class__.__name__
-    return JSONResponse(status_code=status_code, content={"detail": detail})
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
 
 
 async def http_exception_handler(
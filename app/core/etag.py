@@ -0,0 +1,41 @@
+"""Entity tags for conditional GET requests."""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a weak ETag from the values identifying a resource version.
+
+    Callers pass cheap version markers such as ids and ``updated_at``
+    timestamps, so the tag can be computed without serializing the resource.
+    """
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=16)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an ``If-None-Match`` header value against ``etag``.
+
+    Uses the weak comparison required for ``If-None-Match``: the ``W/``
+    prefix is ignored on both sides.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    expected = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == expected for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    """Return an empty 304 response carrying ``etag``."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
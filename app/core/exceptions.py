@@ -30,6 +30,13 @@ class AuthorizationError(AppError):
     detail = "Not authorized"
 
 
+class ServiceUnavailableError(AppError):
+    """Raised when the server is too busy to take the request; clients may retry."""
+
+    status_code = 503
+    detail = "Service temporarily overloaded, try again later"
+
+
 class NotFoundError(AppError):
     """Raised when a requested entity does not exist."""
 
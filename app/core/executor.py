@@ -0,0 +1,117 @@
+"""Bounded thread pool for blocking calls made from async code.
+
+CPU-bound calls such as password hashing block the event loop, and with it
+every other request of the worker, for as long as they run. A
+``BoundedExecutor`` runs them on a fixed number of threads instead. Calls
+beyond the free threads wait in line, up to ``max_queue`` of them; further
+calls are rejected with ``ServiceUnavailableError`` straight away, so a
+burst sheds load instead of building an unbounded backlog.
+
+Each executor counts its calls and the time they spent waiting for a thread
+and running on it; ``executor_stats`` reports them.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+import time
+from typing import Callable, Dict, TypeVar
+from weakref import WeakValueDictionary
+
+from app.core.exceptions import ServiceUnavailableError
+
+T = TypeVar("T")
+
+_executors: "WeakValueDictionary[str, BoundedExecutor]" = WeakValueDictionary()
+
+
+@dataclass
+class ExecutorStats:
+    """Counters of one executor since it was created."""
+
+    submitted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    # Largest number of calls waiting or running at once.
+    peak_pending: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+    run_seconds_max: float = 0.0
+
+
+class BoundedExecutor:
+    """Thread pool with a bounded waiting line."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        if max_workers <= 0 or max_queue < 0:
+            raise ValueError("max_workers must be positive and max_queue not negative")
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.stats = ExecutorStats()
+        self._pending = 0
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        _executors[name] = self
+
+    @property
+    def pending(self) -> int:
+        """Calls waiting for a thread or running on one."""
+        return self._pending
+
+    def _timed(self, submitted_at: float, function: Callable[..., T], *args) -> T:
+        started_at = time.perf_counter()
+        waited = started_at - submitted_at
+        try:
+            return function(*args)
+        finally:
+            ran = time.perf_counter() - started_at
+            # Only ever updated from pool threads; losing an increment to a
+            # race skews a metric, never a result.
+            stats = self.stats
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+            stats.run_seconds_total += ran
+            stats.run_seconds_max = max(stats.run_seconds_max, ran)
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """
+        Run ``function(*args)`` on a pool thread and return its result.
+
+        Raises:
+            ServiceUnavailableError: If ``max_workers + max_queue`` calls are
+                already waiting or running
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            self.stats.rejected += 1
+            raise ServiceUnavailableError
+        self._pending += 1
+        self.stats.submitted += 1
+        self.stats.peak_pending = max(self.stats.peak_pending, self._pending)
+        loop = asyncio.get_running_loop()
+        future = self._pool.submit(self._timed, time.perf_counter(), function, *args)
+        # A call keeps its place until its thread is done with it, even when
+        # the caller stops waiting for the result.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception:
+            self.stats.failed += 1
+            raise
+        self.stats.completed += 1
+        return result
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Finish the calls already submitted and stop the threads."""
+        self._pool.shutdown(wait=True, cancel_futures=False)
+
+
+def executor_stats() -> Dict[str, Dict[str, float]]:
+    """Return the counters and current load of every live executor by name."""
+    return {
+        name: {**asdict(executor.stats), "pending": executor.pending}
+        for name, executor in sorted(_executors.items())
+    }
@@ -0,0 +1,106 @@
+"""Postgres LISTEN/NOTIFY helpers for propagating changes between processes.
+
+A ``NOTIFY`` issued inside a transaction is delivered when it commits, so a
+writer can announce a change in the same transaction that makes it, and
+every process listening on the channel hears about it only once the change
+is visible.
+"""
+import asyncio
+import logging
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+async def notify(session: AsyncSession, channel: str, payload: str = "") -> None:
+    """Send a notification on ``channel`` when the session's transaction commits."""
+    await session.execute(select(func.pg_notify(channel, payload)))
+
+
+class ChannelListener:
+    """Call ``on_notify`` for every notification sent on a channel.
+
+    The listener holds one pooled connection for as long as it runs and
+    pings it every ``check_seconds``. When the connection is lost it
+    reconnects after ``retry_seconds`` and calls ``on_connect``, since
+    notifications sent in between are lost.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_connect: Optional[Callable[[], None]] = None,
+        check_seconds: float = 30,
+        retry_seconds: float = 5,
+    ) -> None:
+        self.engine = engine
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_connect = on_connect
+        self.check_seconds = check_seconds
+        self.retry_seconds = retry_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._listening = asyncio.Event()
+
+    def start(self) -> None:
+        """Start listening on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"listen-{self.channel}")
+
+    async def wait_listening(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the channel is being listened on; return False on timeout."""
+        try:
+            await asyncio.wait_for(self._listening.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        """Stop listening and return the connection to the pool."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _deliver(self, connection, pid, channel, payload) -> None:
+        try:
+            self.on_notify(payload)
+        except Exception:
+            logger.exception("Handling a notification on %s failed", self.channel)
+
+    async def _listen(self) -> None:
+        async with self.engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            await driver_connection.add_listener(self.channel, self._deliver)
+            try:
+                if self.on_connect is not None:
+                    self.on_connect()
+                self._listening.set()
+                while True:
+                    await asyncio.sleep(self.check_seconds)
+                    # Ping outside of any transaction: a session that stays
+                    # in one receives no notifications until it ends.
+                    await driver_connection.execute("SELECT 1")
+            finally:
+                self._listening.clear()
+                if not driver_connection.is_closed():
+                    # UNLISTEN before the connection goes back to the pool.
+                    await driver_connection.remove_listener(self.channel, self._deliver)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception("Listening on %s failed, reconnecting", self.channel)
+            await asyncio.sleep(self.retry_seconds)
@@ -0,0 +1,77 @@
+"""Per-request SQL query counting.
+
+A cursor-execute listener on the engine increments the counter bound to the
+current context, and :class:`QueryCountMiddleware` binds a fresh counter to
+every HTTP request and reports the total in the ``X-Query-Count`` header.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+@dataclass
+class QueryCount:
+    """Mutable number of statements executed in a context."""
+
+    value: int = 0
+
+
+_current_count: ContextVar[Optional[QueryCount]] = ContextVar("query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current_count.get()
+    if counter is not None:
+        counter.value += 1
+
+
+def install_query_counter(engine: Engine) -> None:
+    """Count statements executed through ``engine``.
+
+    Pass ``AsyncEngine.sync_engine`` for async engines.
+    """
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """Count the statements executed inside the ``with`` block."""
+    counter = QueryCount()
+    token = _current_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_count.reset(token)
+
+
+class QueryCountMiddleware:
+    """ASGI middleware adding the number of SQL queries to each response."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+
+            async def send_with_count(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (QUERY_COUNT_HEADER.lower().encode(), str(counter.value).encode())
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
@@ -0,0 +1,109 @@
+"""In-memory score rankings for leaderboards.
+
+Every board keeps its members sorted by score in a plain list, so top-N and
+rank lookups are a slice or a binary search. Boards are keyed by any
+hashable, and a member's score is shared by every board they belong to.
+"""
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class LeaderboardEntry(NamedTuple):
+    rank: int
+    user_id: int
+    score: int
+
+
+class Leaderboard:
+    """Members of one board ordered by descending score.
+
+    Tied members share a rank and are listed by user id.
+    """
+
+    def __init__(self) -> None:
+        # (-score, user_id) in ascending order.
+        self._ranking: List[Tuple[int, int]] = []
+        self._scores: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def set_score(self, user_id: int, score: int) -> None:
+        self.discard(user_id)
+        self._scores[user_id] = score
+        insort(self._ranking, (-score, user_id))
+
+    def discard(self, user_id: int) -> None:
+        score = self._scores.pop(user_id, None)
+        if score is not None:
+            del self._ranking[bisect_left(self._ranking, (-score, user_id))]
+
+    def top(self, limit: int) -> List[LeaderboardEntry]:
+        entries: List[LeaderboardEntry] = []
+        for index, (negative_score, user_id) in enumerate(self._ranking[:limit]):
+            if entries and entries[-1].score == -negative_score:
+                rank = entries[-1].rank
+            else:
+                rank = index + 1
+            entries.append(LeaderboardEntry(rank, user_id, -negative_score))
+        return entries
+
+    def rank(self, user_id: int) -> Optional[LeaderboardEntry]:
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return LeaderboardEntry(bisect_left(self._ranking, (-score,)) + 1, user_id, score)
+
+
+class Leaderboards:
+    """A set of boards over shared member scores."""
+
+    def __init__(self) -> None:
+        self._boards: Dict[Hashable, Leaderboard] = {}
+        self._scores: Dict[int, int] = {}
+        self._boards_by_user: Dict[int, Set[Hashable]] = {}
+        # Bumped by every score change, so a load that raced one is refused.
+        self.generation = 0
+
+    def load(
+        self,
+        scores: Dict[int, int],
+        memberships: Iterable[Tuple[Hashable, int]],
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Replace every board with ``(board key, user id)`` memberships and scores.
+
+        Pass the ``generation`` read before the scores were. If points were
+        added since, the scores may predate them and the boards are left as
+        they are.
+
+        Returns:
+            Whether the boards were replaced
+        """
+        if generation is not None and generation != self.generation:
+            return False
+        boards: Dict[Hashable, Leaderboard] = {}
+        boards_by_user: Dict[int, Set[Hashable]] = {}
+        for key, user_id in memberships:
+            boards.setdefault(key, Leaderboard()).set_score(user_id, scores.get(user_id, 0))
+            boards_by_user.setdefault(user_id, set()).add(key)
+        self._boards, self._scores, self._boards_by_user = boards, dict(scores), boards_by_user
+        return True
+
+    def add_points(self, deltas: Dict[int, int]) -> None:
+        """Add score changes keyed by user id to every board of the user."""
+        self.generation += 1
+        for user_id, delta in deltas.items():
+            score = self._scores.get(user_id, 0) + delta
+            self._scores[user_id] = score
+            for key in self._boards_by_user.get(user_id, ()):
+                self._boards[key].set_score(user_id, score)
+
+    def top(self, key: Hashable, limit: int) -> List[LeaderboardEntry]:
+        board = self._boards.get(key)
+        return board.top(limit) if board is not None else []
+
+    def rank(self, key: Hashable, user_id: int) -> Optional[LeaderboardEntry]:
+        board = self._boards.get(key)
+        return board.rank(user_id) if board is not None else None
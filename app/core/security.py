@@ -1,6 +1,6 @@
 import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, NamedTuple, Optional
 
 from jwt import PyJWTError, decode, encode
 from fastapi import Depends
@@ -11,8 +11,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_database_session
 from app.domain.users.models import User, UserStatus, UserRole
+from app.core.cache import Tag, TTLCache
 from app.core.config import settings
 from app.core.exceptions import AuthenticationError, AuthorizationError
+from app.core.executor import BoundedExecutor
 
 ALGORITHM = settings.current_config.algorithm
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.current_config.access_token_expire_minutes
@@ -20,14 +22,31 @@ RESET_TOKEN_EXPIRE_MINUTES = settings.current_config.reset_token_expire_minutes
 SECRET_KEY = settings.current_config.secret_key
 
 password_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt releases the GIL while it hashes, so threads run it in parallel and
+# leave the event loop free.
+password_executor = BoundedExecutor(
+    "passwords",
+    max_workers=settings.current_config.password_hash_workers,
+    max_queue=settings.current_config.password_hash_max_queue,
+)
 
 
-def hash_password(password: str) -> str:
-    return password_context.hash(password)
+async def hash_password(password: str) -> str:
+    """Hash a password on the password executor.
 
+    Raises:
+        ServiceUnavailableError: If the executor's waiting line is full
+    """
+    return await password_executor.run(password_context.hash, password)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return password_context.verify(plain_password, hashed_password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Check a password against its hash on the password executor.
+
+    Raises:
+        ServiceUnavailableError: If the executor's waiting line is full
+    """
+    return await password_executor.run(password_context.verify, plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -58,6 +77,29 @@ def verify_reset_token(user: User, token: str) -> bool:
 oauth2_scheme = HTTPBearer()
 
 
+class Principal(NamedTuple):
+    """Identity and access level of an authenticated user."""
+
+    id: int
+    role: UserRole
+    status: UserStatus
+    is_active: bool
+
+
+# Principals by user id. UserRepository drops a user's entry when a change
+# to it commits; the TTL bounds how long other workers keep the old one.
+principal_cache = TTLCache(
+    "principals",
+    max_entries=settings.current_config.principal_cache_max_entries,
+    ttl_seconds=settings.current_config.principal_cache_ttl_seconds,
+)
+
+
+def principal_tag(user_id: int) -> Tag:
+    """Cache tag of a user's principal."""
+    return ("principal", user_id)
+
+
 def decode_access_token(token: str) -> Dict[str, Any]:
     """Decode a JWT token and return the payload."""
     try:
@@ -69,29 +111,41 @@ def decode_access_token(token: str) -> Dict[str, Any]:
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_database_session),
-) -> User:
-    """Return the currently authenticated user based on the JWT token."""
+) -> Principal:
+    """Return the currently authenticated user based on the JWT token.
+
+    The principal is read from ``principal_cache``; a miss loads it with one
+    single-row query. The session only takes a connection on a miss.
+    """
     payload = decode_access_token(credentials.credentials)
     user_id = payload.get("sub")
     if user_id is None:
         raise AuthenticationError("Invalid token payload")
-
-    statement = select(User).where(User.id == bindparam("user_id_param"))
-    result = await session.execute(statement, {"user_id_param": int(user_id)})
-    user = result.scalar_one_or_none()
-    if user is None:
+    user_id = int(user_id)
+
+    async def load():
+        statement = select(User.id, User.role, User.status, User.is_active).where(
+            User.id == bindparam("user_id_param")
+        )
+        result = await session.execute(statement, {"user_id_param": user_id})
+        row = result.first()
+        principal: Optional[Principal] = None if row is None else Principal(*row)
+        return principal, [principal_tag(user_id)]
+
+    principal = await principal_cache.get_or_load(user_id, load)
+    if principal is None:
         raise AuthenticationError("User not found")
-    return user
+    return principal
 
 
-async def get_current_active_user(user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(user: Principal = Depends(get_current_user)) -> Principal:
     """Ensure the user is active."""
     if not user.is_active or user.status != UserStatus.ACTIVE:
         raise AuthenticationError("Inactive user")
     return user
 
 
-async def get_current_admin(user: User = Depends(get_current_active_user)) -> User:
+async def get_current_admin(user: Principal = Depends(get_current_active_user)) -> Principal:
     """Ensure the user has administrative privileges."""
     if user.role != UserRole.ADMIN:
         raise AuthorizationError("Admin privileges required")
@@ -0,0 +1,87 @@
+"""Helpers for streaming large result sets to clients."""
+import csv
+from enum import Enum
+import io
+from typing import AsyncIterator, Sequence, Type
+
+from pydantic import BaseModel
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+# Leading characters that make spreadsheet applications evaluate a cell.
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportFormat(str, Enum):
+    """Response formats offered by exportable endpoints."""
+
+    JSON = "json"
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
+async def ndjson_lines(batches: AsyncIterator[Sequence[BaseModel]]) -> AsyncIterator[bytes]:
+    """Serialize batches of models as newline-delimited JSON.
+
+    Each batch is encoded and yielded as one chunk, so only a single batch is
+    held in memory at a time regardless of the total number of rows.
+    """
+    async for batch in batches:
+        if batch:
+            yield b"".join(item.model_dump_json().encode() + b"\n" for item in batch)
+
+
+def _csv_cell(value: object) -> object:
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def csv_lines(
+    batches: AsyncIterator[Sequence[BaseModel]], model: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """Serialize batches of flat models as CSV with a header row.
+
+    Columns follow the field order of ``model``. Like :func:`ndjson_lines`,
+    one chunk is yielded per batch. Text that a spreadsheet would evaluate
+    as a formula is prefixed with a quote.
+    """
+    fields = list(model.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for batch in batches:
+        if not batch:
+            continue
+        for item in batch:
+            row = item.model_dump(mode="json")
+            writer.writerow([_csv_cell(row[field]) for field in fields])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    batches: AsyncIterator[Sequence[BaseModel]],
+    model: Type[BaseModel],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Stream ``batches`` as a CSV or NDJSON download named ``filename``."""
+    if export_format is ExportFormat.CSV:
+        body, media_type, extension = csv_lines(batches, model), CSV_MEDIA_TYPE, "csv"
+    elif export_format is ExportFormat.NDJSON:
+        body, media_type, extension = ndjson_lines(batches), NDJSON_MEDIA_TYPE, "ndjson"
+    else:
+        raise ValueError(f"{export_format.value} is not a streamed format")
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
@@ -0,0 +1,35 @@
+"""Time zone names users may choose.
+
+Reports and completion counters convert timestamps with the user's zone in
+SQL, so a stored name has to be one Postgres knows. The zoneinfo database
+also carries the ``posix/`` and ``right/`` trees and a few files describing
+the host, none of which Postgres lists in ``pg_timezone_names``.
+"""
+from functools import lru_cache
+from typing import Annotated, FrozenSet
+from zoneinfo import available_timezones
+
+from pydantic import AfterValidator
+
+EXCLUDED_PREFIXES = ("posix/", "right/")
+EXCLUDED_NAMES = frozenset({"Factory", "localtime", "posixrules"})
+
+
+@lru_cache(maxsize=None)
+def timezone_names() -> FrozenSet[str]:
+    """Return the IANA zone names both zoneinfo and Postgres accept."""
+    return frozenset(
+        name
+        for name in available_timezones()
+        if not name.startswith(EXCLUDED_PREFIXES) and name not in EXCLUDED_NAMES
+    )
+
+
+def validate_timezone(value: str) -> str:
+    """Accept only IANA zone names Postgres can convert with."""
+    if value not in timezone_names():
+        raise ValueError(f"Unknown time zone: {value}")
+    return value
+
+
+TimezoneName = Annotated[str, AfterValidator(validate_timezone)]
@@ -0,0 +1,33 @@
+"""Hooks that run when a session's transaction commits."""
+import logging
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+
+def after_commit(session: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the session's current transaction commits.
+
+    Callbacks registered in a transaction that rolls back are discarded.
+    """
+    session.info.setdefault(AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT_CALLBACKS, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT_CALLBACKS, None)
@@ -0,0 +1,154 @@
+"""In-process queue that coalesces keyed events and handles them in batches.
+
+Producers push keys, such as user ids, without waiting. A key already
+waiting is not queued twice, so a burst of events for the same key is
+handled once. A fixed pool of worker tasks takes up to ``batch_size`` keys
+at a time and passes them to the handler.
+
+The queue holds at most ``max_pending`` keys. Keys pushed while it is full
+are dropped and counted, so producers never block on a slow handler; the
+``pending`` and ``dropped`` counters show when that starts to happen.
+"""
+import asyncio
+from dataclasses import asdict, dataclass
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional
+from weakref import WeakValueDictionary
+
+logger = logging.getLogger(__name__)
+
+_queues: "WeakValueDictionary[str, WorkQueue]" = WeakValueDictionary()
+
+
+@dataclass
+class QueueStats:
+    """Counters of one queue since it was created."""
+
+    enqueued: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    processed: int = 0
+    failed: int = 0
+    batches: int = 0
+    # Largest backlog seen.
+    peak_pending: int = 0
+
+
+class WorkQueue:
+    """Bounded, coalescing queue drained by a pool of worker tasks."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Hashable]], Awaitable[object]],
+        workers: int,
+        batch_size: int,
+        max_pending: int,
+    ) -> None:
+        if workers <= 0 or batch_size <= 0 or max_pending <= 0:
+            raise ValueError("workers, batch_size and max_pending must be positive")
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.stats = QueueStats()
+        # Dict keys keep insertion order, so keys are handled first in, first out.
+        self._pending: Dict[Hashable, None] = {}
+        self._in_flight = 0
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks: List[asyncio.Task] = []
+        self._accepting = True
+        _queues[name] = self
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def in_flight(self) -> int:
+        """Batches being handled right now."""
+        return self._in_flight
+
+    def put_many(self, keys: Iterable[Hashable]) -> None:
+        """Queue keys for handling; never blocks."""
+        for key in keys:
+            if key in self._pending:
+                self.stats.coalesced += 1
+            elif not self._accepting or len(self._pending) >= self.max_pending:
+                self.stats.dropped += 1
+            else:
+                self._pending[key] = None
+                self.stats.enqueued += 1
+        self.stats.peak_pending = max(self.stats.peak_pending, len(self._pending))
+        if self._pending:
+            self._idle.clear()
+            self._ready.set()
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if not self._tasks:
+            self._accepting = True
+            self._tasks = [
+                asyncio.create_task(self._work(), name=f"{self.name}-{index}")
+                for index in range(self.workers)
+            ]
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop accepting keys, finish the queued ones and stop the workers.
+
+        Keys still queued after ``timeout`` seconds are abandoned.
+        """
+        self._accepting = False
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._idle.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Queue %s abandoned %s keys on shutdown", self.name, len(self._pending)
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _take_batch(self) -> List[Hashable]:
+        batch = []
+        for key in self._pending:
+            batch.append(key)
+            if len(batch) == self.batch_size:
+                break
+        for key in batch:
+            del self._pending[key]
+        if not self._pending:
+            self._ready.clear()
+        return batch
+
+    async def _work(self) -> None:
+        while True:
+            await self._ready.wait()
+            batch = self._take_batch()
+            if not batch:
+                continue
+            self._in_flight += 1
+            try:
+                await self.handler(batch)
+                self.stats.processed += len(batch)
+            except Exception:
+                self.stats.failed += len(batch)
+                logger.exception("Queue %s failed to handle %s keys", self.name, len(batch))
+            finally:
+                self.stats.batches += 1
+                self._in_flight -= 1
+                if not self._pending and not self._in_flight:
+                    self._idle.set()
+
+
+def queue_stats() -> Dict[str, Dict[str, int]]:
+    """Return the counters and current backlog of every live queue by name."""
+    return {
+        name: {**asdict(queue.stats), "pending": len(queue), "in_flight": queue.in_flight}
+        for name, queue in sorted(_queues.items())
+    }
@@ -78,6 +78,11 @@ class DatabaseSessionManager:
         """Expose configured session factory."""
         return self._session_factory
 
+    @property
+    def engine(self) -> AsyncEngine:
+        """Expose the underlying async engine."""
+        return self._engine
+
 
     async def close(self) -> None:
         """Close the database engine and release all resources."""
@@ -1,16 +1,27 @@
 """Application dependency injection container."""
 
+from datetime import timedelta
+
 from dependency_injector import containers, providers
 
+from app.core.cache import TTLCache
+from app.core.work_queue import WorkQueue
+from app.core.config import settings
+
 from app.database import UnitOfWork, DatabaseSessionManager
 from app.domain.users.repository import UserRepository
+from app.domain.achievements.catalog import AchievementCatalog
+from app.domain.achievements.repository import AchievementRepository
 from app.domain.tasks.repository import TaskRepository
+from app.domain.tasks.reminders import TaskReminderRepository, TaskReminderService
+from app.domain.tasks.leaderboard import LeaderboardRepository, LeaderboardService
 from app.domain.families.repository import FamilyRepository
 from app.domain.notifications.repository import NotificationRepository
 from app.domain.settings.repository import SettingRepository
 from app.domain.groups.repository import GroupRepository
 
 from app.domain.users.service import UserService
+from app.domain.achievements.service import AchievementService
 from app.domain.tasks.service import TaskService
 from app.domain.admin.service import AdminService
 from app.domain.auth.service import AuthService
@@ -29,13 +40,36 @@ class Container(containers.DeclarativeContainer):
     # Unit of work provider
     uow = providers.Factory(UnitOfWork, session_factory=db_manager.provided.session_factory)
 
+    # Achievement evaluation, which task repositories hand completions to
+    achievement_catalog = providers.Singleton(
+        AchievementCatalog, unit_of_work_factory=uow.provider
+    )
+    achievement_repository = providers.Factory(
+        AchievementRepository, catalog=achievement_catalog
+    )
+    achievement_service = providers.Factory(
+        AchievementService,
+        repository_factory=achievement_repository,
+        unit_of_work_factory=uow.provider,
+    )
+    achievement_queue = providers.Singleton(
+        WorkQueue,
+        name="achievements",
+        handler=achievement_service.provided.evaluate_achievements,
+        workers=settings.current_config.achievement_workers,
+        batch_size=settings.current_config.achievement_batch_size,
+        max_pending=settings.current_config.achievement_queue_max_pending,
+    )
+
     # Repository providers
     user_repository = providers.Factory(UserRepository)
-    task_repository = providers.Factory(TaskRepository)
+    task_repository = providers.Factory(TaskRepository, achievement_queue=achievement_queue)
+    task_reminder_repository = providers.Factory(TaskReminderRepository)
     family_repository = providers.Factory(FamilyRepository)
     notification_repository = providers.Factory(NotificationRepository)
     setting_repository = providers.Factory(SettingRepository)
     group_repository = providers.Factory(GroupRepository)
+    leaderboard_repository = providers.Factory(LeaderboardRepository)
 
     # Service providers
     user_service = providers.Factory(
@@ -67,7 +101,29 @@ class Container(containers.DeclarativeContainer):
     group_service = providers.Factory(
         GroupService, repository_factory=group_repository, unit_of_work=uow
     )
-    report_service = providers.Factory(ReportService, unit_of_work=uow)
+    report_cache = providers.Singleton(
+        TTLCache,
+        name="reports",
+        max_entries=settings.current_config.report_cache_max_entries,
+        ttl_seconds=settings.current_config.report_cache_ttl_seconds,
+    )
+    report_service = providers.Factory(
+        ReportService,
+        unit_of_work=uow,
+        cache=report_cache,
+        unit_of_work_factory=uow.provider,
+        dashboard_concurrency=settings.current_config.dashboard_concurrency,
+    )
+    leaderboard_service = providers.Factory(
+        LeaderboardService, repository_factory=leaderboard_repository, unit_of_work=uow
+    )
+    task_reminder_service = providers.Factory(
+        TaskReminderService,
+        repository_factory=task_reminder_repository,
+        unit_of_work=uow,
+        lead_time=timedelta(minutes=settings.current_config.reminder_lead_time_minutes),
+        batch_size=settings.current_config.reminder_batch_size,
+    )
 
 
 # Global container instance
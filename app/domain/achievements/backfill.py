@@ -0,0 +1,57 @@
+"""Award automatic achievements to every existing user.
+
+Achievements are evaluated when their users complete tasks, so a rule added
+later is only earned by users who complete another task. Run a backfill
+after adding or lowering a rule::
+
+    python -m app.domain.achievements.backfill --chunk-size 1000 --pause-ratio 1
+
+The run checkpoints its progress after every chunk. Running it again after
+an interruption resumes where it stopped; ``--restart`` starts over.
+"""
+import argparse
+import asyncio
+import logging
+
+from app.core.logging import setup_logging
+from app.database import DatabaseConfig, UnitOfWork, create_db_manager
+from .repository import AchievementRepository
+from .service import (
+    BACKFILL_CHUNK_SIZE,
+    BACKFILL_PAUSE_RATIO,
+    DEFAULT_BACKFILL,
+    AchievementService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Award automatic achievements to every user.")
+    parser.add_argument("--name", default=DEFAULT_BACKFILL, help="checkpoint of the run")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE)
+    parser.add_argument(
+        "--pause-ratio",
+        type=float,
+        default=BACKFILL_PAUSE_RATIO,
+        help="pause after each chunk, as a multiple of the time it took",
+    )
+    parser.add_argument("--restart", action="store_true", help="start from the first user")
+    args = parser.parse_args()
+
+    db_manager = create_db_manager(DatabaseConfig())
+    try:
+        service = AchievementService(
+            AchievementRepository, lambda: UnitOfWork(db_manager.session_factory)
+        )
+        awarded = await service.backfill(
+            args.name, args.chunk_size, args.pause_ratio, args.restart
+        )
+    finally:
+        await db_manager.close()
+    logger.info("Achievement backfill %s awarded %s achievements", args.name, awarded)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""In-memory catalog of achievement definitions.
+
+The catalog is loaded once and then serves lookups by id and name, the full
+list and the automatic rules without any query. Writes through
+``AchievementRepository`` mark it stale after they commit and send a
+notification on ``CATALOG_CHANNEL``; every process listening on it marks
+its own catalog stale too. A stale catalog reloads on its next read.
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import noload
+
+from app.database import UnitOfWork
+from app.domain.achievements.models import Achievement
+from app.domain.achievements.rules import AchievementRule
+from app.domain.achievements.schemas import AchievementResponseSchema
+
+CATALOG_CHANNEL = "achievement_catalog"
+
+
+class AchievementCatalog:
+    """Achievement definitions indexed by id and name."""
+
+    def __init__(self, unit_of_work_factory: Callable[[], UnitOfWork]):
+        self.unit_of_work_factory = unit_of_work_factory
+        self._by_id: Dict[int, AchievementResponseSchema] = {}
+        self._by_name: Dict[str, AchievementResponseSchema] = {}
+        self._rules: List[AchievementRule] = []
+        self._stale = True
+        # Bumped by every invalidation, so a load that raced one is redone.
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self, payload: str = "") -> None:
+        """Reload the catalog on its next read."""
+        self._stale = True
+        self._generation += 1
+
+    async def reload(self) -> None:
+        """Load every achievement definition from the database."""
+        generation = self._generation
+        async with self.unit_of_work_factory() as unit_of_work:
+            result = await unit_of_work.session.execute(
+                select(Achievement).options(noload(Achievement.users)).order_by(Achievement.id)
+            )
+            achievements = [
+                AchievementResponseSchema.model_validate(achievement)
+                for achievement in result.scalars()
+            ]
+        self._by_id = {achievement.id: achievement for achievement in achievements}
+        self._by_name = {achievement.name: achievement for achievement in achievements}
+        self._rules = [
+            AchievementRule(achievement.id, achievement.metric, achievement.threshold)
+            for achievement in achievements
+            if achievement.metric is not None
+        ]
+        self._stale = generation != self._generation
+
+    async def _fresh(self) -> None:
+        if self._stale:
+            async with self._lock:
+                if self._stale:
+                    await self.reload()
+
+    async def get(self, achievement_id: int) -> Optional[AchievementResponseSchema]:
+        await self._fresh()
+        return self._by_id.get(achievement_id)
+
+    async def get_by_name(self, name: str) -> Optional[AchievementResponseSchema]:
+        await self._fresh()
+        return self._by_name.get(name)
+
+    async def get_all(self) -> List[AchievementResponseSchema]:
+        await self._fresh()
+        return list(self._by_id.values())
+
+    async def get_rules(self) -> List[AchievementRule]:
+        await self._fresh()
+        return list(self._rules)
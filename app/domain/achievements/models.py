@@ -1,7 +1,18 @@
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import Table, Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    Table,
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -32,10 +43,19 @@ user_achievements = Table(
 
 class Achievement(Base):
     __tablename__ = "achievements"
+    __table_args__ = (
+        CheckConstraint(
+            "(metric IS NULL) = (threshold IS NULL)", name="ck_achievements_rule"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # An AchievementMetric value. Achievements with a metric are awarded
+    # automatically once it reaches ``threshold``; see rules.py.
+    metric: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    threshold: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -52,3 +72,30 @@ class Achievement(Base):
         back_populates="achievements",
         lazy="selectin",
     )
+
+
+class AchievementBackfill(Base):
+    """Checkpoint of a backfill that evaluates achievements for every user.
+
+    ``last_user_id`` is the last user whose achievements were evaluated,
+    so an interrupted run resumes after it.
+    """
+
+    __tablename__ = "achievement_backfills"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_user_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    awarded: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default=text("0")
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
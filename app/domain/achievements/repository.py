@@ -1,10 +1,20 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import select, insert, delete, func
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.achievements.models import Achievement, user_achievements
-from app.domain.tasks.models import Task
+from app.core.listen import notify
+from app.core.transactions import after_commit
+from app.domain.achievements.catalog import CATALOG_CHANNEL, AchievementCatalog
+from app.domain.achievements.models import Achievement, AchievementBackfill, user_achievements
+from app.domain.achievements.rules import (
+    AchievementMetric,
+    AchievementRule,
+    UserMetrics,
+    earned_achievements,
+)
+from app.domain.tasks.counters import UserTaskCountersRepository
 from app.domain.achievements.schemas import (
     AchievementCreateSchema,
     AchievementUpdateSchema,
@@ -13,17 +23,34 @@ from app.domain.achievements.schemas import (
 
 
 class AchievementRepository:
-    """Repository for managing achievements."""
+    """
+    Repository for managing achievements.
+
+    With a ``catalog``, definitions and rules are read from it instead of
+    the database. Every write to the catalog notifies all processes, which
+    reload it once the transaction commits.
+    """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, catalog: Optional[AchievementCatalog] = None):
         self.session = session
+        self.catalog = catalog
+
+    async def _catalog_changed(self) -> None:
+        await notify(self.session, CATALOG_CHANNEL)
+        if self.catalog is not None:
+            after_commit(self.session, self.catalog.invalidate)
 
     async def create(self, data: AchievementCreateSchema) -> AchievementResponseSchema:
         achievement = Achievement(**data.model_dump())
         self.session.add(achievement)
+        await self.session.flush()
+        await self.session.refresh(achievement, ["created_at", "updated_at"])
+        await self._catalog_changed()
         return AchievementResponseSchema.model_validate(achievement)
 
     async def get(self, achievement_id: int) -> Optional[AchievementResponseSchema]:
+        if self.catalog is not None:
+            return await self.catalog.get(achievement_id)
         result = await self.session.execute(
             select(Achievement).where(Achievement.id == achievement_id)
         )
@@ -32,7 +59,18 @@ class AchievementRepository:
             return None
         return AchievementResponseSchema.model_validate(achievement)
 
+    async def get_by_name(self, name: str) -> Optional[AchievementResponseSchema]:
+        if self.catalog is not None:
+            return await self.catalog.get_by_name(name)
+        result = await self.session.execute(select(Achievement).where(Achievement.name == name))
+        achievement = result.scalars().first()
+        if achievement is None:
+            return None
+        return AchievementResponseSchema.model_validate(achievement)
+
     async def get_all(self) -> List[AchievementResponseSchema]:
+        if self.catalog is not None:
+            return await self.catalog.get_all()
         result = await self.session.execute(select(Achievement))
         achievements = result.scalars().all()
         return [AchievementResponseSchema.model_validate(a) for a in achievements]
@@ -48,6 +86,7 @@ class AchievementRepository:
             return None
         for field, value in data.model_dump(exclude_unset=True).items():
             setattr(achievement, field, value)
+        await self._catalog_changed()
         return AchievementResponseSchema.model_validate(achievement)
 
     async def delete(self, achievement_id: int) -> bool:
@@ -58,6 +97,7 @@ class AchievementRepository:
         if achievement is None:
             return False
         await self.session.delete(achievement)
+        await self._catalog_changed()
         return True
 
     async def award_to_user(self, achievement_id: int, user_id: int) -> None:
@@ -78,26 +118,127 @@ class AchievementRepository:
         achievements = result.scalars().all()
         return [AchievementResponseSchema.model_validate(a) for a in achievements]
 
-    async def check_task_completion_achievements(self, user_id: int) -> None:
-        """Award achievements for task completion milestones."""
+    async def get_rules(self) -> List[AchievementRule]:
+        """Return the rule of every achievement that is awarded automatically."""
+        if self.catalog is not None:
+            return await self.catalog.get_rules()
         result = await self.session.execute(
-            select(func.count(Task.id)).where(
-                Task.assigned_user_id == user_id, Task.is_completed.is_(True)
+            select(Achievement.id, Achievement.metric, Achievement.threshold).where(
+                Achievement.metric.is_not(None)
             )
         )
-        completed_count = result.scalar_one() or 0
-        if completed_count < 1:
-            return
+        return [
+            AchievementRule(achievement_id, AchievementMetric(metric), threshold)
+            for achievement_id, metric, threshold in result
+        ]
 
-        achievement_result = await self.session.execute(
-            select(Achievement).where(Achievement.name == "First Task Completed")
-        )
-        achievement = achievement_result.scalar_one_or_none()
-        if not achievement:
-            return
+    @staticmethod
+    def _to_metrics(counters: Row) -> UserMetrics:
+        return {
+            AchievementMetric.COMPLETED_TASKS: counters.completed_tasks,
+            AchievementMetric.REWARD_POINTS: counters.reward_points,
+            AchievementMetric.STREAK_DAYS: counters.longest_streak,
+        }
 
-        await self.session.execute(
+    async def get_metrics(self, user_ids: List[int]) -> Dict[int, UserMetrics]:
+        """
+        Return the metrics of several users from their task counters.
+
+        Users without a counter row are left out; every metric of theirs
+        is zero.
+        """
+        counters = await UserTaskCountersRepository(self.session).get_many(user_ids)
+        return {user_id: self._to_metrics(row) for user_id, row in counters.items()}
+
+    async def get_metrics_after(self, after_user_id: int, limit: int) -> Dict[int, UserMetrics]:
+        """Return the metrics of the next ``limit`` users with counters after ``after_user_id``."""
+        counters = await UserTaskCountersRepository(self.session).get_page(after_user_id, limit)
+        return {user_id: self._to_metrics(row) for user_id, row in counters.items()}
+
+    async def award_many(self, awards: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        Award (user id, achievement id) pairs with one multi-row INSERT.
+
+        Returns the pairs that were not held yet.
+        """
+        if not awards:
+            return []
+        result = await self.session.execute(
             insert(user_achievements)
-            .values(user_id=user_id, achievement_id=achievement.id)
+            .values(
+                [
+                    {"user_id": user_id, "achievement_id": achievement_id}
+                    for user_id, achievement_id in awards
+                ]
+            )
             .on_conflict_do_nothing()
+            .returning(user_achievements.c.user_id, user_achievements.c.achievement_id)
+        )
+        return [tuple(row) for row in result]
+
+    async def evaluate_achievements(self, user_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        Award every automatic achievement the given users have earned.
+
+        Returns the newly awarded (user id, achievement id) pairs.
+        """
+        user_ids = sorted(set(user_ids))
+        rules = await self.get_rules() if user_ids else []
+        if not rules:
+            return []
+        metrics = await self.get_metrics(user_ids)
+        return await self.award_many(earned_achievements(rules, metrics))
+
+    async def start_backfill(self, name: str, restart: bool = False) -> None:
+        """
+        Create the checkpoint of a backfill run, or reset it to the first user.
+
+        A finished run is always reset, so running a backfill again
+        re-evaluates everyone; an unfinished one is resumed unless
+        ``restart`` is set.
+        """
+        statement = insert(AchievementBackfill).values(name=name)
+        await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AchievementBackfill.name],
+                set_={
+                    "last_user_id": 0,
+                    "awarded": 0,
+                    "started_at": func.now(),
+                    "updated_at": func.now(),
+                    "finished_at": None,
+                },
+                where=AchievementBackfill.finished_at.is_not(None) if not restart else None,
+            )
+        )
+
+    async def lock_backfill(self, name: str) -> Row:
+        """
+        Lock the checkpoint of a backfill run until the transaction ends.
+
+        Concurrent runs with the same name therefore take turns, each
+        continuing where the other committed, instead of repeating chunks.
+
+        Returns:
+            Row with ``last_user_id`` and ``finished_at``
+        """
+        result = await self.session.execute(
+            select(AchievementBackfill.last_user_id, AchievementBackfill.finished_at)
+            .where(AchievementBackfill.name == name)
+            .with_for_update()
+        )
+        return result.one()
+
+    async def advance_backfill(
+        self, name: str, last_user_id: int, awarded: int, finished: bool
+    ) -> None:
+        await self.session.execute(
+            update(AchievementBackfill)
+            .where(AchievementBackfill.name == name)
+            .values(
+                last_user_id=last_user_id,
+                awarded=AchievementBackfill.awarded + awarded,
+                updated_at=func.now(),
+                finished_at=func.now() if finished else None,
+            )
         )
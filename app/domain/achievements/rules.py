@@ -0,0 +1,51 @@
+"""Declarative achievement rules.
+
+An achievement that declares a ``metric`` and a ``threshold`` is earned
+automatically once a user's value of that metric reaches the threshold.
+Achievements without a rule are only awarded by hand.
+
+Evaluation is split so that the database does the counting and this module
+does the comparing: the repository reads every metric of a batch of users
+from their ``user_task_counters`` rows in one query,
+:func:`earned_achievements` matches them against the rules, and the results
+are inserted in one statement.
+"""
+from enum import Enum
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Tuple
+
+
+class AchievementMetric(str, Enum):
+    """Per-user values an achievement rule can set a threshold on."""
+
+    COMPLETED_TASKS = "completed_tasks"
+    REWARD_POINTS = "reward_points"
+    # Longest run of consecutive days, in the user's timezone, with at least
+    # one completed task.
+    STREAK_DAYS = "streak_days"
+
+
+class AchievementRule(NamedTuple):
+    achievement_id: int
+    metric: AchievementMetric
+    threshold: int
+
+
+UserMetrics = Dict[AchievementMetric, int]
+
+
+def earned_achievements(
+    rules: Iterable[AchievementRule], metrics: Mapping[int, UserMetrics]
+) -> List[Tuple[int, int]]:
+    """
+    Return the (user id, achievement id) pairs whose rule is met.
+
+    Metrics missing for a user count as zero, so users without completed
+    tasks only earn rules with a threshold of zero or less.
+    """
+    rules = list(rules)
+    return [
+        (user_id, rule.achievement_id)
+        for user_id, values in sorted(metrics.items())
+        for rule in rules
+        if values.get(rule.metric, 0) >= rule.threshold
+    ]
@@ -1,28 +1,52 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+from app.domain.achievements.rules import AchievementMetric
 
 
 class AchievementBaseSchema(BaseModel):
     name: str = Field(min_length=1, max_length=100)
     description: Optional[str] = Field(default=None)
+    metric: Optional[AchievementMetric] = Field(
+        default=None,
+        description="Metric that earns the achievement automatically; null if awarded by hand",
+    )
+    threshold: Optional[int] = Field(
+        default=None, ge=1, description="Value of the metric that earns the achievement"
+    )
 
     class Config:
         from_attributes = True
 
 
 class AchievementCreateSchema(AchievementBaseSchema):
-    pass
+    @model_validator(mode="after")
+    def check_rule(self) -> "AchievementCreateSchema":
+        if (self.metric is None) != (self.threshold is None):
+            raise ValueError("metric and threshold must be given together")
+        return self
 
 
 class AchievementUpdateSchema(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
+    metric: Optional[AchievementMetric] = None
+    threshold: Optional[int] = Field(None, ge=1)
 
     class Config:
         from_attributes = True
 
+    @model_validator(mode="after")
+    def check_rule(self) -> "AchievementUpdateSchema":
+        changed = {"metric", "threshold"} & self.model_fields_set
+        if changed and (
+            len(changed) == 1 or (self.metric is None) != (self.threshold is None)
+        ):
+            raise ValueError("metric and threshold must be changed together")
+        return self
+
 
 class AchievementResponseSchema(AchievementBaseSchema):
     id: int
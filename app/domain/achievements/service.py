@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Iterable, List, Tuple
+
+from app.database import UnitOfWork
+from app.domain.achievements.rules import earned_achievements
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL = "all-users"
+BACKFILL_CHUNK_SIZE = 1000
+# Pause after each chunk, as a multiple of the time the chunk took, so the
+# backfill uses a bounded share of the database however loaded it is.
+BACKFILL_PAUSE_RATIO = 1.0
+
+
+class AchievementService:
+    """
+    Service layer for achievement operations.
+
+    ``unit_of_work_factory`` gives every call its own unit of work, so one
+    instance can serve the concurrent workers of the evaluation queue.
+    """
+
+    def __init__(self, repository_factory, unit_of_work_factory: Callable[[], UnitOfWork]):
+        self.repository_factory = repository_factory
+        self.unit_of_work_factory = unit_of_work_factory
+
+    async def evaluate_achievements(self, user_ids: Iterable[int]) -> List[Tuple[int, int]]:
+        """Award every automatic achievement the given users have earned."""
+        async with self.unit_of_work_factory() as unit_of_work:
+            achievement_repository = self.repository_factory(unit_of_work.session)
+            return await achievement_repository.evaluate_achievements(user_ids)
+
+    async def backfill(
+        self,
+        name: str = DEFAULT_BACKFILL,
+        chunk_size: int = BACKFILL_CHUNK_SIZE,
+        pause_ratio: float = BACKFILL_PAUSE_RATIO,
+        restart: bool = False,
+    ) -> int:
+        """
+        Award every automatic achievement earned by any user.
+
+        Users are evaluated in chunks of ``chunk_size`` in id order. Each
+        chunk reads its users' metrics with one query, awards with one
+        multi-row INSERT and advances the checkpoint ``name`` in the same
+        transaction, so a run that stops resumes after the last committed
+        chunk. Between chunks the backfill sleeps ``pause_ratio`` times as
+        long as the chunk took.
+
+        Args:
+            name: Checkpoint of the run
+            chunk_size: Users evaluated per transaction
+            pause_ratio: Pause after each chunk relative to its duration
+            restart: Start from the first user even if the run is unfinished
+
+        Returns:
+            Number of achievements awarded by this call
+        """
+        async with self.unit_of_work_factory() as unit_of_work:
+            achievement_repository = self.repository_factory(unit_of_work.session)
+            rules = await achievement_repository.get_rules()
+            await achievement_repository.start_backfill(name, restart)
+
+        awarded = 0
+        while True:
+            started = time.monotonic()
+            async with self.unit_of_work_factory() as unit_of_work:
+                achievement_repository = self.repository_factory(unit_of_work.session)
+                checkpoint = await achievement_repository.lock_backfill(name)
+                if checkpoint.finished_at is not None:
+                    break
+                metrics = await achievement_repository.get_metrics_after(
+                    checkpoint.last_user_id, chunk_size
+                )
+                new = await achievement_repository.award_many(earned_achievements(rules, metrics))
+                finished = len(metrics) < chunk_size
+                await achievement_repository.advance_backfill(
+                    name, max(metrics, default=checkpoint.last_user_id), len(new), finished
+                )
+            awarded += len(new)
+            logger.info(
+                "Achievement backfill %s awarded %s up to user %s",
+                name,
+                len(new),
+                max(metrics, default=checkpoint.last_user_id),
+            )
+            if finished:
+                break
+            await asyncio.sleep((time.monotonic() - started) * pause_ratio)
+        return awarded
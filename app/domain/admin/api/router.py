@@ -1,10 +1,13 @@
 """Admin endpoints for inspecting full user data."""
 
-from typing import List
+from typing import Dict, List
 
 from fastapi import APIRouter, Depends
 from dependency_injector.wiring import inject, Provide
 
+from app.core.cache import cache_stats
+from app.core.executor import executor_stats
+from app.core.work_queue import queue_stats
 from app.domain.users.schemas import UserAdminResponseSchema
 from app.core.security import get_current_admin
 from app.dependencies import Container
@@ -43,3 +46,21 @@ async def make_user_admin(
 ) -> UserAdminResponseSchema:
     """Grant administrative rights to the specified user."""
     return await service.make_user_admin(user_id)
+
+
+@router.get("/caches", response_model=Dict[str, Dict[str, int]])
+async def admin_get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Return hit, miss, eviction and invalidation counters of the in-process caches."""
+    return cache_stats()
+
+
+@router.get("/queues", response_model=Dict[str, Dict[str, int]])
+async def admin_get_queue_stats() -> Dict[str, Dict[str, int]]:
+    """Return the backlog, drop and failure counters of the in-process work queues."""
+    return queue_stats()
+
+
+@router.get("/executors", response_model=Dict[str, Dict[str, float]])
+async def admin_get_executor_stats() -> Dict[str, Dict[str, float]]:
+    """Return the load, rejection and wait and run time counters of the thread pools."""
+    return executor_stats()
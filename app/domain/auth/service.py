@@ -63,8 +63,12 @@ class AuthService:
             user = await user_repository.get_by_username_or_email(
                 credentials.username, credentials.email
             )
-            if user is None or not verify_password(credentials.password, user.hashed_password):
-                raise AppError("Invalid credentials")
+        # Checked between transactions, so a login waiting for a hashing
+        # thread does not hold a pooled connection.
+        if user is None or not await verify_password(credentials.password, user.hashed_password):
+            raise AppError("Invalid credentials")
+        async with self.unit_of_work as unit_of_work:
+            user_repository = self.user_repository_factory(unit_of_work.session)
             await user_repository.update(
                 user.id, UserUpdateSchema(last_login_at=datetime.now(UTC))
             )
@@ -3,6 +3,8 @@ from typing import Generic, List, Optional, Type, TypeVar, Protocol
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.loading import LoaderProfile, loader_options
+
 ModelType = TypeVar("ModelType")
 
 
@@ -26,15 +28,28 @@ class BaseRepository(Generic[ModelType], Repository[ModelType]):
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get(self, entity_id: int) -> Optional[ModelType]:
+    async def get(
+        self, entity_id: int, profile: LoaderProfile = LoaderProfile.MINIMAL
+    ) -> Optional[ModelType]:
         result = await self.session.execute(
-            select(self.model).where(self.model.id == entity_id)
+            select(self.model)
+            .where(self.model.id == entity_id)
+            .options(*loader_options(self.model, profile))
         )
         return result.scalar_one_or_none()
 
-    async def get_list(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
+    async def get_list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        profile: LoaderProfile = LoaderProfile.MINIMAL,
+    ) -> List[ModelType]:
         result = await self.session.execute(
-            select(self.model).order_by(self.model.id).offset(skip).limit(limit)
+            select(self.model)
+            .order_by(self.model.id)
+            .offset(skip)
+            .limit(limit)
+            .options(*loader_options(self.model, profile))
         )
         return list(result.scalars().all())
 
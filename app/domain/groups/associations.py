@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Index, Integer, ForeignKey
 from app.database import Base
 
 # Association table between tasks and groups
@@ -9,4 +9,6 @@ task_group_association = Table(
     Base.metadata,
     Column('task_id', Integer, ForeignKey('tasks.id', ondelete="CASCADE"), primary_key=True),
     Column('group_id', Integer, ForeignKey('groups.id', ondelete="CASCADE"), primary_key=True),
+    # The primary key leads with task_id; group filters need their own index.
+    Index('ix_task_groups_group_id_task_id', 'group_id', 'task_id'),
 )
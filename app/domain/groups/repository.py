@@ -4,6 +4,7 @@ from sqlalchemy import select, delete
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_after_commit
 from app.domain.groups.membership import GroupMembership
 from app.domain.base import BaseRepository
 
@@ -87,6 +88,8 @@ class GroupRepository(BaseRepository[Group]):
                     set_={"role": role},
                 )
             )
+        # Cached reports over a user's groups depend on their memberships.
+        invalidate_after_commit(self.session, (("user", uid) for uid in user_roles))
         return db_group
 
     async def remove_users(
@@ -101,4 +104,5 @@ class GroupRepository(BaseRepository[Group]):
                 GroupMembership.user_id.in_(user_ids),
             )
         )
+        invalidate_after_commit(self.session, (("user", uid) for uid in user_ids))
         return db_group
@@ -0,0 +1,45 @@
+"""Named relationship loader profiles.
+
+Relationships on ``Task`` and ``User`` default to ``raise_on_sql`` so that
+loading an entity never fans out into extra queries by accident. Repositories
+opt into related data per call by picking one of the profiles below.
+"""
+from enum import Enum
+from typing import Any, Dict, Tuple, Type
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+
+class LoaderProfile(str, Enum):
+    """Sets of relationships to eager-load alongside an entity."""
+
+    MINIMAL = "minimal"
+    WITH_GROUPS = "with_groups"
+    ADMIN_FULL = "admin_full"
+
+
+# Relationship names per model, keyed by class name so this module does not
+# import the models (and through them the domain packages).
+_PROFILES: Dict[str, Dict[LoaderProfile, Tuple[str, ...]]] = {
+    "Task": {
+        LoaderProfile.MINIMAL: (),
+        LoaderProfile.WITH_GROUPS: ("assigned_groups",),
+        LoaderProfile.ADMIN_FULL: ("assigned_groups", "assigned_user", "assigned_by"),
+    },
+    "User": {
+        LoaderProfile.MINIMAL: (),
+        LoaderProfile.WITH_GROUPS: ("group_memberships", "groups"),
+        LoaderProfile.ADMIN_FULL: ("family", "groups", "tasks", "notifications", "settings"),
+    },
+}
+
+
+def loader_options(model: Type[Any], profile: LoaderProfile) -> Tuple[ORMOption, ...]:
+    """Return the loader options for ``model`` under the given profile.
+
+    Models without registered profiles get no options, leaving their
+    relationship defaults untouched.
+    """
+    relationships = _PROFILES.get(model.__name__, {}).get(profile, ())
+    return tuple(selectinload(getattr(model, name)) for name in relationships)
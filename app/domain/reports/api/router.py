@@ -1,50 +1,175 @@
-from typing import List
+from datetime import date
+from typing import Annotated, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from dependency_injector.wiring import inject, Provide
 
-from app.domain.tasks.schemas import TaskResponseSchema
+from app.core.streaming import ExportFormat, export_response
+from app.domain.tasks.leaderboard import DEFAULT_TOP_SIZE, LeaderboardScope, LeaderboardService
+from app.domain.tasks.models import TaskStatus
+from app.domain.tasks.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.domain.tasks.schemas import LeaderboardEntrySchema, TaskPageSchema, TaskResponseSchema
+from app.domain.reports.schemas import (
+    CompletionTrendSchema,
+    DashboardSchema,
+    TaskSummarySchema,
+    TrendInterval,
+    UserProgressSchema,
+)
 from app.domain.reports.service import ReportService
 from app.dependencies import Container
 
 router = APIRouter()
 
+# ``?format=csv`` or ``?format=ndjson`` streams a task list report as a download.
+FormatParam = Annotated[ExportFormat, Query(alias="format")]
 
-@router.get("/tasks/reports/summary")
+
+@router.get("/tasks/reports/summary", response_model=TaskSummarySchema)
 @inject
 async def get_task_summary(
+    family_id: Optional[int] = None,
+    group_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    service: ReportService = Depends(Provide[Container.report_service]),
+):
+    return await service.get_task_summary(family_id, group_id, user_id)
+
+
+@router.get("/tasks/reports/completions", response_model=CompletionTrendSchema)
+@inject
+async def get_completion_trend(
+    interval: TrendInterval = TrendInterval.DAY,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    family_id: Optional[int] = None,
+    group_id: Optional[int] = None,
+    user_id: Optional[int] = None,
     service: ReportService = Depends(Provide[Container.report_service]),
 ):
-    return await service.get_task_summary()
+    return await service.get_completion_trend(
+        interval, start, end, family_id, group_id, user_id
+    )
+
+
+@router.get("/tasks/reports/user/{user_id}/progress", response_model=UserProgressSchema)
+@inject
+async def get_user_progress(
+    user_id: int,
+    service: ReportService = Depends(Provide[Container.report_service]),
+):
+    return await service.get_user_progress(user_id)
 
 
 @router.get("/tasks/reports/user/{user_id}", response_model=List[TaskResponseSchema])
 @inject
 async def get_user_task_report(
-    user_id: int, service: ReportService = Depends(Provide[Container.report_service])
+    user_id: int,
+    export_format: FormatParam = ExportFormat.JSON,
+    service: ReportService = Depends(Provide[Container.report_service]),
 ):
+    if export_format is not ExportFormat.JSON:
+        return export_response(
+            service.stream_user_task_report(user_id),
+            TaskResponseSchema,
+            export_format,
+            f"user-{user_id}-tasks",
+        )
     return await service.get_user_task_report(user_id)
 
 
 @router.get("/tasks/reports/assigned-by/{user_id}", response_model=List[TaskResponseSchema])
 @inject
 async def get_tasks_assigned_by_user(
-    user_id: int, service: ReportService = Depends(Provide[Container.report_service])
+    user_id: int,
+    export_format: FormatParam = ExportFormat.JSON,
+    service: ReportService = Depends(Provide[Container.report_service]),
 ):
+    if export_format is not ExportFormat.JSON:
+        return export_response(
+            service.stream_tasks_assigned_by_user(user_id),
+            TaskResponseSchema,
+            export_format,
+            f"user-{user_id}-assigned-tasks",
+        )
     return await service.get_tasks_assigned_by_user(user_id)
 
 
 @router.get("/tasks/reports/group/{group_id}", response_model=List[TaskResponseSchema])
 @inject
 async def get_group_task_report(
-    group_id: int, service: ReportService = Depends(Provide[Container.report_service])
+    group_id: int,
+    export_format: FormatParam = ExportFormat.JSON,
+    service: ReportService = Depends(Provide[Container.report_service]),
 ):
+    if export_format is not ExportFormat.JSON:
+        return export_response(
+            service.stream_group_task_report(group_id),
+            TaskResponseSchema,
+            export_format,
+            f"group-{group_id}-tasks",
+        )
     return await service.get_group_task_report(group_id)
 
 
-@router.get("/tasks/reports/user/{user_id}/groups", response_model=List[TaskResponseSchema])
+@router.get("/tasks/reports/user/{user_id}/groups", response_model=TaskPageSchema)
 @inject
 async def get_user_groups_tasks(
-    user_id: int, service: ReportService = Depends(Provide[Container.report_service])
+    user_id: int,
+    status: Optional[TaskStatus] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    export_format: FormatParam = ExportFormat.JSON,
+    service: ReportService = Depends(Provide[Container.report_service]),
+):
+    """List live tasks from the groups a user belongs to, one page at a time.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next
+    page. CSV and NDJSON exports stream every matching task instead.
+    """
+    if export_format is not ExportFormat.JSON:
+        return export_response(
+            service.stream_user_groups_tasks(user_id, status),
+            TaskResponseSchema,
+            export_format,
+            f"user-{user_id}-group-tasks",
+        )
+    return await service.get_user_groups_tasks(user_id, status, limit, cursor)
+
+
+@router.get("/tasks/reports/dashboard/{user_id}", response_model=DashboardSchema)
+@inject
+async def get_dashboard(
+    user_id: int,
+    group_id: Optional[int] = None,
+    service: ReportService = Depends(Provide[Container.report_service]),
+):
+    return await service.get_dashboard(user_id, group_id)
+
+
+@router.get(
+    "/tasks/reports/leaderboard/{scope}/{scope_id}",
+    response_model=List[LeaderboardEntrySchema],
+)
+@inject
+async def get_leaderboard(
+    scope: LeaderboardScope,
+    scope_id: int,
+    limit: Annotated[int, Query(ge=1, le=100)] = DEFAULT_TOP_SIZE,
+    service: LeaderboardService = Depends(Provide[Container.leaderboard_service]),
+):
+    return service.get_top(scope, scope_id, limit)
+
+
+@router.get(
+    "/tasks/reports/leaderboard/{scope}/{scope_id}/users/{user_id}",
+    response_model=LeaderboardEntrySchema,
+)
+@inject
+async def get_leaderboard_rank(
+    scope: LeaderboardScope,
+    scope_id: int,
+    user_id: int,
+    service: LeaderboardService = Depends(Provide[Container.leaderboard_service]),
 ):
-    return await service.get_user_groups_tasks(user_id)
+    return service.get_rank(scope, scope_id, user_id)
@@ -0,0 +1,89 @@
+from datetime import date
+from enum import Enum
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.domain.tasks.models import TaskStatus
+from app.domain.tasks.schemas import TaskResponseSchema
+
+
+class TaskSummarySchema(BaseModel):
+    """Aggregated task counts for a report scope."""
+    total_tasks: int = Field(ge=0, description="Tasks that are not archived")
+    completed_tasks: int = Field(ge=0, description="Completed tasks that are not archived")
+    overdue_tasks: int = Field(
+        ge=0, description="Open tasks that are not archived and are past their due date"
+    )
+    archived_tasks: int = Field(ge=0, description="Archived tasks")
+    by_status: Dict[TaskStatus, int] = Field(
+        description="Tasks that are not archived, per status"
+    )
+    by_priority: Dict[int, int] = Field(
+        description="Tasks that are not archived, per priority"
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+
+class UserProgressSchema(BaseModel):
+    """Completion counters of one user."""
+    completed_tasks: int = Field(ge=0, description="Completed tasks that are not archived")
+    reward_points: int = Field(description="Reward points of those tasks")
+    current_streak: int = Field(
+        ge=0,
+        description="Consecutive days with a completed task, up to today or yesterday",
+    )
+    longest_streak: int = Field(ge=0, description="Longest run of such days")
+    last_completed_on: Optional[date] = Field(
+        None, description="Latest day with a completed task, in the user's timezone"
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+
+class DashboardSchema(BaseModel):
+    """Reports shown on a user's dashboard."""
+    summary: TaskSummarySchema = Field(description="Summary of the user's tasks")
+    progress: UserProgressSchema = Field(description="The user's completion counters")
+    assigned_tasks: List[TaskResponseSchema] = Field(description="Tasks assigned to the user")
+    assigned_by_tasks: List[TaskResponseSchema] = Field(
+        description="Tasks the user assigned to others"
+    )
+    user_groups_tasks: List[TaskResponseSchema] = Field(
+        description="First page of the tasks of the groups the user belongs to"
+    )
+    user_groups_next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page of the user's group tasks; null when complete",
+    )
+    group_tasks: Optional[List[TaskResponseSchema]] = Field(
+        None, description="Tasks of the requested group, if one was given"
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+
+class TrendInterval(str, Enum):
+    """Bucket width of a trend report."""
+
+    DAY = "day"
+    WEEK = "week"
+
+
+class CompletionTrendPointSchema(BaseModel):
+    """Completed tasks in one bucket of a trend report."""
+    bucket: date = Field(description="First day of the bucket, weeks start on Monday")
+    completed: int = Field(ge=0, description="Tasks completed within the bucket")
+
+    model_config = ConfigDict(frozen=True)
+
+
+class CompletionTrendSchema(BaseModel):
+    """Completed tasks per day or week, with empty buckets included."""
+    interval: TrendInterval
+    start: date = Field(description="First bucket of the series")
+    end: date = Field(description="Last bucket of the series")
+    points: List[CompletionTrendPointSchema]
+
+    model_config = ConfigDict(frozen=True)
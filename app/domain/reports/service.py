@@ -1,83 +1,488 @@
-from typing import List
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
-from sqlalchemy import select, func
+from sqlalchemy import ColumnElement, Date, Select, case, cast, func, literal_column, select
 
-from app.domain.tasks.models import Task
+from app.domain.tasks.models import Task, TaskStatus, UserTaskCounter
 from app.domain.groups.associations import task_group_association
 from app.domain.groups.membership import GroupMembership
-from app.domain.tasks.schemas import TaskResponseSchema
+from app.domain.tasks.repository import STREAM_BATCH_SIZE, UTC, select_task_rows
+from app.domain.tasks.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from app.domain.tasks.schemas import TaskPageSchema, TaskResponseSchema
+from app.domain.users.models import User
+from app.domain.tasks.reminders import OPEN_TASK_CRITERIA
+from app.domain.tasks.stats import (
+    ARCHIVED_BUCKET,
+    GLOBAL_SCOPE_ID,
+    TaskStatScope,
+    TaskStatsRepository,
+    fold_counts,
+)
+from .schemas import (
+    CompletionTrendPointSchema,
+    CompletionTrendSchema,
+    DashboardSchema,
+    TaskSummarySchema,
+    TrendInterval,
+    UserProgressSchema,
+)
+from app.core.cache import Tag, TTLCache
+from app.core.exceptions import AppError, UserNotFoundError
 from app.database import UnitOfWork
 
+TREND_STEPS = {TrendInterval.DAY: timedelta(days=1), TrendInterval.WEEK: timedelta(weeks=1)}
+DEFAULT_TREND_SPANS = {TrendInterval.DAY: timedelta(days=29), TrendInterval.WEEK: timedelta(weeks=11)}
+MAX_TREND_SPAN = timedelta(days=731)
+
+TaskListReport = TypeVar("TaskListReport", List[TaskResponseSchema], TaskPageSchema)
+
+
+def _resolve_scope(
+    family_id: Optional[int], group_id: Optional[int], user_id: Optional[int]
+) -> Tuple[TaskStatScope, int]:
+    """Return the single report scope given, or the global scope."""
+    scopes = [
+        (scope, scope_id)
+        for scope, scope_id in (
+            (TaskStatScope.FAMILY, family_id),
+            (TaskStatScope.GROUP, group_id),
+            (TaskStatScope.USER, user_id),
+        )
+        if scope_id is not None
+    ]
+    if len(scopes) > 1:
+        raise AppError("Only one of family_id, group_id and user_id may be given")
+    return scopes[0] if scopes else (TaskStatScope.ALL, GLOBAL_SCOPE_ID)
+
+
+def _scope_criteria(scope: TaskStatScope, scope_id: int) -> Tuple[ColumnElement, ...]:
+    """Return the conditions restricting tasks to a report scope."""
+    if scope is TaskStatScope.FAMILY:
+        return (Task.assigned_user_id.in_(select(User.id).where(User.family_id == scope_id)),)
+    if scope is TaskStatScope.GROUP:
+        return (
+            select(task_group_association.c.task_id)
+            .where(
+                task_group_association.c.task_id == Task.id,
+                task_group_association.c.group_id == scope_id,
+            )
+            .exists(),
+        )
+    if scope is TaskStatScope.USER:
+        return (Task.assigned_user_id == scope_id,)
+    return ()
+
+
+# Task list reports. Each query is shared by the cached JSON report and its
+# streamed export, and orders by id so exports are stable.
+
+
+def _user_tasks_query(user_id: int) -> Select:
+    return (
+        select_task_rows()
+        .where(Task.assigned_user_id == user_id, Task.deleted_at.is_(None))
+        .order_by(Task.id)
+    )
+
+
+def _assigned_by_tasks_query(user_id: int) -> Select:
+    return (
+        select_task_rows()
+        .where(
+            Task.assigned_by_user_id == user_id,
+            Task.assigned_user_id.isnot(None),
+            Task.assigned_user_id != user_id,
+            Task.deleted_at.is_(None),
+        )
+        .order_by(Task.id)
+    )
+
+
+def _group_tasks_query(group_id: int) -> Select:
+    return (
+        select_task_rows()
+        .join(task_group_association)
+        .where(task_group_association.c.group_id == group_id, Task.deleted_at.is_(None))
+        .order_by(Task.id)
+    )
+
+
+def _user_groups_tasks_query(
+    user_id: int, status: Optional[TaskStatus] = None, after_id: Optional[int] = None
+) -> Select:
+    # A semijoin lists a task in several of the user's groups once, without
+    # the de-duplication pass a join would need, so it can be streamed and
+    # paged by id.
+    in_user_groups = (
+        select(task_group_association.c.task_id)
+        .join(
+            GroupMembership,
+            task_group_association.c.group_id == GroupMembership.group_id,
+        )
+        .where(
+            task_group_association.c.task_id == Task.id,
+            GroupMembership.user_id == user_id,
+        )
+    )
+    query = select_task_rows().where(Task.deleted_at.is_(None))
+    if after_id is not None:
+        # Postgres does not carry range conditions across the join, so bound
+        # both sides or the semijoin reads task_groups from its first row.
+        query = query.where(Task.id > after_id)
+        in_user_groups = in_user_groups.where(task_group_association.c.task_id > after_id)
+    query = query.where(in_user_groups.exists())
+    if status is not None:
+        query = query.where(Task.status == status)
+    return query.order_by(Task.id)
+
 
 class ReportService:
-    """Service layer for generating reports."""
+    """
+    Service layer for generating reports.
 
-    def __init__(self, unit_of_work: UnitOfWork):
+    Task list reports are kept in ``cache`` when one is given. Entries are
+    tagged with the users and groups they list tasks for, which task and
+    membership writes invalidate after commit.
+
+    ``unit_of_work_factory`` lets the dashboard run its reports on separate
+    units of work; without it they run one after another.
+    """
+
+    def __init__(
+        self,
+        unit_of_work: UnitOfWork,
+        cache: Optional[TTLCache] = None,
+        unit_of_work_factory: Optional[Callable[[], UnitOfWork]] = None,
+        dashboard_concurrency: int = 3,
+    ):
         self.unit_of_work = unit_of_work
+        self.cache = cache
+        self.unit_of_work_factory = unit_of_work_factory
+        self.dashboard_concurrency = dashboard_concurrency
+
+    async def _cached(
+        self,
+        key: Tuple[Hashable, ...],
+        loader: Callable[[], Awaitable[Tuple[TaskListReport, Iterable[Tag]]]],
+    ) -> TaskListReport:
+        if self.cache is None:
+            report, _ = await loader()
+            return report
+        report = await self.cache.get_or_load(key, loader)
+        # Copy so callers cannot change the cached list.
+        if isinstance(report, TaskPageSchema):
+            return report.model_copy(update={"items": list(report.items)})
+        return list(report)
+
+    async def get_task_summary(
+        self,
+        family_id: Optional[int] = None,
+        group_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> TaskSummarySchema:
+        """
+        Return task counts by status and priority with overdue and archived totals.
+
+        Status, priority and archived counts come from the ``task_stats``
+        rollup, so they cost one primary key range read whatever the number
+        of tasks. Overdue depends on the current time and is counted from the
+        ``ix_tasks_open_due_date`` partial index instead.
+
+        Args:
+            family_id: Only count tasks assigned to members of this family
+            group_id: Only count tasks assigned to this group
+            user_id: Only count tasks assigned to this user
+        """
+        scope, scope_id = _resolve_scope(family_id, group_id, user_id)
+        overdue = select(func.count()).where(
+            *OPEN_TASK_CRITERIA,
+            Task.due_date < func.now(),
+            Task.status != TaskStatus.CANCELLED,
+            *_scope_criteria(scope, scope_id),
+        )
 
-    async def get_task_summary(self) -> dict:
-        """Return counts of total and completed tasks."""
         async with self.unit_of_work as unit_of_work:
-            total_result = await unit_of_work.session.execute(
-                select(func.count()).select_from(Task).where(Task.deleted_at.is_(None))
+            counts = await TaskStatsRepository(unit_of_work.session).get_counts(scope, scope_id)
+            overdue_tasks = await unit_of_work.session.scalar(overdue)
+
+        counted_by_status, by_priority = fold_counts(counts)
+        by_status = {status: counted_by_status.get(status.value, 0) for status in TaskStatus}
+        return TaskSummarySchema(
+            total_tasks=sum(by_status.values()),
+            completed_tasks=by_status[TaskStatus.COMPLETED],
+            overdue_tasks=overdue_tasks,
+            archived_tasks=counted_by_status.get(ARCHIVED_BUCKET, 0),
+            by_status=by_status,
+            by_priority={
+                priority: count for priority, count in sorted(by_priority.items()) if count
+            },
+        )
+
+    async def get_user_progress(self, user_id: int) -> UserProgressSchema:
+        """
+        Return a user's completed task count, reward points and streaks.
+
+        The values come from the user's ``user_task_counters`` row, so the
+        report costs two primary key lookups however many tasks the user
+        has completed. A streak whose last day is before yesterday, in the
+        user's timezone, is reported as broken.
+
+        Raises:
+            UserNotFoundError: If the user does not exist
+        """
+        today = cast(func.timezone(User.timezone, func.now()), Date)
+        statement = (
+            select(
+                func.coalesce(UserTaskCounter.completed_tasks, 0).label("completed_tasks"),
+                func.coalesce(UserTaskCounter.reward_points, 0).label("reward_points"),
+                case(
+                    (
+                        UserTaskCounter.last_completed_on >= today - 1,
+                        UserTaskCounter.current_streak,
+                    ),
+                    else_=0,
+                ).label("current_streak"),
+                func.coalesce(UserTaskCounter.longest_streak, 0).label("longest_streak"),
+                UserTaskCounter.last_completed_on,
             )
-            total = total_result.scalar_one()
-            completed_result = await unit_of_work.session.execute(
-                select(func.count())
-                .select_from(Task)
-                .where(Task.is_completed.is_(True), Task.deleted_at.is_(None))
+            .select_from(User)
+            .outerjoin(UserTaskCounter, UserTaskCounter.user_id == User.id)
+            .where(User.id == user_id)
+        )
+        async with self.unit_of_work as unit_of_work:
+            row = (await unit_of_work.session.execute(statement)).first()
+        if row is None:
+            raise UserNotFoundError
+        return UserProgressSchema.model_validate(row._mapping)
+
+    async def get_completion_trend(
+        self,
+        interval: TrendInterval = TrendInterval.DAY,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        family_id: Optional[int] = None,
+        group_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ) -> CompletionTrendSchema:
+        """
+        Count completed tasks per day or week for a user, family or group.
+
+        A completion falls in the bucket of its local date in the assignee's
+        ``timezone``, or UTC for unassigned tasks. Buckets are truncated with
+        ``date_trunc`` and empty ones are filled by outer joining
+        ``generate_series`` in the same query, so the result has one row per
+        bucket without any per-row work in Python. The ``completed_at``
+        range is read from ``ix_tasks_assigned_user_id_completed_at``.
+
+        Args:
+            interval: Bucket width
+            start: First day of the series; defaults to 30 days or 12 weeks before ``end``
+            end: Last day of the series; defaults to today in UTC
+            family_id: Only count tasks assigned to members of this family
+            group_id: Only count tasks assigned to this group
+            user_id: Only count tasks assigned to this user
+        """
+        scope, scope_id = _resolve_scope(family_id, group_id, user_id)
+        if scope is TaskStatScope.ALL:
+            raise AppError("One of family_id, group_id and user_id is required")
+        end = end or datetime.now(UTC).date()
+        start = start or end - DEFAULT_TREND_SPANS[interval]
+        if start > end:
+            raise AppError("start must not be after end")
+        if end - start > MAX_TREND_SPAN:
+            raise AppError(f"The series may span at most {MAX_TREND_SPAN.days} days")
+        if interval is TrendInterval.WEEK:
+            start -= timedelta(days=start.weekday())
+            end -= timedelta(days=end.weekday())
+        step = TREND_STEPS[interval]
+
+        # Local dates are less than a day away from UTC, so a day of margin
+        # on both sides of the range covers every timezone.
+        lower = datetime.combine(start - timedelta(days=1), time(), UTC)
+        upper = datetime.combine(end + step + timedelta(days=1), time(), UTC)
+        # Literal SQL, so the bucket expression in GROUP BY matches the
+        # selected one.
+        local_completed_at = func.timezone(
+            func.coalesce(User.timezone, literal_column("'UTC'")), Task.completed_at
+        )
+        bucket = cast(
+            func.date_trunc(literal_column(f"'{interval.value}'"), local_completed_at), Date
+        )
+        completions = (
+            select(bucket.label("bucket"), func.count().label("completed"))
+            .select_from(Task)
+            .outerjoin(User, User.id == Task.assigned_user_id)
+            .where(
+                Task.completed_at >= lower,
+                Task.completed_at < upper,
+                Task.deleted_at.is_(None),
+                *_scope_criteria(scope, scope_id),
+            )
+            .group_by(bucket)
+            .subquery()
+        )
+        series = func.generate_series(
+            datetime.combine(start, time()), datetime.combine(end, time()), step
+        ).table_valued("bucket").render_derived(name="series")
+        series_bucket = cast(series.c.bucket, Date)
+        statement = (
+            select(
+                series_bucket.label("bucket"),
+                func.coalesce(completions.c.completed, 0).label("completed"),
             )
-            completed = completed_result.scalar_one()
-        return {"total_tasks": total, "completed_tasks": completed}
+            .select_from(series)
+            .outerjoin(completions, completions.c.bucket == series_bucket)
+            .order_by(series.c.bucket)
+        )
+        async with self.unit_of_work as unit_of_work:
+            result = await unit_of_work.session.execute(statement)
+            points = [CompletionTrendPointSchema.model_validate(row._mapping) for row in result]
+        return CompletionTrendSchema(interval=interval, start=start, end=end, points=points)
 
-    async def get_user_task_report(self, user_id: int) -> List[TaskResponseSchema]:
-        """List tasks assigned to a specific user."""
+    async def _stream(self, statement: Select) -> AsyncIterator[List[TaskResponseSchema]]:
+        """Yield the tasks selected by ``statement`` in batches from a server-side cursor."""
         async with self.unit_of_work as unit_of_work:
-            result = await unit_of_work.session.execute(
-                select(Task).where(Task.assigned_user_id == user_id, Task.deleted_at.is_(None))
+            result = await unit_of_work.session.stream(
+                statement.execution_options(yield_per=STREAM_BATCH_SIZE)
             )
-            tasks = result.scalars().all()
-        return [TaskResponseSchema.model_validate(task) for task in tasks]
+            async for rows in result.partitions():
+                yield [TaskResponseSchema.model_validate(row) for row in rows]
+
+    async def get_user_task_report(self, user_id: int) -> List[TaskResponseSchema]:
+        """List tasks assigned to a specific user."""
+
+        async def load():
+            async with self.unit_of_work as unit_of_work:
+                result = await unit_of_work.session.execute(_user_tasks_query(user_id))
+                tasks = result.all()
+            return [TaskResponseSchema.model_validate(task) for task in tasks], [("user", user_id)]
+
+        return await self._cached(("user_tasks", user_id), load)
+
+    def stream_user_task_report(self, user_id: int) -> AsyncIterator[List[TaskResponseSchema]]:
+        """Stream tasks assigned to a specific user in batches."""
+        return self._stream(_user_tasks_query(user_id))
 
     async def get_tasks_assigned_by_user(self, user_id: int) -> List[TaskResponseSchema]:
         """List tasks assigned by a specific user."""
-        statement = select(Task).where(
-            Task.assigned_by_user_id == user_id,
-            Task.assigned_user_id.isnot(None),
-            Task.assigned_user_id != user_id,
-            Task.deleted_at.is_(None),
-        )
         async with self.unit_of_work as unit_of_work:
-            result = await unit_of_work.session.execute(statement)
-            tasks = result.scalars().all()
+            result = await unit_of_work.session.execute(_assigned_by_tasks_query(user_id))
+            tasks = result.all()
         return [TaskResponseSchema.model_validate(task) for task in tasks]
 
+    def stream_tasks_assigned_by_user(self, user_id: int) -> AsyncIterator[List[TaskResponseSchema]]:
+        """Stream tasks assigned by a specific user in batches."""
+        return self._stream(_assigned_by_tasks_query(user_id))
+
     async def get_group_task_report(self, group_id: int) -> List[TaskResponseSchema]:
         """List tasks assigned to a group."""
-        async with self.unit_of_work as unit_of_work:
-            result = await unit_of_work.session.execute(
-                select(Task)
-                .join(task_group_association)
-                .where(
-                    task_group_association.c.group_id == group_id,
-                    Task.deleted_at.is_(None),
+
+        async def load():
+            async with self.unit_of_work as unit_of_work:
+                result = await unit_of_work.session.execute(_group_tasks_query(group_id))
+                tasks = result.all()
+            return [TaskResponseSchema.model_validate(task) for task in tasks], [("group", group_id)]
+
+        return await self._cached(("group_tasks", group_id), load)
+
+    def stream_group_task_report(self, group_id: int) -> AsyncIterator[List[TaskResponseSchema]]:
+        """Stream tasks assigned to a group in batches."""
+        return self._stream(_group_tasks_query(group_id))
+
+    async def get_user_groups_tasks(
+        self,
+        user_id: int,
+        status: Optional[TaskStatus] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> TaskPageSchema:
+        """
+        List one page of the live tasks from groups a user belongs to.
+
+        Args:
+            user_id: User whose groups to list tasks from
+            status: Only list tasks with this status
+            limit: Maximum number of tasks to return
+            cursor: Cursor returned with the previous page, if any
+        """
+        after_id = decode_cursor(cursor) if cursor is not None else None
+        query = _user_groups_tasks_query(user_id, status, after_id)
+
+        async def load():
+            async with self.unit_of_work as unit_of_work:
+                # Fetch one extra row to find out whether another page exists.
+                result = await unit_of_work.session.execute(query.limit(limit + 1))
+                tasks = result.all()
+                group_ids = await unit_of_work.session.scalars(
+                    select(GroupMembership.group_id).where(GroupMembership.user_id == user_id)
                 )
+                tags = [("user", user_id)] + [("group", group_id) for group_id in group_ids]
+            next_cursor = encode_cursor(tasks[limit - 1].id) if len(tasks) > limit else None
+            page = TaskPageSchema(
+                items=[TaskResponseSchema.model_validate(task) for task in tasks[:limit]],
+                next_cursor=next_cursor,
             )
-            tasks = result.scalars().all()
-        return [TaskResponseSchema.model_validate(task) for task in tasks]
+            return page, tags
 
-    async def get_user_groups_tasks(self, user_id: int) -> List[TaskResponseSchema]:
-        """List tasks from groups a user belongs to."""
-        statement = (
-            select(Task)
-            .join(task_group_association)
-            .join(
-                GroupMembership,
-                task_group_association.c.group_id == GroupMembership.group_id,
-            )
-            .where(GroupMembership.user_id == user_id)
+        return await self._cached(("user_groups_tasks", user_id, status, limit, cursor), load)
+
+    def stream_user_groups_tasks(
+        self, user_id: int, status: Optional[TaskStatus] = None
+    ) -> AsyncIterator[List[TaskResponseSchema]]:
+        """Stream the live tasks from groups a user belongs to in batches."""
+        return self._stream(_user_groups_tasks_query(user_id, status))
+
+    async def get_dashboard(self, user_id: int, group_id: Optional[int] = None) -> DashboardSchema:
+        """
+        Return the reports shown on a user's dashboard as one document.
+
+        Each report runs on its own unit of work, and therefore its own
+        pooled connection, concurrently with the others. At most
+        ``dashboard_concurrency`` reports run at once, so a single dashboard
+        cannot take over the connection pool.
+
+        Args:
+            user_id: User the dashboard is for
+            group_id: Also include the task report of this group
+        """
+        factory = self.unit_of_work_factory
+        semaphore = asyncio.Semaphore(self.dashboard_concurrency if factory else 1)
+
+        async def run(report: Callable[["ReportService"], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                service = self if factory is None else ReportService(factory(), self.cache)
+                return await report(service)
+
+        reports = [
+            run(lambda service: service.get_task_summary(user_id=user_id)),
+            run(lambda service: service.get_user_progress(user_id)),
+            run(lambda service: service.get_user_task_report(user_id)),
+            run(lambda service: service.get_tasks_assigned_by_user(user_id)),
+            run(lambda service: service.get_user_groups_tasks(user_id)),
+        ]
+        if group_id is not None:
+            reports.append(run(lambda service: service.get_group_task_report(group_id)))
+        summary, progress, assigned, assigned_by, user_groups, *group = await asyncio.gather(
+            *reports
+        )
+        return DashboardSchema(
+            summary=summary,
+            progress=progress,
+            assigned_tasks=assigned,
+            assigned_by_tasks=assigned_by,
+            user_groups_tasks=user_groups.items,
+            user_groups_next_cursor=user_groups.next_cursor,
+            group_tasks=group[0] if group else None,
         )
-        async with self.unit_of_work as unit_of_work:
-            result = await unit_of_work.session.execute(statement)
-            tasks = result.scalars().unique().all()
-        return [TaskResponseSchema.model_validate(task) for task in tasks]
@@ -1,10 +1,20 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
 from dependency_injector.wiring import inject, Provide
 
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
+from app.core.streaming import NDJSON_MEDIA_TYPE, ndjson_lines
 from app.dependencies import Container
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from ..schemas import (
+    TaskBulkCreateResultSchema,
+    TaskBulkCreateSchema,
+    TaskBulkStatusResultSchema,
+    TaskBulkStatusSchema,
     TaskCreateSchema,
+    TaskFilterSchema,
+    TaskPageSchema,
     TaskResponseSchema,
     TaskUpdateSchema,
     TaskAssignGroupsSchema,
@@ -17,16 +27,34 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 @router.get(
     "/",
-    response_model=List[TaskResponseSchema],
-    summary="Get all tasks",
+    response_model=TaskPageSchema,
+    summary="Get tasks",
 )
 @inject
 async def get_tasks(
+    response: Response,
+    filters: Annotated[TaskFilterSchema, Depends()],
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
     include_archived: bool = False,
+    if_none_match: Annotated[Optional[str], Header()] = None,
     service: TaskService = Depends(Provide[Container.task_service]),
-) -> List[TaskResponseSchema]:
-    """Retrieve all tasks from the system."""
-    return await service.get_tasks(include_archived)
+) -> TaskPageSchema | Response:
+    """Retrieve one page of tasks, optionally filtered.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to fetch the next page.
+    Send the returned ``ETag`` as ``If-None-Match`` to get a 304 while the
+    page is unchanged.
+    """
+    if if_none_match:
+        etag = await service.get_tasks_etag(filters, limit, cursor, include_archived)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    page = await service.get_tasks(filters, limit, cursor, include_archived)
+    response.headers[ETAG_HEADER] = service.page_etag(
+        filters, limit, cursor, include_archived, page
+    )
+    return page
 
 
 @router.post(
@@ -44,6 +72,64 @@ async def create_task(
     return await service.create_task(task_data)
 
 
+@router.post(
+    "/bulk",
+    response_model=TaskBulkCreateResultSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create tasks in bulk",
+)
+@inject
+async def create_tasks(
+    bulk_data: TaskBulkCreateSchema,
+    service: TaskService = Depends(Provide[Container.task_service]),
+) -> TaskBulkCreateResultSchema:
+    """Create several tasks in a single round trip.
+
+    Results are returned in request order. With ``atomic`` disabled, invalid
+    items are reported individually and the valid ones are still created.
+    """
+    return await service.create_tasks(bulk_data)
+
+
+@router.post(
+    "/bulk/status",
+    response_model=TaskBulkStatusResultSchema,
+    summary="Change the status of tasks in bulk",
+)
+@inject
+async def transition_tasks(
+    transition: TaskBulkStatusSchema,
+    service: TaskService = Depends(Provide[Container.task_service]),
+) -> TaskBulkStatusResultSchema:
+    """Move several tasks to the same status in one statement.
+
+    Ids that do not exist or are archived are listed in ``missing_ids``.
+    """
+    return await service.transition_tasks(transition)
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    summary="Stream all tasks as NDJSON",
+)
+@inject
+async def stream_tasks(
+    filters: Annotated[TaskFilterSchema, Depends()],
+    include_archived: bool = False,
+    service: TaskService = Depends(Provide[Container.task_service]),
+) -> StreamingResponse:
+    """Stream every matching task as newline-delimited JSON.
+
+    Rows are read through a server-side cursor and flushed batch by batch, so
+    memory use stays flat regardless of the number of tasks exported.
+    """
+    return StreamingResponse(
+        ndjson_lines(service.stream_tasks(filters, include_archived)),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
+
+
 @router.get(
     "/{task_id}",
     response_model=TaskResponseSchema,
@@ -52,11 +138,22 @@ async def create_task(
 @inject
 async def get_task_by_id(
     task_id: int,
+    response: Response,
     include_archived: bool = False,
+    if_none_match: Annotated[Optional[str], Header()] = None,
     service: TaskService = Depends(Provide[Container.task_service]),
-) -> TaskResponseSchema:
-    """Get detailed information about a specific task."""
-    return await service.get_task_by_id(task_id, include_archived)
+) -> TaskResponseSchema | Response:
+    """Get detailed information about a specific task.
+
+    Answers 304 when ``If-None-Match`` carries the task's current ``ETag``.
+    """
+    if if_none_match:
+        etag = await service.get_task_etag(task_id, include_archived)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    task = await service.get_task_by_id(task_id, include_archived)
+    response.headers[ETAG_HEADER] = service.task_etag(task.id, task.updated_at)
+    return task
 
 
 @router.put(
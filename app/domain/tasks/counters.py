@@ -0,0 +1,320 @@
+"""Per-user completion counters.
+
+``user_task_counters`` holds each user's completed task count, reward point
+total and completion streaks, so achievement checks and progress reports
+read one row instead of counting the user's task history. ``TaskRepository``
+adds the user's ``task_stats`` deltas to the row in the same transaction as
+the task write, and a write that completes tasks also extends the streak.
+
+Streaks only ever grow between repairs: moving a task out of completed
+lowers the counts but leaves the streak as it was. Check the counters
+against ``tasks``, and repair the rows that differ, with::
+
+    python -m app.domain.tasks.counters --repair --chunk-size 10000
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    func,
+    or_,
+    select,
+    text,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import setup_logging
+from app.database import DatabaseConfig, UnitOfWork, create_db_manager
+from app.domain.users.models import User
+from .models import Task, TaskStatus, UserTaskCounter
+from .stats import TaskStatDelta, TaskStatScope
+
+logger = logging.getLogger(__name__)
+
+CHECK_CHUNK_SIZE = 10_000
+COUNTER_COLUMNS = (
+    "completed_tasks",
+    "reward_points",
+    "current_streak",
+    "longest_streak",
+    "last_completed_on",
+)
+
+
+def _recount(lower: int, upper: int):
+    """Select every counter of the users in (lower, upper] recomputed from ``tasks``."""
+    completed = (
+        Task.assigned_user_id > lower,
+        Task.assigned_user_id <= upper,
+        Task.status == TaskStatus.COMPLETED,
+        Task.deleted_at.is_(None),
+    )
+    totals = (
+        select(
+            Task.assigned_user_id.label("user_id"),
+            func.count().label("completed_tasks"),
+            func.sum(Task.reward_points).label("reward_points"),
+        )
+        .where(*completed)
+        .group_by(Task.assigned_user_id)
+        .subquery()
+    )
+    local_day = cast(func.timezone(User.timezone, Task.completed_at), Date)
+    days = (
+        select(Task.assigned_user_id.label("user_id"), local_day.label("day"))
+        .join(User, User.id == Task.assigned_user_id)
+        .where(*completed, Task.completed_at.is_not(None))
+        .distinct()
+        .subquery()
+    )
+    # Consecutive days minus their position within the user's days give the
+    # same date, which identifies the run they belong to.
+    position = func.row_number().over(partition_by=days.c.user_id, order_by=days.c.day)
+    runs = select(
+        days.c.user_id, days.c.day, (days.c.day - cast(position, Integer)).label("run")
+    ).subquery()
+    run_lengths = (
+        select(
+            runs.c.user_id,
+            func.count().label("days"),
+            func.max(runs.c.day).label("last_day"),
+        )
+        .group_by(runs.c.user_id, runs.c.run)
+        .subquery()
+    )
+    latest_run = func.array_agg(
+        aggregate_order_by(run_lengths.c.days, run_lengths.c.last_day.desc()),
+        type_=ARRAY(BigInteger),
+    )[1]
+    streaks = (
+        select(
+            run_lengths.c.user_id,
+            latest_run.label("current_streak"),
+            func.max(run_lengths.c.days).label("longest_streak"),
+            func.max(run_lengths.c.last_day).label("last_completed_on"),
+        )
+        .group_by(run_lengths.c.user_id)
+        .subquery()
+    )
+    return (
+        select(
+            User.id.label("user_id"),
+            func.coalesce(totals.c.completed_tasks, 0).label("completed_tasks"),
+            func.coalesce(totals.c.reward_points, 0).label("reward_points"),
+            func.coalesce(streaks.c.current_streak, 0).label("current_streak"),
+            func.coalesce(streaks.c.longest_streak, 0).label("longest_streak"),
+            streaks.c.last_completed_on,
+        )
+        .outerjoin(totals, totals.c.user_id == User.id)
+        .outerjoin(streaks, streaks.c.user_id == User.id)
+        .where(User.id > lower, User.id <= upper)
+        .subquery()
+    )
+
+
+class UserTaskCountersRepository:
+    """Repository maintaining and reading ``user_task_counters``."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def apply(self, deltas: Iterable[TaskStatDelta], completing: bool = False) -> None:
+        """
+        Add the completed-task part of rollup deltas to the users' counters.
+
+        With ``completing``, the deltas come from tasks that were just
+        completed, and users gaining a completed task extend their streak
+        to today.
+        """
+        changes: Dict[int, Tuple[int, int]] = {}
+        for delta in deltas:
+            if (
+                delta.scope == TaskStatScope.USER.value
+                and delta.status == TaskStatus.COMPLETED.value
+            ):
+                count, points = changes.get(delta.scope_id, (0, 0))
+                changes[delta.scope_id] = (count + delta.count, points + delta.points)
+        if not changes:
+            return
+
+        rows = values(
+            column("user_id", Integer),
+            column("count", BigInteger),
+            column("points", BigInteger),
+            column("completed", Boolean),
+            name="changes",
+        ).data(
+            [
+                (user_id, count, points, completing and count > 0)
+                for user_id, (count, points) in sorted(changes.items())
+            ]
+        )
+        today = case(
+            (rows.c.completed, cast(func.timezone(User.timezone, func.now()), Date)),
+            else_=None,
+        )
+        started = case((rows.c.completed, 1), else_=0)
+        upsert = pg_insert(UserTaskCounter).from_select(
+            ["user_id", *COUNTER_COLUMNS],
+            select(rows.c.user_id, rows.c.count, rows.c.points, started, started, today)
+            .join(User, User.id == rows.c.user_id)
+            # Taking the row locks in a fixed order keeps concurrent writers
+            # from deadlocking on each other.
+            .order_by(rows.c.user_id),
+        )
+        completed_on = upsert.excluded.last_completed_on
+        streak = case(
+            (
+                or_(
+                    completed_on.is_(None),
+                    UserTaskCounter.last_completed_on >= completed_on,
+                ),
+                UserTaskCounter.current_streak,
+            ),
+            (
+                UserTaskCounter.last_completed_on == completed_on - 1,
+                UserTaskCounter.current_streak + 1,
+            ),
+            else_=1,
+        )
+        await self.session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[UserTaskCounter.user_id],
+                set_={
+                    "completed_tasks": UserTaskCounter.completed_tasks
+                    + upsert.excluded.completed_tasks,
+                    "reward_points": UserTaskCounter.reward_points
+                    + upsert.excluded.reward_points,
+                    "current_streak": streak,
+                    "longest_streak": func.greatest(UserTaskCounter.longest_streak, streak),
+                    # GREATEST ignores nulls.
+                    "last_completed_on": func.greatest(
+                        UserTaskCounter.last_completed_on, completed_on
+                    ),
+                },
+            )
+        )
+
+    async def get_many(self, user_ids: List[int]) -> Dict[int, Row]:
+        """Return the counter rows of several users; users without one have none yet."""
+        result = await self.session.execute(
+            select(
+                UserTaskCounter.user_id,
+                *(getattr(UserTaskCounter, name) for name in COUNTER_COLUMNS),
+            ).where(
+                UserTaskCounter.user_id
+                == any_(bindparam("counter_user_ids", user_ids, type_=ARRAY(Integer)))
+            )
+        )
+        return {row.user_id: row for row in result}
+
+    async def get_page(self, after_user_id: int, limit: int) -> Dict[int, Row]:
+        """Return up to ``limit`` counter rows of the users after ``after_user_id``, in id order."""
+        result = await self.session.execute(
+            select(
+                UserTaskCounter.user_id,
+                *(getattr(UserTaskCounter, name) for name in COUNTER_COLUMNS),
+            )
+            .where(UserTaskCounter.user_id > after_user_id)
+            .order_by(UserTaskCounter.user_id)
+            .limit(limit)
+        )
+        return {row.user_id: row for row in result}
+
+    async def check(self, lower: int, upper: int, repair: bool = False) -> List[int]:
+        """
+        Compare the counters of users in (lower, upper] with their tasks.
+
+        With ``repair``, rows that differ are overwritten with the recomputed
+        values. The table is locked against concurrent counter updates until
+        the surrounding transaction ends, so a task write either finishes
+        before the recount or adds its change on top of the repaired row.
+
+        Returns:
+            Ids of the users whose counters differed
+        """
+        if repair:
+            await self.session.execute(text("LOCK TABLE user_task_counters IN EXCLUSIVE MODE"))
+        recount = _recount(lower, upper)
+        stored = {
+            name: getattr(UserTaskCounter, name)
+            if name == "last_completed_on"
+            else func.coalesce(getattr(UserTaskCounter, name), 0)
+            for name in COUNTER_COLUMNS
+        }
+        # A user without a row matches when nothing of theirs is completed.
+        mismatched = (
+            select(recount)
+            .outerjoin(UserTaskCounter, UserTaskCounter.user_id == recount.c.user_id)
+            .where(or_(*(recount.c[name].is_distinct_from(stored[name]) for name in stored)))
+            .order_by(recount.c.user_id)
+        )
+        if not repair:
+            result = await self.session.execute(select(mismatched.subquery().c.user_id))
+            return list(result.scalars())
+        upsert = pg_insert(UserTaskCounter).from_select(
+            ["user_id", *COUNTER_COLUMNS], mismatched
+        )
+        result = await self.session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[UserTaskCounter.user_id],
+                set_={name: upsert.excluded[name] for name in COUNTER_COLUMNS},
+            ).returning(UserTaskCounter.user_id)
+        )
+        return sorted(result.scalars())
+
+
+async def main() -> int:
+    setup_logging()
+    parser = argparse.ArgumentParser(
+        description="Check user_task_counters against tasks, optionally repairing them."
+    )
+    parser.add_argument("--repair", action="store_true", help="overwrite counters that differ")
+    parser.add_argument("--chunk-size", type=int, default=CHECK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    db_manager = create_db_manager(DatabaseConfig())
+    mismatched = 0
+    try:
+        async with UnitOfWork(db_manager.session_factory) as unit_of_work:
+            max_id = await unit_of_work.session.scalar(select(func.max(User.id))) or 0
+        for lower in range(0, max_id, args.chunk_size):
+            upper = lower + args.chunk_size
+            # One transaction per chunk keeps the repair lock short.
+            async with UnitOfWork(db_manager.session_factory) as unit_of_work:
+                user_ids = await UserTaskCountersRepository(unit_of_work.session).check(
+                    lower, upper, repair=args.repair
+                )
+            if user_ids:
+                logger.warning(
+                    "%s the counters of %s users between %s and %s",
+                    "Repaired" if args.repair else "Found drift in",
+                    len(user_ids),
+                    user_ids[0],
+                    user_ids[-1],
+                )
+            mismatched += len(user_ids)
+            logger.info("Checked task counters up to user %s", min(upper, max_id))
+    finally:
+        await db_manager.close()
+    logger.info("%s users had drifted counters", mismatched)
+    return 1 if mismatched and not args.repair else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,130 @@
+"""In-memory family and group leaderboards on reward points.
+
+A member's score is the sum of ``reward_points`` over their completed live
+tasks, as rolled up in ``task_stats``. Top-N and rank lookups are served
+from :mod:`app.core.ranking` and never touch the database.
+
+Boards are loaded from the database at startup and reloaded periodically.
+The reload picks up membership changes and writes committed by other
+processes. In between, ``TaskRepository`` applies the score changes of each
+of its commits.
+"""
+from enum import Enum
+import logging
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundError
+from app.core.ranking import Leaderboards
+from app.database import UnitOfWork
+from app.domain.groups.membership import GroupMembership
+from app.domain.users.models import User
+from .models import TaskStat, TaskStatus
+from .schemas import LeaderboardEntrySchema
+from .stats import TaskStatScope
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_SIZE = 10
+# Reads of the boards' data redone when scores change while they run.
+REBUILD_ATTEMPTS = 3
+
+
+class LeaderboardScope(str, Enum):
+    """Member sets that are ranked."""
+
+    FAMILY = "family"
+    GROUP = "group"
+
+
+BoardKey = Tuple[LeaderboardScope, int]
+
+leaderboards = Leaderboards()
+
+
+class LeaderboardRepository:
+    """Repository reading the data leaderboards are built from."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_scores(self) -> Dict[int, int]:
+        """Return the reward points of every user with completed tasks."""
+        result = await self.session.execute(
+            select(TaskStat.scope_id, func.sum(TaskStat.points))
+            .where(
+                TaskStat.scope == TaskStatScope.USER.value,
+                TaskStat.status == TaskStatus.COMPLETED.value,
+            )
+            .group_by(TaskStat.scope_id)
+        )
+        return {user_id: int(points) for user_id, points in result}
+
+    async def get_memberships(self) -> List[Tuple[BoardKey, int]]:
+        """Return every (board, user id) membership."""
+        families = await self.session.execute(
+            select(User.family_id, User.id).where(User.family_id.is_not(None))
+        )
+        groups = await self.session.execute(
+            select(GroupMembership.group_id, GroupMembership.user_id)
+        )
+        return [
+            ((LeaderboardScope.FAMILY, family_id), user_id) for family_id, user_id in families
+        ] + [((LeaderboardScope.GROUP, group_id), user_id) for group_id, user_id in groups]
+
+
+class LeaderboardService:
+    """Service loading and querying the in-memory leaderboards."""
+
+    def __init__(
+        self,
+        repository_factory,
+        unit_of_work: UnitOfWork,
+        boards: Leaderboards = leaderboards,
+    ):
+        self.repository_factory = repository_factory
+        self.unit_of_work = unit_of_work
+        self.boards = boards
+
+    async def rebuild(self) -> None:
+        """
+        Reload every board from the database.
+
+        A commit of this process that adds points while the data is read
+        may not be part of it, so the read is redone rather than loaded
+        over those points. If scores keep changing, the current boards,
+        which have every such change applied, stay until the next reload.
+        """
+        for _ in range(REBUILD_ATTEMPTS):
+            generation = self.boards.generation
+            async with self.unit_of_work as unit_of_work:
+                repository = self.repository_factory(unit_of_work.session)
+                scores = await repository.get_scores()
+                memberships = await repository.get_memberships()
+            if self.boards.load(scores, memberships, generation):
+                logger.info("Loaded leaderboards for %s memberships", len(memberships))
+                return
+        logger.warning(
+            "Scores changed during %s leaderboard reloads in a row; keeping the current boards",
+            REBUILD_ATTEMPTS,
+        )
+
+    def get_top(
+        self, scope: LeaderboardScope, scope_id: int, limit: int = DEFAULT_TOP_SIZE
+    ) -> List[LeaderboardEntrySchema]:
+        """Return the best ranked members of a family or group."""
+        return [
+            LeaderboardEntrySchema.model_validate(entry._asdict())
+            for entry in self.boards.top((scope, scope_id), limit)
+        ]
+
+    def get_rank(
+        self, scope: LeaderboardScope, scope_id: int, user_id: int
+    ) -> LeaderboardEntrySchema:
+        """Return the rank of one member of a family or group."""
+        entry = self.boards.rank((scope, scope_id), user_id)
+        if entry is None:
+            raise NotFoundError(f"User is not a member of this {scope.value}")
+        return LeaderboardEntrySchema.model_validate(entry._asdict())
@@ -1,8 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum as PyEnum
 from typing import Optional, List, TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, Enum as SqlEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Enum as SqlEnum, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -26,12 +26,79 @@ class Task(Base):
     """Task model representing a task in the system."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Composite partial indexes backing the filtered keyset listing.
+        Index(
+            "ix_tasks_live_assignee_status",
+            "assigned_user_id",
+            "status",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_tasks_live_status_priority",
+            "status",
+            "priority",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_tasks_live_due_date",
+            "due_date",
+            "id",
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Foreign key lookups from reports, achievements and user deletes.
+        Index("ix_tasks_assigned_user_id_status", "assigned_user_id", "status"),
+        Index("ix_tasks_assigned_by_user_id", "assigned_by_user_id"),
+        # Live completions per assignee over time. The predicate lets the
+        # completion trend read them with an index-only scan.
+        Index(
+            "ix_tasks_assigned_user_id_completed_at",
+            "assigned_user_id",
+            "completed_at",
+            postgresql_where=text("completed_at IS NOT NULL AND deleted_at IS NULL"),
+        ),
+        # Open tasks by due date, counted by the overdue report.
+        Index(
+            "ix_tasks_open_due_date",
+            "due_date",
+            postgresql_where=text("deleted_at IS NULL AND status <> 'completed'"),
+        ),
+        # Assigned open tasks whose current due date has not been reminded
+        # of yet, one index per reminder kind, swept by the reminder engine.
+        # Reminding a task drops it from the index.
+        Index(
+            "ix_tasks_due_soon_reminder_pending",
+            "due_date",
+            postgresql_where=text(
+                "deleted_at IS NULL AND status <> 'completed' AND status <> 'cancelled'"
+                " AND assigned_user_id IS NOT NULL"
+                " AND due_soon_reminded_for IS DISTINCT FROM due_date"
+            ),
+        ),
+        Index(
+            "ix_tasks_overdue_reminder_pending",
+            "due_date",
+            postgresql_where=text(
+                "deleted_at IS NULL AND status <> 'completed' AND status <> 'cancelled'"
+                " AND assigned_user_id IS NOT NULL"
+                " AND overdue_reminded_for IS DISTINCT FROM due_date"
+            ),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     status: Mapped[TaskStatus] = mapped_column(
-        SqlEnum(TaskStatus, name="taskstatus"),
+        # Persist the lowercase values, matching the labels created by the
+        # migration, rather than the member names.
+        SqlEnum(
+            TaskStatus,
+            name="taskstatus",
+            values_callable=lambda statuses: [status.value for status in statuses],
+        ),
         default=TaskStatus.PENDING,
     )
     priority: Mapped[int] = mapped_column(Integer, default=1)
@@ -45,6 +112,10 @@ class Task(Base):
         DateTime(timezone=True),
         nullable=False,
     )
+    due_date: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     completed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
@@ -54,6 +125,16 @@ class Task(Base):
         nullable=True,
     )
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Due date each reminder kind was last sent for; a new due date is
+    # reminded of again.
+    due_soon_reminded_for: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    overdue_reminded_for: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
 
     assigned_user_id: Mapped[Optional[int]] = mapped_column(
         Integer,
@@ -80,9 +161,56 @@ class Task(Base):
         Group,
         secondary=task_group_association,
         back_populates="tasks",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     def __repr__(self) -> str:  # pragma: no cover - simple repr
         return f"Task(id={self.id}, title='{self.title}', status={self.status})"
 
+
+class TaskStat(Base):
+    """Rolled-up task count and reward points for one scope, status and priority.
+
+    ``status`` holds a task status value, or ``"archived"`` for archived
+    tasks of any status. The global scope uses ``scope_id`` 0.
+    """
+
+    __tablename__ = "task_stats"
+
+    scope: Mapped[str] = mapped_column(String(16), primary_key=True)
+    scope_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    priority: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    points: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default=text("0")
+    )
+
+
+class UserTaskCounter(Base):
+    """Completion counters of one user, kept up to date on every task write.
+
+    ``completed_tasks`` and ``reward_points`` cover the user's completed
+    tasks that are not archived. Streaks count consecutive days, in the
+    user's timezone, with at least one completion; ``current_streak`` is
+    the run ending on ``last_completed_on``.
+    """
+
+    __tablename__ = "user_task_counters"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    completed_tasks: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default=text("0")
+    )
+    reward_points: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default=text("0")
+    )
+    current_streak: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    longest_streak: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    last_completed_on: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
@@ -0,0 +1,37 @@
+"""Keyset pagination helpers for task listings.
+
+Pages are ordered by ``Task.id`` and the cursor carries the id of the last
+task on the previous page, so fetching any page is an index range scan that
+does not depend on how many rows precede it.
+"""
+import base64
+import binascii
+import json
+
+from app.core.exceptions import AppError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the id of the last returned row into an opaque cursor."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        AppError: If the cursor is malformed
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise AppError("Invalid pagination cursor") from exc
+    if not isinstance(last_id, int) or isinstance(last_id, bool) or last_id < 0:
+        raise AppError("Invalid pagination cursor")
+    return last_id
@@ -0,0 +1,178 @@
+"""Due-date reminders for open tasks.
+
+Each task records, per reminder kind, the due date it was last reminded
+for. A sweep reads the assigned open tasks due by the current target whose
+due date has not been reminded of yet, through a partial index per kind
+that only holds such tasks. Its cost therefore depends on the number of
+reminders to send, however many tasks are open, and a task that is created
+or rescheduled with a due date already in the window is picked up by the
+next sweep.
+
+Each batch marks its tasks and creates their notifications in a single
+statement. Tasks locked by a concurrent sweep are skipped, so no task is
+reminded twice for the same due date.
+"""
+from datetime import datetime, timedelta
+from enum import Enum
+import logging
+from typing import Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, insert, literal_column, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import UnitOfWork
+from app.domain.notifications.models import Notification
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+UTC = ZoneInfo("UTC")
+DEFAULT_LEAD_TIME = timedelta(hours=24)
+DEFAULT_BATCH_SIZE = 1000
+
+# Must match the predicate of ix_tasks_open_due_date. It is written as
+# literal SQL because a bound parameter cannot prove a partial index
+# predicate for a generic prepared plan.
+OPEN_TASK_CRITERIA = (
+    Task.deleted_at.is_(None),
+    Task.status != literal_column("'completed'"),
+)
+
+
+class ReminderKind(str, Enum):
+    """Kinds of due-date reminders, each with its own marker column."""
+
+    DUE_SOON = "due_soon"
+    OVERDUE = "overdue"
+
+
+REMINDER_SUFFIXES = {
+    ReminderKind.DUE_SOON: "\" is due soon",
+    ReminderKind.OVERDUE: "\" is overdue",
+}
+REMINDED_FOR_COLUMNS = {
+    ReminderKind.DUE_SOON: Task.due_soon_reminded_for,
+    ReminderKind.OVERDUE: Task.overdue_reminded_for,
+}
+
+
+def _pending_criteria(kind: ReminderKind) -> tuple:
+    """Match the predicate of the ``ix_tasks_<kind>_reminder_pending`` index."""
+    return (
+        *OPEN_TASK_CRITERIA,
+        Task.status != literal_column("'cancelled'"),
+        Task.assigned_user_id.is_not(None),
+        REMINDED_FOR_COLUMNS[kind].is_distinct_from(Task.due_date),
+    )
+
+
+class TaskReminderRepository:
+    """Repository for the reminder sweep."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_reminders(
+        self, kind: ReminderKind, now: datetime, target: datetime, batch_size: int
+    ) -> Tuple[int, int]:
+        """
+        Remind the assignees of up to ``batch_size`` tasks due by ``target``.
+
+        The tasks are marked as reminded for their current due date. A task
+        that is already overdue is only marked for ``DUE_SOON``, since the
+        overdue reminder covers it.
+
+        Returns:
+            Number of tasks marked, and of notifications created
+        """
+        reminded_for = REMINDED_FOR_COLUMNS[kind]
+        batch = (
+            select(Task.id)
+            .where(*_pending_criteria(kind), Task.due_date <= target)
+            .order_by(Task.due_date)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        marked = (
+            update(Task)
+            .where(Task.id.in_(batch.scalar_subquery()))
+            .values({reminded_for.key: Task.due_date})
+            .returning(Task.assigned_user_id, Task.title, Task.due_date)
+            .cte("marked")
+        )
+        message = func.concat('Task "', marked.c.title, REMINDER_SUFFIXES[kind])
+        due = select(
+            marked.c.assigned_user_id,
+            message,
+            literal_column("false"),
+            func.now(),
+        )
+        if kind is ReminderKind.DUE_SOON:
+            due = due.where(marked.c.due_date > now)
+        notified = (
+            insert(Notification)
+            .from_select(["user_id", "message", "is_read", "created_at"], due)
+            .returning(Notification.id)
+            .cte("notified")
+        )
+        result = await self.session.execute(
+            select(
+                select(func.count()).select_from(marked).scalar_subquery(),
+                select(func.count()).select_from(notified).scalar_subquery(),
+            )
+        )
+        marked_count, notified_count = result.one()
+        return marked_count, notified_count
+
+
+class TaskReminderService:
+    """Service turning due and overdue tasks into notifications."""
+
+    def __init__(
+        self,
+        repository_factory,
+        unit_of_work: UnitOfWork,
+        lead_time: timedelta = DEFAULT_LEAD_TIME,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.repository_factory = repository_factory
+        self.unit_of_work = unit_of_work
+        self.lead_time = lead_time
+        self.batch_size = batch_size
+
+    def _target(self, kind: ReminderKind, now: datetime) -> datetime:
+        return now + self.lead_time if kind == ReminderKind.DUE_SOON else now
+
+    async def sweep(self, kind: ReminderKind) -> int:
+        """
+        Create the pending reminders of one kind.
+
+        Each batch runs in its own transaction. Concurrent sweeps from
+        several workers skip the tasks the others have locked, so they
+        split the work instead of duplicating reminders.
+
+        Returns:
+            Number of notifications created
+        """
+        created = 0
+        while True:
+            async with self.unit_of_work as unit_of_work:
+                repository = self.repository_factory(unit_of_work.session)
+                now = datetime.now(UTC)
+                marked, notified = await repository.create_reminders(
+                    kind, now, self._target(kind, now), self.batch_size
+                )
+            created += notified
+            if marked < self.batch_size:
+                break
+        return created
+
+    async def run(self) -> int:
+        """Sweep every reminder kind once."""
+        created = 0
+        for kind in ReminderKind:
+            created += await self.sweep(kind)
+        if created:
+            logger.info("Created %s task reminders", created)
+        return created
@@ -1,19 +1,93 @@
-from typing import List
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    any_,
+    bindparam,
+    case,
+    delete,
+    func,
+    insert,
+    null,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import invalidate_after_commit
+from app.core.transactions import after_commit
+from app.core.work_queue import WorkQueue
 from app.domain.base import BaseRepository
 from .models import Task, TaskStatus
 from app.domain.groups.models import Group
+from app.domain.groups.associations import task_group_association
 from app.domain.users.models import User
-from .schemas import TaskCreateSchema, TaskResponseSchema, TaskUpdateSchema
+from .counters import UserTaskCountersRepository
+from .leaderboard import leaderboards
+from .stats import TaskStatDelta, TaskStatScope, TaskStatsRepository
+from .pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from .schemas import (
+    TaskBulkItemResultSchema,
+    TaskCreateSchema,
+    TaskFilterSchema,
+    TaskPageSchema,
+    TaskResponseSchema,
+    TaskUpdateSchema,
+)
 from app.domain.achievements.repository import AchievementRepository
-from app.core.exceptions import AppError, TaskNotFoundError, GroupNotFoundError
+from app.core.exceptions import (
+    AppError,
+    GroupNotFoundError,
+    TaskNotFoundError,
+    UserNotFoundError,
+)
 
 UTC = ZoneInfo("UTC")
+STREAM_BATCH_SIZE = 500
+# Columns that decide which task_stats counters a task feeds, and with what.
+STAT_COLUMNS = frozenset({"status", "priority", "assigned_user_id", "reward_points"})
+
+# Columns needed to build a TaskResponseSchema. Selecting them directly
+# returns plain rows, which skips entity construction, identity-map
+# bookkeeping and the eager load of Task.assigned_groups.
+TASK_RESPONSE_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.reward_points,
+    Task.due_date,
+    Task.created_at,
+    Task.updated_at,
+    Task.completed_at,
+    Task.deleted_at,
+    Task.is_archived,
+    Task.assigned_user_id,
+    Task.assigned_by_user_id,
+)
+
+
+def select_task_rows() -> Select:
+    """Return a lean SELECT of the task columns used by responses."""
+    return select(*TASK_RESPONSE_COLUMNS)
+
+
+def _completed_at(status: TaskStatus) -> ColumnElement:
+    """
+    Return the ``completed_at`` to set when moving a task to ``status``.
+
+    A task that was already completed keeps its completion time.
+    """
+    if status != TaskStatus.COMPLETED:
+        return null()
+    return case((Task.status == TaskStatus.COMPLETED, Task.completed_at), else_=func.now())
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -21,22 +95,148 @@ class TaskRepository(BaseRepository[Task]):
 
     model = Task
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, achievement_queue: Optional[WorkQueue] = None):
+        """
+        Args:
+            session: Session the repository works in
+            achievement_queue: Queue that evaluates the achievements of users
+                with newly completed tasks after commit; without one they are
+                evaluated inline, in the same transaction
+        """
         super().__init__(session)
+        self.stats = TaskStatsRepository(session)
+        self.counters = UserTaskCountersRepository(session)
+        self.achievement_queue = achievement_queue
+
+    async def _tasks_completed(self, user_ids: Iterable[Optional[int]]) -> None:
+        """Have achievements evaluated for assignees of newly completed tasks."""
+        user_ids = sorted({user_id for user_id in user_ids if user_id})
+        if not user_ids:
+            return
+        if self.achievement_queue is None:
+            await AchievementRepository(self.session).evaluate_achievements(user_ids)
+        else:
+            queue = self.achievement_queue
+            after_commit(self.session, lambda: queue.put_many(user_ids))
+
+    def _after_stats_change(self, deltas: List[TaskStatDelta]) -> None:
+        """Publish rollup changes to caches and leaderboards once committed."""
+        invalidate_after_commit(self.session, {(d.scope, d.scope_id) for d in deltas})
+        points: Dict[int, int] = {}
+        for delta in deltas:
+            if (
+                delta.points
+                and delta.scope == TaskStatScope.USER.value
+                and delta.status == TaskStatus.COMPLETED.value
+            ):
+                points[delta.scope_id] = points.get(delta.scope_id, 0) + delta.points
+        if points:
+            after_commit(self.session, lambda: leaderboards.add_points(points))
+
+    async def _lock(self, task_ids: Iterable[int]) -> Dict[int, TaskStatus]:
+        """Lock tasks, in id order, until the transaction ends and return their statuses."""
+        ids = bindparam("lock_task_ids", list(task_ids), type_=ARRAY(Integer))
+        result = await self.session.execute(
+            select(Task.id, Task.status)
+            .where(Task.id == any_(ids))
+            .order_by(Task.id)
+            .with_for_update()
+        )
+        return {task_id: status for task_id, status in result}
+
+    async def _uncount(
+        self, task_ids: Iterable[int], locked: bool = False
+    ) -> Dict[int, TaskStatus]:
+        """
+        Remove tasks from task_stats and their assignees' counters ahead of changing them.
+
+        The tasks are locked first, unless the caller already holds their
+        locks. A concurrent writer of the same tasks then waits for this
+        transaction to end and, since every statement reads the latest
+        committed rows, uncounts the state it left behind rather than the
+        state both started from.
+
+        Here and in :meth:`_count`, cached reports of every scope whose
+        counters change are invalidated, and leaderboard scores updated,
+        once the transaction commits.
+
+        Returns:
+            Status of each task locked here, before the change
+        """
+        task_ids = list(task_ids)
+        statuses = {} if locked else await self._lock(task_ids)
+        deltas = await self.stats.remove_tasks(task_ids)
+        await self.counters.apply(deltas)
+        self._after_stats_change(deltas)
+        return statuses
+
+    async def uncount_assigned_to(self, user_id: int) -> None:
+        """Remove the tasks assigned to a user from the rollup, ahead of deleting them with the user."""
+        result = await self.session.execute(
+            select(Task.id)
+            .where(Task.assigned_user_id == user_id)
+            .order_by(Task.id)
+            .with_for_update()
+        )
+        task_ids = list(result.scalars())
+        if task_ids:
+            await self._uncount(task_ids, locked=True)
+
+    async def _count(self, task_ids: Iterable[int], completing: bool = False) -> None:
+        """
+        Add tasks to task_stats and their assignees' counters after changing them.
+
+        Args:
+            task_ids: Changed tasks
+            completing: The change completed the tasks, which extends the
+                assignees' streaks
+        """
+        deltas = await self.stats.add_tasks(task_ids)
+        await self.counters.apply(deltas, completing)
+        self._after_stats_change(deltas)
+
+    async def _invalidate_reports(self, task_id: int, assigned_user_id: Optional[int]) -> None:
+        """Invalidate cached reports listing a task whose counters did not change."""
+        result = await self.session.execute(
+            select(task_group_association.c.group_id).where(
+                task_group_association.c.task_id == task_id
+            )
+        )
+        tags = {(TaskStatScope.GROUP.value, group_id) for group_id in result.scalars()}
+        if assigned_user_id is not None:
+            tags.add((TaskStatScope.USER.value, assigned_user_id))
+        invalidate_after_commit(self.session, tags)
 
     @staticmethod
-    def _to_task_details(task: Task) -> TaskResponseSchema:
+    def _to_task_details(task: Task | Row) -> TaskResponseSchema:
         """
         Convert Task model to TaskResponseSchema schema.
 
         Args:
-            task: Task model instance
+            task: Task model instance or a row holding the task columns
 
         Returns:
             TaskResponseSchema schema instance
         """
         return TaskResponseSchema.model_validate(task)
 
+    @staticmethod
+    def _new_task_values(task_data: TaskCreateSchema, now: datetime) -> dict:
+        """Build the column values for inserting a new task."""
+        return {
+            "title": task_data.title,
+            "description": task_data.description,
+            "priority": task_data.priority,
+            "reward_points": task_data.reward_points,
+            "due_date": task_data.due_date,
+            "assigned_user_id": task_data.assigned_user_id,
+            "assigned_by_user_id": task_data.assigned_by_user_id,
+            "status": task_data.status,
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": now if task_data.status == TaskStatus.COMPLETED else None,
+        }
+
     async def create(self, task_data: TaskCreateSchema) -> TaskResponseSchema:
         """
         Create a new task.
@@ -47,24 +247,79 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             Created task details
         """
-        db_task = Task(
-            title=task_data.title,
-            description=task_data.description,
-            priority=task_data.priority,
-            reward_points=task_data.reward_points,
-            due_date=task_data.due_date,
-            assigned_user_id=task_data.assigned_user_id,
-            assigned_by_user_id=task_data.assigned_by_user_id,
-            status=task_data.status,
-            created_at=datetime.now(UTC),
-            updated_at=datetime.now(UTC),
-        )
-        if db_task.status == TaskStatus.COMPLETED:
-            db_task.completed_at = datetime.now(UTC)
+        db_task = Task(**self._new_task_values(task_data, datetime.now(UTC)))
         self.session.add(db_task)
         await self.session.flush()
+        await self._count([db_task.id], task_data.status == TaskStatus.COMPLETED)
         return self._to_task_details(db_task)
 
+    async def create_many(
+        self, items: List[TaskCreateSchema], atomic: bool = True
+    ) -> List[TaskBulkItemResultSchema]:
+        """
+        Create several tasks with a single multi-row INSERT ... RETURNING.
+
+        Referenced users are checked up front with one query so that invalid
+        items can be reported individually instead of failing the INSERT.
+
+        Args:
+            items: Task creation data, in the order results should be returned
+            atomic: Reject the whole batch if any item is invalid
+
+        Returns:
+            One result per input item, in input order
+
+        Raises:
+            UserNotFoundError: If ``atomic`` is set and an item references a missing user
+        """
+        user_ids = {
+            user_id
+            for item in items
+            for user_id in (item.assigned_user_id, item.assigned_by_user_id)
+            if user_id is not None
+        }
+        result = await self.session.execute(select(User.id).where(User.id.in_(user_ids)))
+        existing_user_ids = set(result.scalars().all())
+
+        results = [TaskBulkItemResultSchema(index=index) for index in range(len(items))]
+        valid_indexes: List[int] = []
+        for index, item in enumerate(items):
+            if item.assigned_user_id is not None and item.assigned_user_id not in existing_user_ids:
+                results[index].error = f"Assigned user {item.assigned_user_id} not found"
+            elif item.assigned_by_user_id not in existing_user_ids:
+                results[index].error = f"Assigning user {item.assigned_by_user_id} not found"
+            else:
+                valid_indexes.append(index)
+
+        if atomic and len(valid_indexes) != len(items):
+            errors = "; ".join(f"item {r.index}: {r.error}" for r in results if r.error)
+            raise UserNotFoundError(detail=errors)
+        if not valid_indexes:
+            return results
+
+        now = datetime.now(UTC)
+        # render_nulls keeps every parameter set on the same key set so the
+        # rows are batched into one multi-row VALUES clause.
+        statement = (
+            insert(Task)
+            .returning(*TASK_RESPONSE_COLUMNS, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True)
+        )
+        inserted = await self.session.execute(
+            statement, [self._new_task_values(items[index], now) for index in valid_indexes]
+        )
+        for index, row in zip(valid_indexes, inserted):
+            results[index].task = self._to_task_details(row)
+        for completing in (False, True):
+            task_ids = [
+                results[index].task.id
+                for index in valid_indexes
+                if (items[index].status == TaskStatus.COMPLETED) == completing
+            ]
+            if task_ids:
+                await self._count(task_ids, completing)
+        return results
+
     async def get_by_id(self, task_id: int, include_archived: bool = False) -> TaskResponseSchema:
         """Get a task by ID.
 
@@ -78,31 +333,164 @@ class TaskRepository(BaseRepository[Task]):
         Raises:
             TaskNotFoundError: If the task does not exist
         """
-        query = select(Task).where(Task.id == task_id)
+        query = select_task_rows().where(Task.id == task_id)
         if not include_archived:
             query = query.where(Task.deleted_at.is_(None))
         result = await self.session.execute(query)
-        task = result.scalars().first()
+        task = result.first()
         if task is None:
             raise TaskNotFoundError
         return self._to_task_details(task)
 
-    async def get_all(self, include_archived: bool = False) -> List[TaskResponseSchema]:
+    @staticmethod
+    def _apply_filters(query: Select, filters: TaskFilterSchema, include_archived: bool) -> Select:
+        """Narrow a task query with the given listing filters."""
+        if not include_archived:
+            query = query.where(Task.deleted_at.is_(None))
+        if filters.status is not None:
+            query = query.where(Task.status == filters.status)
+        if filters.priority is not None:
+            query = query.where(Task.priority == filters.priority)
+        if filters.assigned_user_id is not None:
+            query = query.where(Task.assigned_user_id == filters.assigned_user_id)
+        if filters.group_id is not None:
+            query = query.where(
+                select(task_group_association.c.task_id)
+                .where(
+                    task_group_association.c.task_id == Task.id,
+                    task_group_association.c.group_id == filters.group_id,
+                )
+                .exists()
+            )
+        if filters.due_after is not None:
+            query = query.where(Task.due_date >= filters.due_after)
+        if filters.due_before is not None:
+            query = query.where(Task.due_date < filters.due_before)
+        return query
+
+    @classmethod
+    def _page_query(
+        cls,
+        query: Select,
+        filters: TaskFilterSchema,
+        limit: int,
+        cursor: Optional[str],
+        include_archived: bool,
+    ) -> Select:
+        """Restrict a task query to the rows of one page plus one look-ahead row."""
+        query = cls._apply_filters(query, filters, include_archived)
+        if cursor is not None:
+            query = query.where(Task.id > decode_cursor(cursor))
+        # Fetch one extra row to find out whether another page exists.
+        return query.order_by(Task.id).limit(limit + 1)
+
+    async def get_page(
+        self,
+        filters: TaskFilterSchema,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> TaskPageSchema:
         """
-        Get all tasks.
+        Get one keyset-paginated page of tasks.
 
         Args:
+            filters: Listing filters
+            limit: Maximum number of tasks to return
+            cursor: Cursor returned with the previous page, if any
             include_archived: Include archived tasks if True
 
         Returns:
-            List of task details
+            Page of task details with the cursor for the next page
+        """
+        query = self._page_query(select_task_rows(), filters, limit, cursor, include_archived)
+        result = await self.session.execute(query)
+        tasks = list(result.all())
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].id)
+        return TaskPageSchema(
+            items=[self._to_task_details(task) for task in tasks],
+            next_cursor=next_cursor,
+        )
+
+    async def get_page_version(
+        self,
+        filters: TaskFilterSchema,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> Tuple[List[Tuple[int, datetime]], bool]:
+        """
+        Return the version markers of a page without loading its tasks.
+
+        Any insert, update or archive affecting the page changes the
+        ``updated_at`` of a listed task, the set of listed ids, or whether
+        another page follows.
+
+        Returns:
+            (id, updated_at) of each task on the page, and whether another page exists
         """
-        query = select(Task)
+        query = self._page_query(
+            select(Task.id, Task.updated_at), filters, limit, cursor, include_archived
+        )
+        rows = [tuple(row) for row in await self.session.execute(query)]
+        return rows[:limit], len(rows) > limit
+
+    async def get_version(
+        self, task_id: int, include_archived: bool = False
+    ) -> Optional[datetime]:
+        """Return the ``updated_at`` of a task, or None if it does not exist."""
+        query = select(Task.updated_at).where(Task.id == task_id)
         if not include_archived:
             query = query.where(Task.deleted_at.is_(None))
-        result = await self.session.execute(query)
-        tasks = list(result.scalars().all())
-        return [self._to_task_details(task) for task in tasks]
+        return await self.session.scalar(query)
+
+    async def stream(
+        self,
+        filters: TaskFilterSchema,
+        include_archived: bool = False,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> AsyncIterator[List[TaskResponseSchema]]:
+        """
+        Stream all matching tasks in batches through a server-side cursor.
+
+        Args:
+            filters: Listing filters
+            include_archived: Include archived tasks if True
+            batch_size: Number of rows fetched and yielded per batch
+
+        Yields:
+            Batches of task details in id order
+        """
+        query = self._apply_filters(select_task_rows(), filters, include_archived)
+        query = query.order_by(Task.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream(query)
+        async for tasks in result.partitions():
+            yield [self._to_task_details(task) for task in tasks]
+
+    async def _update_returning(self, task_id: int, *criteria, **values) -> Optional[Row]:
+        """
+        Update one task with a single UPDATE ... RETURNING.
+
+        Args:
+            task_id: Task identifier
+            *criteria: Extra WHERE conditions the row must satisfy
+            **values: Column values to set; ``updated_at`` is always refreshed
+
+        Returns:
+            Row with the task response columns, or None if no row matched
+        """
+        statement = (
+            update(Task)
+            .where(Task.id == task_id, *criteria)
+            .values(updated_at=func.now(), **values)
+            .returning(*TASK_RESPONSE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(statement)
+        return result.first()
 
     async def update(self, task_id: int, task_data: TaskUpdateSchema) -> TaskResponseSchema:
         """
@@ -118,33 +506,79 @@ class TaskRepository(BaseRepository[Task]):
         Raises:
             TaskNotFoundError: If task with given ID doesn't exist
         """
-        result = await self.session.execute(
-            select(Task).where(Task.id == task_id, Task.deleted_at.is_(None))
-        )
-        task = result.scalars().first()
+        values = task_data.model_dump(exclude_unset=True)
+        status = values.get("status")
+        if status is not None:
+            values["completed_at"] = _completed_at(status)
 
-        if not task:
+        counted = not STAT_COLUMNS.isdisjoint(values)
+        previous_statuses = await self._uncount([task_id]) if counted else {}
+        row = await self._update_returning(task_id, Task.deleted_at.is_(None), **values)
+        if row is None:
             raise TaskNotFoundError
+        # Completing a completed task again neither extends the streak nor
+        # awards achievements.
+        completing = (
+            status == TaskStatus.COMPLETED
+            and previous_statuses.get(task_id) != TaskStatus.COMPLETED
+        )
+        if counted:
+            await self._count([task_id], completing)
+        else:
+            await self._invalidate_reports(task_id, row.assigned_user_id)
 
-        update_data = task_data.model_dump(exclude_unset=True)
+        if completing:
+            await self._tasks_completed([row.assigned_user_id])
 
-        for key, value in update_data.items():
-            setattr(task, key, value)
+        return self._to_task_details(row)
 
-        task.updated_at = datetime.now(UTC)
-        status = update_data.get('status')
-        if status is not None:
-            if status == TaskStatus.COMPLETED:
-                task.completed_at = datetime.now(UTC)
-            else:
-                task.completed_at = None
+    async def transition_many(
+        self, task_ids: List[int], status: TaskStatus
+    ) -> List[TaskResponseSchema]:
+        """
+        Move several tasks to a new status with one UPDATE ... RETURNING.
+
+        ``completed_at`` is set server-side on tasks that were not completed
+        yet, and achievements of their assignees are evaluated together.
+
+        Args:
+            task_ids: Task identifiers
+            status: Target status
 
-        if status == TaskStatus.COMPLETED and task.assigned_user_id:
-            await AchievementRepository(self.session).check_task_completion_achievements(
-                task.assigned_user_id
+        Returns:
+            Details of the tasks that were updated; missing or archived ids are skipped
+        """
+        previous_statuses = await self._uncount(task_ids)
+        statement = (
+            update(Task)
+            .where(
+                Task.id == any_(bindparam("task_ids", task_ids, type_=ARRAY(Integer))),
+                Task.deleted_at.is_(None),
+            )
+            .values(status=status, updated_at=func.now(), completed_at=_completed_at(status))
+            .returning(*TASK_RESPONSE_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(statement)
+        tasks = [self._to_task_details(row) for row in result]
+
+        completing_ids = set()
+        if status == TaskStatus.COMPLETED:
+            completing_ids = {
+                task.id
+                for task in tasks
+                if previous_statuses.get(task.id) != TaskStatus.COMPLETED
+            }
+        for completing in (False, True):
+            ids = [task_id for task_id in task_ids if (task_id in completing_ids) == completing]
+            if ids:
+                await self._count(ids, completing)
+        if completing_ids:
+            await self._tasks_completed(
+                task.assigned_user_id for task in tasks if task.id in completing_ids
             )
 
-        return self._to_task_details(task)
+        return sorted(tasks, key=lambda task: task.id)
 
     async def delete(self, task_id: int) -> None:
         """Delete task by ID.
@@ -155,24 +589,24 @@ class TaskRepository(BaseRepository[Task]):
         Raises:
             TaskNotFoundError: If the task doesn't exist
         """
-        result = await self.session.execute(
-            select(Task).where(Task.id == task_id, Task.deleted_at.is_(None))
+        await self._uncount([task_id])
+        row = await self._update_returning(
+            task_id, Task.deleted_at.is_(None), deleted_at=func.now(), is_archived=True
         )
-        task = result.scalars().first()
-        if not task:
+        if row is None:
             raise TaskNotFoundError
-        task.deleted_at = datetime.now(UTC)
-        task.is_archived = True
+        await self._count([task_id])
 
     async def restore(self, task_id: int) -> TaskResponseSchema:
         """Restore an archived task by ID."""
-        result = await self.session.execute(select(Task).where(Task.id == task_id))
-        task = result.scalars().first()
-        if not task or task.deleted_at is None:
+        await self._uncount([task_id])
+        row = await self._update_returning(
+            task_id, Task.deleted_at.is_not(None), deleted_at=None, is_archived=False
+        )
+        if row is None:
             raise TaskNotFoundError(detail="Task not found or not archived")
-        task.deleted_at = None
-        task.is_archived = False
-        return self._to_task_details(task)
+        await self._count([task_id])
+        return self._to_task_details(row)
 
     async def assign_to_user(
         self, task_id: int, user_id: int, assigned_by_user_id: int
@@ -197,66 +631,75 @@ class TaskRepository(BaseRepository[Task]):
         return await self.update(task_id, update_data)
 
     async def assign_to_groups(self, task_id: int, group_ids: List[int]) -> TaskResponseSchema:
-        """Assign a task to groups."""
-        result = await self.session.execute(
-            select(Task).where(Task.id == task_id, Task.deleted_at.is_(None))
-        )
-        task = result.scalars().first()
-
-        if not task:
+        """Assign a task to groups, replacing its current group assignments."""
+        row = await self._update_returning(task_id, Task.deleted_at.is_(None))
+        if row is None:
             raise TaskNotFoundError
 
-        groups_result = await self.session.execute(
-            select(Group).where(Group.id.in_(group_ids))
+        unique_group_ids = set(group_ids)
+        groups_found = await self.session.scalar(
+            select(func.count(Group.id)).where(Group.id.in_(unique_group_ids))
         )
-        groups = list(groups_result.scalars().all())
-
-        if len(groups) != len(group_ids):
+        if groups_found != len(unique_group_ids):
             raise GroupNotFoundError("One or more groups not found")
 
-        task.assigned_groups = groups
-        task.updated_at = datetime.now(UTC)
+        # The UPDATE above holds the task's lock.
+        await self._uncount([task_id], locked=True)
+        await self.session.execute(
+            delete(task_group_association).where(task_group_association.c.task_id == task_id)
+        )
+        if unique_group_ids:
+            await self.session.execute(
+                insert(task_group_association),
+                [{"task_id": task_id, "group_id": group_id} for group_id in sorted(unique_group_ids)],
+            )
+        await self._count([task_id])
+
+        return self._to_task_details(row)
 
-        return self._to_task_details(task)
+    async def _ensure_live_task(self, task_id: int) -> None:
+        """Raise TaskNotFoundError unless the task exists and is not archived."""
+        task_exists = await self.session.scalar(
+            select(Task.id).where(Task.id == task_id, Task.deleted_at.is_(None))
+        )
+        if task_exists is None:
+            raise TaskNotFoundError
 
     async def unassign_from_user(
         self, task_id: int, user_id: int
     ) -> TaskResponseSchema:
         """Remove task assignment from a user."""
-        result = await self.session.execute(
-            select(Task).where(Task.id == task_id, Task.deleted_at.is_(None))
+        await self._uncount([task_id])
+        row = await self._update_returning(
+            task_id,
+            Task.deleted_at.is_(None),
+            Task.assigned_user_id == user_id,
+            assigned_user_id=None,
+            assigned_by_user_id=None,
         )
-        task = result.scalars().first()
-
-        if not task:
-            raise TaskNotFoundError
-
-        if task.assigned_user_id != user_id:
+        if row is None:
+            # Only the failure path pays for telling the two cases apart.
+            await self._ensure_live_task(task_id)
             raise AppError("Task is not assigned to this user")
-
-        task.assigned_user_id = None
-        task.assigned_by_user_id = None
-        task.updated_at = datetime.now(UTC)
-        return self._to_task_details(task)
+        await self._count([task_id])
+        return self._to_task_details(row)
 
     async def unassign_from_group(
         self, task_id: int, group_id: int
     ) -> TaskResponseSchema:
         """Remove task assignment from a group."""
-        result = await self.session.execute(
-            select(Task).where(Task.id == task_id, Task.deleted_at.is_(None))
-        )
-        task = result.scalars().first()
-
-        if not task:
+        row = await self._update_returning(task_id, Task.deleted_at.is_(None))
+        if row is None:
             raise TaskNotFoundError
 
-        group_result = await self.session.execute(select(Group).where(Group.id == group_id))
-        group = group_result.scalar_one_or_none()
-
-        if group is None or group not in task.assigned_groups:
+        await self._uncount([task_id], locked=True)
+        result = await self.session.execute(
+            delete(task_group_association).where(
+                task_group_association.c.task_id == task_id,
+                task_group_association.c.group_id == group_id,
+            )
+        )
+        if result.rowcount == 0:
             raise AppError("Task is not assigned to this group")
-
-        task.assigned_groups.remove(group)
-        task.updated_at = datetime.now(UTC)
-        return self._to_task_details(task)
+        await self._count([task_id])
+        return self._to_task_details(row)
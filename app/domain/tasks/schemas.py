@@ -124,3 +124,78 @@ class TaskAssignUserSchema(BaseModel):
 
     model_config = ConfigDict(frozen=True)
 
+
+class TaskFilterSchema(BaseModel):
+    """Server-side filters for task listings."""
+    status: Optional[TaskStatus] = None
+    priority: Optional[int] = Field(None, ge=1, le=5)
+    assigned_user_id: Optional[int] = Field(None, gt=0)
+    group_id: Optional[int] = Field(None, gt=0)
+    due_after: Optional[datetime] = Field(
+        None, description="Only tasks due at or after this moment",
+    )
+    due_before: Optional[datetime] = Field(
+        None, description="Only tasks due before this moment",
+    )
+
+    model_config = ConfigDict(frozen=True)
+
+
+class TaskPageSchema(BaseModel):
+    """A single page of a keyset-paginated task listing."""
+    items: List[TaskResponseSchema]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page; null when this is the last page",
+    )
+
+
+MAX_BULK_SIZE = 500
+
+
+class TaskBulkCreateSchema(BaseModel):
+    """Schema for creating several tasks in one request."""
+    items: Annotated[List[TaskCreateSchema], Field(min_length=1, max_length=MAX_BULK_SIZE)]
+    atomic: bool = Field(
+        default=True,
+        description=(
+            "Reject the whole batch if any item is invalid; "
+            "when false, valid items are created and errors are reported per item"
+        ),
+    )
+
+
+class TaskBulkItemResultSchema(BaseModel):
+    """Outcome of a single item in a bulk request."""
+    index: int = Field(ge=0, description="Position of the item in the request")
+    task: Optional[TaskResponseSchema] = None
+    error: Optional[str] = None
+
+
+class TaskBulkCreateResultSchema(BaseModel):
+    """Per-item results of a bulk creation, in request order."""
+    items: List[TaskBulkItemResultSchema]
+
+
+class TaskBulkStatusSchema(BaseModel):
+    """Schema for moving several tasks to a new status."""
+    task_ids: Annotated[List[Annotated[int, Field(gt=0)]], Field(min_length=1, max_length=MAX_BULK_SIZE)]
+    status: TaskStatus
+
+    model_config = ConfigDict(frozen=True)
+
+
+class TaskBulkStatusResultSchema(BaseModel):
+    """Result of a bulk status transition."""
+    items: List[TaskResponseSchema]
+    missing_ids: List[int] = Field(
+        default_factory=list,
+        description="Requested ids that do not exist or are archived",
+    )
+
+
+class LeaderboardEntrySchema(BaseModel):
+    """A member's position on a family or group leaderboard."""
+    rank: int = Field(ge=1, description="Competition rank; tied scores share a rank")
+    user_id: int
+    score: int = Field(description="Reward points of the member's completed tasks")
@@ -1,13 +1,22 @@
-from typing import List
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
 import logging
 
+from .pagination import DEFAULT_PAGE_SIZE
 from .schemas import (
+    TaskBulkCreateResultSchema,
+    TaskBulkCreateSchema,
+    TaskBulkStatusResultSchema,
+    TaskBulkStatusSchema,
     TaskCreateSchema,
+    TaskFilterSchema,
+    TaskPageSchema,
     TaskResponseSchema,
     TaskUpdateSchema,
     TaskAssignGroupsSchema,
     TaskAssignUserSchema,
 )
+from app.core.etag import make_etag
 from app.database import UnitOfWork
 
 logger = logging.getLogger(__name__)
@@ -20,12 +29,27 @@ class TaskService:
         self.repository_factory = repository_factory
         self.unit_of_work = unit_of_work
 
-    async def get_tasks(self, include_archived: bool = False) -> List[TaskResponseSchema]:
-        """Retrieve a list of tasks."""
+    async def get_tasks(
+        self,
+        filters: TaskFilterSchema,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> TaskPageSchema:
+        """Retrieve one page of tasks matching the filters."""
         async with self.unit_of_work as unit_of_work:
             task_repository = self.repository_factory(unit_of_work.session)
-            tasks = await task_repository.get_all(include_archived)
-        return tasks
+            page = await task_repository.get_page(filters, limit, cursor, include_archived)
+        return page
+
+    async def stream_tasks(
+        self, filters: TaskFilterSchema, include_archived: bool = False
+    ) -> AsyncIterator[List[TaskResponseSchema]]:
+        """Stream all tasks matching the filters in batches."""
+        async with self.unit_of_work as unit_of_work:
+            task_repository = self.repository_factory(unit_of_work.session)
+            async for batch in task_repository.stream(filters, include_archived):
+                yield batch
 
     async def create_task(self, task_data: TaskCreateSchema) -> TaskResponseSchema:
         """Create a new task."""
@@ -36,6 +60,87 @@ class TaskService:
         logger.info("Created task %s", task.id)
         return task
 
+    async def create_tasks(
+        self, bulk_data: TaskBulkCreateSchema
+    ) -> TaskBulkCreateResultSchema:
+        """Create several tasks in one transaction."""
+        logger.info("Creating %s tasks in bulk", len(bulk_data.items))
+        async with self.unit_of_work as unit_of_work:
+            task_repository = self.repository_factory(unit_of_work.session)
+            results = await task_repository.create_many(bulk_data.items, bulk_data.atomic)
+        created = sum(1 for result in results if result.task is not None)
+        logger.info("Created %s of %s tasks in bulk", created, len(results))
+        return TaskBulkCreateResultSchema(items=results)
+
+    @staticmethod
+    def tasks_etag(
+        filters: TaskFilterSchema,
+        limit: int,
+        cursor: Optional[str],
+        include_archived: bool,
+        versions: Iterable[Tuple[int, datetime]],
+        has_more: bool,
+    ) -> str:
+        """Compute the ETag of a task page from the (id, updated_at) of its tasks."""
+        return make_etag(
+            "tasks",
+            filters.model_dump_json(),
+            limit,
+            cursor,
+            include_archived,
+            has_more,
+            *(f"{task_id}:{updated_at.isoformat()}" for task_id, updated_at in versions),
+        )
+
+    def page_etag(
+        self,
+        filters: TaskFilterSchema,
+        limit: int,
+        cursor: Optional[str],
+        include_archived: bool,
+        page: TaskPageSchema,
+    ) -> str:
+        """Compute the ETag of a task page already loaded."""
+        return self.tasks_etag(
+            filters,
+            limit,
+            cursor,
+            include_archived,
+            ((task.id, task.updated_at) for task in page.items),
+            page.next_cursor is not None,
+        )
+
+    async def get_tasks_etag(
+        self,
+        filters: TaskFilterSchema,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        include_archived: bool = False,
+    ) -> str:
+        """Compute the ETag of a task page, reading only the ids and versions of its tasks."""
+        async with self.unit_of_work as unit_of_work:
+            task_repository = self.repository_factory(unit_of_work.session)
+            versions, has_more = await task_repository.get_page_version(
+                filters, limit, cursor, include_archived
+            )
+        return self.tasks_etag(filters, limit, cursor, include_archived, versions, has_more)
+
+    @staticmethod
+    def task_etag(task_id: int, updated_at: datetime) -> str:
+        """Compute the ETag of a single task version."""
+        return make_etag("task", task_id, updated_at)
+
+    async def get_task_etag(
+        self, task_id: int, include_archived: bool = False
+    ) -> Optional[str]:
+        """Compute the ETag of a task, or None if it does not exist."""
+        async with self.unit_of_work as unit_of_work:
+            task_repository = self.repository_factory(unit_of_work.session)
+            updated_at = await task_repository.get_version(task_id, include_archived)
+        if updated_at is None:
+            return None
+        return self.task_etag(task_id, updated_at)
+
     async def get_task_by_id(
         self, task_id: int, include_archived: bool = False
     ) -> TaskResponseSchema:
@@ -56,6 +161,20 @@ class TaskService:
         logger.info("Updated task %s", task_id)
         return task
 
+    async def transition_tasks(
+        self, transition: TaskBulkStatusSchema
+    ) -> TaskBulkStatusResultSchema:
+        """Move several tasks to a new status."""
+        task_ids = list(dict.fromkeys(transition.task_ids))
+        logger.info("Moving %s tasks to %s", len(task_ids), transition.status.value)
+        async with self.unit_of_work as unit_of_work:
+            task_repository = self.repository_factory(unit_of_work.session)
+            tasks = await task_repository.transition_many(task_ids, transition.status)
+        updated_ids = {task.id for task in tasks}
+        missing_ids = [task_id for task_id in task_ids if task_id not in updated_ids]
+        logger.info("Moved %s tasks to %s", len(tasks), transition.status.value)
+        return TaskBulkStatusResultSchema(items=tasks, missing_ids=missing_ids)
+
     async def delete_task(self, task_id: int) -> None:
         """Delete a task."""
         logger.info("Deleting task %s", task_id)
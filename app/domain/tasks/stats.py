@@ -0,0 +1,289 @@
+"""Incrementally maintained task count rollup.
+
+``task_stats`` holds a task count and a reward point total per (scope,
+scope id, status, priority).
+A task counts towards its assignee, or one of ``UNASSIGNED_SHARDS``
+unassigned counters if it has none, and towards each group it is assigned
+to. Every write path in ``TaskRepository`` subtracts the affected tasks'
+contributions before the write and adds them back afterwards, in the same
+transaction, so reports can read counts without scanning ``tasks``.
+
+Family and global counts are summed from the assignee and unassigned rows
+when read. A user moving to another family takes their counts along, and
+no write touches a counter shared by every task.
+
+The rollup can drift if tasks change outside the repository. Repair it
+with::
+
+    python -m app.domain.tasks.stats --chunk-size 10000
+"""
+import argparse
+import asyncio
+from enum import Enum
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    String,
+    Subquery,
+    any_,
+    bindparam,
+    case,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import setup_logging
+from app.database import DatabaseConfig, UnitOfWork, create_db_manager
+from app.domain.groups.associations import task_group_association
+from app.domain.groups.models import Group
+from app.domain.users.models import User
+from .models import Task, TaskStat
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_BUCKET = "archived"
+GLOBAL_SCOPE_ID = 0
+REBUILD_CHUNK_SIZE = 10_000
+# Unassigned tasks are spread over this many counters by id, so writers of
+# different unassigned tasks rarely wait for the same counter row.
+UNASSIGNED_SHARDS = 16
+
+
+class TaskStatScope(str, Enum):
+    """
+    Scopes of the task summary report.
+
+    Only USER, UNASSIGNED and GROUP have rows of their own; ALL and FAMILY
+    are summed from USER and UNASSIGNED rows.
+    """
+
+    ALL = "all"
+    FAMILY = "family"
+    GROUP = "group"
+    UNASSIGNED = "unassigned"
+    USER = "user"
+
+
+STORED_SCOPES = (TaskStatScope.USER, TaskStatScope.UNASSIGNED, TaskStatScope.GROUP)
+
+
+class TaskStatDelta(NamedTuple):
+    """Change applied to one counter of the rollup."""
+
+    scope: str
+    scope_id: int
+    status: str
+    priority: int
+    count: int
+    points: int
+
+
+def _contributions(scopes: Iterable[TaskStatScope], *criteria: ColumnElement) -> Subquery:
+    """Select one (scope, scope_id, status, priority, points) row per counter a task feeds."""
+    bucket = case(
+        (Task.deleted_at.is_not(None), literal(ARCHIVED_BUCKET)),
+        else_=cast(Task.status, String),
+    )
+
+    def scoped(scope: TaskStatScope, scope_id) -> Select:
+        return select(
+            literal(scope.value).label("scope"),
+            scope_id.label("scope_id"),
+            bucket.label("status"),
+            Task.priority.label("priority"),
+            Task.reward_points.label("points"),
+        ).where(*criteria)
+
+    selects = {
+        TaskStatScope.USER: scoped(TaskStatScope.USER, Task.assigned_user_id).where(
+            Task.assigned_user_id.is_not(None)
+        ),
+        TaskStatScope.UNASSIGNED: scoped(
+            TaskStatScope.UNASSIGNED, Task.id % UNASSIGNED_SHARDS
+        ).where(Task.assigned_user_id.is_(None)),
+        TaskStatScope.GROUP: scoped(
+            TaskStatScope.GROUP, task_group_association.c.group_id
+        ).join(task_group_association, task_group_association.c.task_id == Task.id),
+    }
+    return union_all(*(selects[scope] for scope in scopes)).subquery()
+
+
+def _scope_range(scope: TaskStatScope, lower: int, upper: int) -> Tuple[ColumnElement, ...]:
+    """Return the conditions restricting tasks to those feeding scope ids in (lower, upper]."""
+    if scope is TaskStatScope.USER:
+        return (Task.assigned_user_id > lower, Task.assigned_user_id <= upper)
+    if scope is TaskStatScope.GROUP:
+        return (
+            task_group_association.c.group_id > lower,
+            task_group_association.c.group_id <= upper,
+        )
+    shard = Task.id % UNASSIGNED_SHARDS
+    return (shard > lower, shard <= upper)
+
+
+class TaskStatsRepository:
+    """Repository maintaining and reading the ``task_stats`` rollup."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _apply(self, sign: int, contributions: Subquery) -> List[TaskStatDelta]:
+        """
+        Add ``sign`` times the selected contributions.
+
+        Returns the changes made, as computed by the same statement.
+        """
+        key = (
+            contributions.c.scope,
+            contributions.c.scope_id,
+            contributions.c.status,
+            contributions.c.priority,
+        )
+        deltas = (
+            select(
+                *key,
+                (func.count() * sign).label("count"),
+                (func.sum(contributions.c.points) * sign).label("points"),
+            )
+            .group_by(*key)
+            .cte("deltas")
+        )
+        upsert = pg_insert(TaskStat).from_select(
+            ["scope", "scope_id", "status", "priority", "count", "points"],
+            # Taking the counter row locks in a fixed order keeps concurrent
+            # writers from deadlocking on each other.
+            select(deltas).order_by(*list(deltas.c)[:4]),
+        )
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[
+                TaskStat.scope,
+                TaskStat.scope_id,
+                TaskStat.status,
+                TaskStat.priority,
+            ],
+            set_={
+                "count": TaskStat.count + upsert.excluded.count,
+                "points": TaskStat.points + upsert.excluded.points,
+            },
+        )
+        # Postgres runs a data-modifying CTE even though nothing reads it.
+        result = await self.session.execute(select(deltas).add_cte(upsert.cte("upsert")))
+        return [TaskStatDelta(*row) for row in result]
+
+    @staticmethod
+    def _ids_criterion(task_ids: Iterable[int]) -> ColumnElement:
+        return Task.id == any_(bindparam("stat_task_ids", list(task_ids), type_=ARRAY(Integer)))
+
+    async def add_tasks(self, task_ids: Iterable[int]) -> List[TaskStatDelta]:
+        """Count the current state of the given tasks."""
+        return await self._apply(1, _contributions(STORED_SCOPES, self._ids_criterion(task_ids)))
+
+    async def remove_tasks(self, task_ids: Iterable[int]) -> List[TaskStatDelta]:
+        """Uncount the current state of the given tasks, ahead of changing them."""
+        return await self._apply(-1, _contributions(STORED_SCOPES, self._ids_criterion(task_ids)))
+
+    async def get_counts(
+        self, scope: TaskStatScope, scope_id: int = GLOBAL_SCOPE_ID
+    ) -> List[Tuple[str, int, int]]:
+        """Return the (status, priority, count) counters of one report scope."""
+        count = func.sum(TaskStat.count)
+        query = select(TaskStat.status, TaskStat.priority, count).group_by(
+            TaskStat.status, TaskStat.priority
+        )
+        if scope is TaskStatScope.ALL:
+            query = query.where(
+                TaskStat.scope.in_([TaskStatScope.USER.value, TaskStatScope.UNASSIGNED.value])
+            )
+        elif scope is TaskStatScope.FAMILY:
+            # Comparing with an array of the members, rather than joining
+            # users, keeps the planner on the task_stats primary key.
+            members = select(func.array_agg(User.id)).where(User.family_id == scope_id)
+            query = query.where(
+                TaskStat.scope == TaskStatScope.USER.value,
+                TaskStat.scope_id == any_(cast(members.scalar_subquery(), ARRAY(Integer))),
+            )
+        else:
+            query = query.where(TaskStat.scope == scope.value, TaskStat.scope_id == scope_id)
+        result = await self.session.execute(query.having(count != 0))
+        return [(status, priority, int(total)) for status, priority, total in result]
+
+    async def get_max_scope_id(self, scope: TaskStatScope) -> int:
+        """Return the highest id a rebuild of ``scope`` has to cover."""
+        if scope is TaskStatScope.UNASSIGNED:
+            return UNASSIGNED_SHARDS - 1
+        source = User.id if scope is TaskStatScope.USER else Group.id
+        # Counters of deleted users or groups are dropped by the rebuild too.
+        stored = select(func.max(TaskStat.scope_id)).where(TaskStat.scope == scope.value)
+        highest = func.greatest(
+            select(func.max(source)).scalar_subquery(), stored.scalar_subquery()
+        )
+        return await self.session.scalar(select(highest)) or 0
+
+    async def rebuild(self, scope: TaskStatScope, lower: int, upper: int) -> None:
+        """
+        Recompute the counters of one stored scope for scope ids in (lower, upper].
+
+        The table is locked against counter updates until the surrounding
+        transaction ends. A task write that changed the rollup before the
+        lock was granted has committed by then and is included in the
+        recount; one that had not yet changed it adds its change on top of
+        the recounted rows afterwards. Run each range in its own transaction
+        to keep task writes waiting only briefly.
+        """
+        await self.session.execute(text("LOCK TABLE task_stats IN EXCLUSIVE MODE"))
+        await self.session.execute(
+            delete(TaskStat).where(
+                TaskStat.scope == scope.value,
+                TaskStat.scope_id > lower,
+                TaskStat.scope_id <= upper,
+            )
+        )
+        await self._apply(1, _contributions([scope], *_scope_range(scope, lower, upper)))
+
+
+def fold_counts(rows: Iterable[Tuple[str, int, int]]) -> Tuple[Dict[str, int], Dict[int, int]]:
+    """Sum counter rows into per-status and per-priority totals, archived excluded."""
+    by_status: Dict[str, int] = {}
+    by_priority: Dict[int, int] = {}
+    for status, priority, count in rows:
+        by_status[status] = by_status.get(status, 0) + count
+        if status != ARCHIVED_BUCKET:
+            by_priority[priority] = by_priority.get(priority, 0) + count
+    return by_status, by_priority
+
+
+async def main() -> None:
+    setup_logging()
+    parser = argparse.ArgumentParser(description="Rebuild the task_stats rollup.")
+    parser.add_argument("--chunk-size", type=int, default=REBUILD_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    db_manager = create_db_manager(DatabaseConfig())
+    try:
+        for scope in STORED_SCOPES:
+            async with UnitOfWork(db_manager.session_factory) as unit_of_work:
+                max_id = await TaskStatsRepository(unit_of_work.session).get_max_scope_id(scope)
+            # Starting below zero covers shard 0 of the unassigned counters.
+            for lower in range(-1, max_id, args.chunk_size):
+                upper = lower + args.chunk_size
+                # One transaction per range keeps the table lock short.
+                async with UnitOfWork(db_manager.session_factory) as unit_of_work:
+                    await TaskStatsRepository(unit_of_work.session).rebuild(scope, lower, upper)
+                logger.info("Rebuilt %s task stats up to %s", scope.value, min(upper, max_id))
+    finally:
+        await db_manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,9 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, Header, Response, status
 from pydantic import BaseModel
 from dependency_injector.wiring import inject, Provide
 
+from app.core.etag import ETAG_HEADER, etag_matches, not_modified
 from app.dependencies import Container
 from ..schemas import (
     UserResponseSchema,
@@ -51,10 +52,21 @@ async def get_users_list(
 @inject
 async def get_user_details(
     user_id: int,
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
     service: UserService = Depends(Provide[Container.user_service]),
-) -> UserResponseSchema:
-    """Get detailed information about a specific user."""
-    return await service.get_user(user_id)
+) -> UserResponseSchema | Response:
+    """Get detailed information about a specific user.
+
+    Answers 304 when ``If-None-Match`` carries the user's current ``ETag``.
+    """
+    if if_none_match:
+        etag = await service.get_user_etag(user_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    user = await service.get_user(user_id)
+    response.headers[ETAG_HEADER] = service.user_etag(user.id, user.updated_at)
+    return user
 
 
 @router.delete(
@@ -79,7 +79,9 @@ class User(Base):
         nullable=False,
     )
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
-    family_id = Column(Integer, ForeignKey("families.id", ondelete="SET NULL"), nullable=True)
+    family_id = Column(
+        Integer, ForeignKey("families.id", ondelete="SET NULL"), nullable=True, index=True
+    )
 
     notifications = relationship(
         "Notification", back_populates="user", cascade="all, delete-orphan"
@@ -92,14 +94,18 @@ class User(Base):
     tasks = relationship(
         "Task",
         back_populates="assigned_user",
+        foreign_keys="Task.assigned_user_id",
         cascade="all, delete-orphan",
     )
+    # Relationships marked raise_on_sql never load implicitly; repositories
+    # request them through the profiles in app.domain.loading.
+
     # Tasks this user assigned to others
     assigned_tasks = relationship(
         "Task",
         back_populates="assigned_by",
         foreign_keys="Task.assigned_by_user_id",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     family = relationship(
@@ -111,26 +117,26 @@ class User(Base):
         "FamilyMembership",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     families = relationship(
         "Family",
         secondary="family_memberships",
         back_populates="premium_members",
-        lazy="selectin",
+        lazy="raise_on_sql",
         viewonly=True,
     )
     group_memberships = relationship(
         "GroupMembership",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     groups = relationship(
         "Group",
         secondary="group_memberships",
         back_populates="users",
-        lazy="selectin",
+        lazy="raise_on_sql",
         viewonly=True,
     )
 
@@ -138,7 +144,7 @@ class User(Base):
         "Achievement",
         secondary="user_achievements",
         back_populates="users",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
     creator = relationship("User", remote_side=[id])
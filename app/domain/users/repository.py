@@ -1,14 +1,23 @@
-from typing import List
+from typing import List, Optional
 from datetime import datetime, UTC
-from sqlalchemy import select, bindparam
-from sqlalchemy.orm import selectinload
+from sqlalchemy import column, exists, select, bindparam, table
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.base import BaseRepository
+from app.domain.loading import LoaderProfile, loader_options
 from .models import User, UserStatus
 from .schemas import UserCreateSchema, UserUpdateSchema
-from app.core.security import hash_password, generate_reset_token, verify_reset_token
-from app.core.exceptions import UserNotFoundError
+from app.core.cache import invalidate_after_commit
+from app.core.security import (
+    generate_reset_token,
+    hash_password,
+    principal_tag,
+    verify_reset_token,
+)
+from app.core.exceptions import AppError, UserNotFoundError
+from app.domain.tasks.repository import TaskRepository
+
+pg_timezone_names = table("pg_timezone_names", column("name"))
 
 
 class UserRepository(BaseRepository[User]):
@@ -23,9 +32,26 @@ class UserRepository(BaseRepository[User]):
         """Retrieve all users."""
         return await self.get_list()
 
+    async def _check_timezone(self, timezone: Optional[str]) -> None:
+        """
+        Reject a time zone the database does not know.
+
+        The schemas check names against the zoneinfo database, which can be
+        newer than the one Postgres was built with.
+        """
+        if timezone is None:
+            return
+        known = await self.session.scalar(
+            select(exists().where(pg_timezone_names.c.name == bindparam("timezone_param"))),
+            {"timezone_param": timezone},
+        )
+        if not known:
+            raise AppError(f"Unknown time zone: {timezone}")
+
     async def create(self, user_data: UserCreateSchema) -> User:
         """Create a new user."""
-        hashed_password = hash_password(user_data.password)
+        await self._check_timezone(user_data.timezone)
+        hashed_password = await hash_password(user_data.password)
         data = user_data.model_dump()
         data["hashed_password"] = hashed_password
         data.pop("password", None)
@@ -41,28 +67,38 @@ class UserRepository(BaseRepository[User]):
             raise UserNotFoundError
         return user
 
+    async def get_version(self, user_id: int) -> Optional[datetime]:
+        """Return the ``updated_at`` of a user, or None if it does not exist."""
+        return await self.session.scalar(select(User.updated_at).where(User.id == user_id))
+
     async def update(self, user_id: int, user_update: UserUpdateSchema) -> User:
         """Update an existing user."""
         update_data = user_update.model_dump(exclude_unset=True)
+        await self._check_timezone(update_data.get("timezone"))
         if "password" in update_data:
-            update_data["hashed_password"] = hash_password(update_data.pop("password"))
+            update_data["hashed_password"] = await hash_password(update_data.pop("password"))
         update_data["updated_at"] = datetime.now(UTC)
         user = await super().update(user_id, update_data)
         if user is None:
             raise UserNotFoundError
+        invalidate_after_commit(self.session, [principal_tag(user_id)])
         return user
 
     async def delete(self, user_id: int) -> None:
-        """Delete a user by id."""
-        user = await super().delete(user_id)
+        """Delete a user by id, along with the tasks assigned to them."""
+        user = await self.get(user_id)
         if user is None:
             raise UserNotFoundError
+        await TaskRepository(self.session).uncount_assigned_to(user_id)
+        await self.session.delete(user)
+        invalidate_after_commit(self.session, [principal_tag(user_id)])
 
     async def update_status(self, user_id: int, status: UserStatus) -> User:
         """Update only the status of a user."""
         user = await self.get_by_id(user_id)
         user.status = status
         user.updated_at = datetime.now(UTC)
+        invalidate_after_commit(self.session, [principal_tag(user_id)])
         return user
 
     async def create_reset_token(self, email: str) -> str | None:
@@ -84,7 +120,7 @@ class UserRepository(BaseRepository[User]):
         user = result.scalar_one_or_none()
         if user is None or not verify_reset_token(user, token):
             return False
-        user.hashed_password = hash_password(new_password)
+        user.hashed_password = await hash_password(new_password)
         user.reset_token = None
         user.reset_token_expires_at = None
         user.updated_at = datetime.now(UTC)
@@ -106,13 +142,7 @@ class UserRepository(BaseRepository[User]):
 
     async def get_all_with_relations(self) -> List[User]:
         result = await self.session.execute(
-            select(User).options(
-                selectinload(User.family),
-                selectinload(User.groups),
-                selectinload(User.tasks),
-                selectinload(User.notifications),
-                selectinload(User.settings),
-            )
+            select(User).options(*loader_options(User, LoaderProfile.ADMIN_FULL))
         )
         return list(result.scalars().all())
 
@@ -120,13 +150,7 @@ class UserRepository(BaseRepository[User]):
         statement = (
             select(User)
             .where(User.id == bindparam("user_id_param"))
-            .options(
-                selectinload(User.family),
-                selectinload(User.groups),
-                selectinload(User.tasks),
-                selectinload(User.notifications),
-                selectinload(User.settings),
-            )
+            .options(*loader_options(User, LoaderProfile.ADMIN_FULL))
         )
         result = await self.session.execute(statement, {"user_id_param": user_id})
         user = result.scalar_one_or_none()
@@ -8,6 +8,7 @@ from app.domain.groups.schemas import GroupResponse
 from app.domain.tasks.schemas import TaskResponseSchema
 from app.domain.notifications.schemas import NotificationResponse
 from app.domain.settings.schemas import SettingResponse
+from app.core.timezones import TimezoneName
 
 # Validation constants
 MIN_USERNAME_LENGTH = 3
@@ -42,7 +43,7 @@ class UserCreateSchema(UserSchemaBase):
     last_name: Optional[str] = None
     avatar_url: Optional[str] = None
     locale: str = Field(default="en-US")
-    timezone: str = Field(default="UTC")
+    timezone: TimezoneName = Field(default="UTC")
     role: UserRole = Field(default=UserRole.USER)
     points: int = Field(default=0)
     level: Optional[int] = None
@@ -68,7 +69,7 @@ class UserUpdateSchema(BaseModel):
     last_name: Optional[str] = None
     avatar_url: Optional[str] = None
     locale: Optional[str] = None
-    timezone: Optional[str] = None
+    timezone: Optional[TimezoneName] = None
     is_superuser: Optional[bool] = None
     is_premium: Optional[bool] = None
     status: Optional[UserStatus] = None
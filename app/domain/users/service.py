@@ -1,6 +1,8 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 import logging
 
+from app.core.etag import make_etag
 from app.database import UnitOfWork
 from .schemas import (
     UserCreateSchema,
@@ -35,6 +37,20 @@ class UserService:
             users = await user_repository.get_all()
         return [UserResponseSchema.model_validate(user) for user in users]
 
+    @staticmethod
+    def user_etag(user_id: int, updated_at: datetime) -> str:
+        """Compute the ETag of a single user version."""
+        return make_etag("user", user_id, updated_at)
+
+    async def get_user_etag(self, user_id: int) -> Optional[str]:
+        """Compute the ETag of a user, or None if it does not exist."""
+        async with self.unit_of_work as unit_of_work:
+            user_repository = self.repository_factory(unit_of_work.session)
+            updated_at = await user_repository.get_version(user_id)
+        if updated_at is None:
+            return None
+        return self.user_etag(user_id, updated_at)
+
     async def get_user(self, user_id: int) -> UserResponseSchema:
         """Retrieve a user by id."""
         async with self.unit_of_work as unit_of_work:
@@ -7,9 +7,14 @@ import logging
 from pathlib import Path
 import importlib
 from types import ModuleType
+from app.core.background import PeriodicTask
+from app.core.listen import ChannelListener
 from app.core.logging import setup_logging
+from app.core.query_counter import QueryCountMiddleware, install_query_counter
+from app.core.security import password_executor
 from app.database import DatabaseConfig, DatabaseSessionManager, create_db_manager
 from app.dependencies import container
+from app.domain.achievements.catalog import CATALOG_CHANNEL
 from app.domain.users.models import User, UserRole
 from app.domain.users.schemas import UserCreateSchema, UserUpdateSchema
 from app.domain.users.repository import UserRepository
@@ -25,6 +30,8 @@ from app.core.config import settings
 setup_logging()
 logger = logging.getLogger(__name__)
 
+LISTEN_TIMEOUT_SECONDS = 5
+
 
 async def ensure_admin_user(db_manager: DatabaseSessionManager) -> None:
     """Create the default admin user if it does not exist."""
@@ -53,8 +60,44 @@ async def lifespan(app: FastAPI):
     db_manager = create_db_manager(DatabaseConfig())
     app.state.db_manager = db_manager
     container.db_manager.override(db_manager)
+    install_query_counter(db_manager.engine.sync_engine)
     await ensure_admin_user(db_manager)
+    reminders = PeriodicTask(
+        "task-reminders",
+        container.task_reminder_service().run,
+        settings.current_config.reminder_interval_seconds,
+    )
+    if settings.current_config.reminders_enabled:
+        reminders.start()
+    leaderboard_service = container.leaderboard_service()
+    await leaderboard_service.rebuild()
+    leaderboard_reload = PeriodicTask(
+        "leaderboard-reload",
+        leaderboard_service.rebuild,
+        settings.current_config.leaderboard_reload_seconds,
+        initial_delay_seconds=settings.current_config.leaderboard_reload_seconds,
+    )
+    leaderboard_reload.start()
+    achievement_catalog = container.achievement_catalog()
+    catalog_listener = ChannelListener(
+        db_manager.engine,
+        CATALOG_CHANNEL,
+        achievement_catalog.invalidate,
+        on_connect=achievement_catalog.invalidate,
+    )
+    catalog_listener.start()
+    # Load after LISTEN is in place, so no catalog edit can slip in between.
+    if not await catalog_listener.wait_listening(LISTEN_TIMEOUT_SECONDS):
+        logger.warning("Achievement catalog changes from other workers are not tracked yet")
+    await achievement_catalog.reload()
+    achievement_queue = container.achievement_queue()
+    achievement_queue.start()
     yield
+    await achievement_queue.drain(settings.current_config.achievement_drain_seconds)
+    await catalog_listener.stop()
+    await leaderboard_reload.stop()
+    await reminders.stop()
+    password_executor.shutdown()
     await db_manager.close()
 
 
@@ -93,6 +136,11 @@ class ApplicationSetup:
         """Configure CORS middleware"""
         self.app.add_middleware(CORSMiddleware, **self.CORS_SETTINGS)
 
+    def setup_query_counter(self) -> None:
+        """Report the number of SQL queries per request in a response header"""
+        if settings.current_config.query_count_header:
+            self.app.add_middleware(QueryCountMiddleware)
+
     def register_routers(self) -> List[ModuleType]:
         """Register all application routers"""
         modules: List[ModuleType] = []
@@ -112,6 +160,7 @@ class ApplicationSetup:
     def initialize(self) -> FastAPI:
         """Initialize the application"""
         self.setup_cors()
+        self.setup_query_counter()
         modules = self.register_routers()
         self.app.add_exception_handler(AppError, exception_handler)
         self.app.add_exception_handler(HTTPException, http_exception_handler)
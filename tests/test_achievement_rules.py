@@ -0,0 +1,24 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.domain.achievements.rules import (
+    AchievementMetric,
+    AchievementRule,
+    earned_achievements,
+)
+
+
+def test_rules_are_earned_once_their_metric_reaches_the_threshold() -> None:
+    rules = [
+        AchievementRule(1, AchievementMetric.COMPLETED_TASKS, 1),
+        AchievementRule(2, AchievementMetric.REWARD_POINTS, 100),
+        AchievementRule(3, AchievementMetric.STREAK_DAYS, 7),
+    ]
+    metrics = {
+        7: {AchievementMetric.COMPLETED_TASKS: 3, AchievementMetric.REWARD_POINTS: 100},
+        5: {AchievementMetric.COMPLETED_TASKS: 1, AchievementMetric.STREAK_DAYS: 6},
+    }
+    assert earned_achievements(rules, metrics) == [(5, 1), (7, 1), (7, 2)]
+    assert earned_achievements([], metrics) == []
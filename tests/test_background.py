@@ -0,0 +1,27 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.background import PeriodicTask
+
+
+def test_periodic_task_keeps_running_after_failures() -> None:
+    calls = []
+
+    async def job() -> None:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+
+    async def run() -> None:
+        task = PeriodicTask("test", job, interval_seconds=0)
+        task.start()
+        while len(calls) < 3:
+            await asyncio.sleep(0)
+        await task.stop()
+        assert not task.running
+
+    asyncio.run(run())
+    assert len(calls) >= 3
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.executor import BoundedExecutor, executor_stats
+
+
+def test_calls_beyond_the_waiting_line_are_rejected() -> None:
+    release = threading.Event()
+
+    def blocked(value: int) -> int:
+        release.wait(timeout=5)
+        return value * 2
+
+    def fail() -> None:
+        raise RuntimeError("boom")
+
+    async def run() -> None:
+        executor = BoundedExecutor("test-executor", max_workers=1, max_queue=1)
+        running = asyncio.ensure_future(executor.run(blocked, 1))
+        waiting = asyncio.ensure_future(executor.run(blocked, 2))
+        await asyncio.sleep(0)
+        assert executor.pending == 2
+        with pytest.raises(ServiceUnavailableError):
+            await executor.run(blocked, 3)
+
+        release.set()
+        assert await asyncio.gather(running, waiting) == [2, 4]
+        with pytest.raises(RuntimeError):
+            await executor.run(fail)
+        # Places are given back from the loop once the thread is done.
+        await asyncio.sleep(0)
+        stats = executor_stats()["test-executor"]
+        assert {key: stats[key] for key in ("submitted", "rejected", "completed", "failed")} == {
+            "submitted": 3,
+            "rejected": 1,
+            "completed": 2,
+            "failed": 1,
+        }
+        assert stats["peak_pending"] == 2
+        assert stats["pending"] == 0
+        assert stats["wait_seconds_max"] > 0
+        executor.shutdown()
+
+    asyncio.run(run())
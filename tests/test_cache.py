@@ -0,0 +1,86 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache, cache_stats, invalidate
+from app.core.transactions import after_commit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def load(value, *tags):
+    async def loader():
+        return value, tags
+
+    return loader
+
+
+def test_entries_expire_and_least_recently_used_are_evicted() -> None:
+    clock = FakeClock()
+    cache = TTLCache("test-expiry", max_entries=2, ttl_seconds=10, clock=clock)
+
+    async def run() -> None:
+        assert await cache.get_or_load("a", load(1)) == 1
+        assert await cache.get_or_load("a", load(2)) == 1
+        await cache.get_or_load("b", load(3))
+        await cache.get_or_load("a", load(4))
+        await cache.get_or_load("c", load(5))
+        assert await cache.get_or_load("b", load(6)) == 6
+        clock.now = 10
+        assert await cache.get_or_load("b", load(7)) == 7
+
+    asyncio.run(run())
+    assert cache_stats()["test-expiry"] == {
+        "hits": 2,
+        "misses": 5,
+        "evictions": 2,
+        "expirations": 1,
+        "invalidations": 0,
+        "size": 2,
+    }
+
+
+def test_invalidation_drops_tagged_entries_and_racing_loads() -> None:
+    cache = TTLCache("test-tags", max_entries=10, ttl_seconds=60)
+
+    async def run() -> None:
+        await cache.get_or_load("user", load("u", ("user", 1)))
+        await cache.get_or_load("group", load("g", ("group", 1)))
+        invalidate([("user", 1)])
+        assert await cache.get_or_load("user", load("u2", ("user", 1))) == "u2"
+        assert await cache.get_or_load("group", load("g2")) == "g"
+
+        async def racing_loader():
+            invalidate([("group", 2)])
+            return "stale", [("group", 2)]
+
+        await cache.get_or_load("race", racing_loader)
+        assert await cache.get_or_load("race", load("fresh")) == "fresh"
+
+    asyncio.run(run())
+    assert cache.stats.invalidations == 1
+
+
+def test_after_commit_callbacks_run_only_on_commit() -> None:
+    calls = []
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("SELECT 1"))
+        after_commit(session, lambda: calls.append("rolled back"))
+        session.rollback()
+        session.execute(text("SELECT 1"))
+        after_commit(session, lambda: calls.append("committed"))
+        session.commit()
+        session.execute(text("SELECT 1"))
+        session.commit()
+    assert calls == ["committed"]
@@ -0,0 +1,24 @@
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.etag import etag_matches, make_etag
+
+
+def test_make_etag_changes_with_version() -> None:
+    updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    etag = make_etag("task", 1, updated_at)
+    assert etag.startswith('W/"')
+    assert etag == make_etag("task", 1, updated_at)
+    assert etag != make_etag("task", 1, updated_at.replace(second=1))
+
+
+def test_etag_matches_uses_weak_comparison() -> None:
+    etag = make_etag("task", 1)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag[2:]}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
@@ -0,0 +1,90 @@
+"""Check that committed user changes drop cached principals, on a real Postgres database.
+
+Set TEST_DATABASE_URL to an asyncpg URL to run these tests. The public
+schema of that database is dropped and recreated.
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.exceptions import AuthenticationError
+from app.core.security import create_access_token, get_current_user, principal_cache
+from app.database import Base, UnitOfWork
+from app.domain.notifications.models import Notification  # noqa: F401
+from app.domain.settings.models import Setting  # noqa: F401
+from app.domain.users.models import User, UserStatus
+from app.domain.users.repository import UserRepository
+from app.domain.users.schemas import UserUpdateSchema
+
+
+def test_committed_user_changes_invalidate_the_principal() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        credentials = HTTPAuthorizationCredentials(
+            scheme="Bearer", credentials=create_access_token({"sub": "1"})
+        )
+
+        async def principal_status() -> UserStatus:
+            async with session_factory() as session:
+                principal = await get_current_user(credentials, session)
+            return principal.status
+
+        try:
+            async with engine.begin() as connection:
+                await connection.execute(text("DROP SCHEMA public CASCADE"))
+                await connection.execute(text("CREATE SCHEMA public"))
+                await connection.run_sync(Base.metadata.create_all)
+                await connection.execute(
+                    insert(User).values(id=1, username="user1", email="user1@example.com",
+                                        hashed_password="x")
+                )
+            principal_cache.clear()
+
+            assert await principal_status() is UserStatus.ACTIVE
+            misses = principal_cache.stats.misses
+            assert await principal_status() is UserStatus.ACTIVE
+            assert principal_cache.stats.misses == misses
+
+            # A change that is rolled back leaves the cached principal in place.
+            with pytest.raises(RuntimeError):
+                async with UnitOfWork(session_factory) as unit_of_work:
+                    await UserRepository(unit_of_work.session).update_status(
+                        1, UserStatus.SUSPENDED
+                    )
+                    raise RuntimeError
+            assert await principal_status() is UserStatus.ACTIVE
+            assert principal_cache.stats.misses == misses
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await UserRepository(unit_of_work.session).update_status(1, UserStatus.SUSPENDED)
+            assert await principal_status() is UserStatus.SUSPENDED
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await UserRepository(unit_of_work.session).update(
+                    1, UserUpdateSchema(status=UserStatus.BANNED)
+                )
+            assert await principal_status() is UserStatus.BANNED
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await UserRepository(unit_of_work.session).delete(1)
+            with pytest.raises(AuthenticationError):
+                await principal_status()
+        finally:
+            principal_cache.clear()
+            await engine.dispose()
+
+    asyncio.run(run())
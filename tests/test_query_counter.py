@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.query_counter import count_queries, install_query_counter
+
+
+def test_count_queries_counts_statements_in_block() -> None:
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+    install_query_counter(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        with count_queries() as counter:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+        connection.execute(text("SELECT 3"))
+
+    assert counter.value == 2
@@ -0,0 +1,253 @@
+"""EXPLAIN every query issued by the task repositories and ReportService.
+
+The repositories are exercised against a seeded Postgres database and each
+captured statement is re-planned with sequential scans disabled. A query
+that still reads a hot table in full has no usable index.
+
+Set TEST_DATABASE_URL to an asyncpg URL to run these tests. The public
+schema of that database is dropped and recreated.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import event, insert, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base, UnitOfWork
+from app.domain.achievements.models import Achievement
+from app.domain.achievements.repository import AchievementRepository
+from app.domain.families.models import Family
+from app.domain.groups.associations import task_group_association
+from app.domain.groups.membership import GroupMembership
+from app.domain.groups.models import Group
+from app.domain.notifications.models import Notification  # noqa: F401
+from app.domain.reports.service import ReportService
+from app.domain.settings.models import Setting  # noqa: F401
+from app.domain.tasks.models import Task, TaskStatus
+from app.domain.tasks.reminders import ReminderKind, TaskReminderRepository
+from app.domain.tasks.counters import UserTaskCountersRepository
+from app.domain.tasks.repository import TaskRepository
+from app.domain.tasks.stats import STORED_SCOPES, TaskStatsRepository
+from app.domain.tasks.schemas import TaskCreateSchema, TaskFilterSchema, TaskUpdateSchema
+from app.domain.users.models import User
+
+# Small lookup tables that are read in full by design.
+SEQ_SCAN_ALLOWED = {"achievements", "achievement_backfills"}
+# Share of a table an index scan may visit before it counts as a full scan.
+FULL_SCAN_FRACTION = 0.5
+# Enough rows for the planner to prefer selective index conditions over
+# walking a whole index.
+USER_COUNT = 300
+GROUP_COUNT = 50
+FAMILY_COUNT = 20
+TASK_COUNT = 20_000
+PLANNED_PREFIXES = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+async def _seed(engine) -> None:
+    now = datetime.now(timezone.utc)
+    async with engine.begin() as connection:
+        await connection.execute(text("DROP SCHEMA public CASCADE"))
+        await connection.execute(text("CREATE SCHEMA public"))
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            insert(User),
+            [
+                {"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+                 "hashed_password": "x"}
+                for user_id in range(1, USER_COUNT + 1)
+            ],
+        )
+        await connection.execute(
+            insert(Family),
+            [{"id": family_id, "name": f"family{family_id}", "created_by": 1}
+             for family_id in range(1, FAMILY_COUNT + 1)],
+        )
+        await connection.execute(
+            update(User).values(family_id=User.id % FAMILY_COUNT + 1)
+        )
+        await connection.execute(
+            insert(Group),
+            [{"id": group_id, "name": f"group{group_id}", "created_by": "user1", "family_id": 1}
+             for group_id in range(1, GROUP_COUNT + 1)],
+        )
+        await connection.execute(
+            insert(GroupMembership),
+            [{"user_id": user_id, "group_id": user_id % GROUP_COUNT + 1}
+             for user_id in range(1, USER_COUNT + 1)],
+        )
+        await connection.execute(
+            insert(Achievement),
+            [
+                {"name": "First Task Completed", "metric": "completed_tasks", "threshold": 1},
+                {"name": "Week Streak", "metric": "streak_days", "threshold": 7},
+            ],
+        )
+        statuses = list(TaskStatus)
+        await connection.execute(
+            insert(Task),
+            [
+                {
+                    "id": task_id,
+                    "title": f"task {task_id}",
+                    "status": statuses[task_id % len(statuses)],
+                    "priority": task_id % 5 + 1,
+                    "due_date": now + timedelta(days=task_id % 30),
+                    "created_at": now,
+                    "updated_at": now,
+                    "assigned_user_id": task_id % USER_COUNT + 1,
+                    "assigned_by_user_id": task_id % 7 + 1,
+                    "deleted_at": now if task_id % 10 == 0 else None,
+                }
+                for task_id in range(1, TASK_COUNT + 1)
+            ],
+        )
+        await connection.execute(text(f"SELECT setval('tasks_id_seq', {TASK_COUNT})"))
+        await connection.execute(
+            insert(task_group_association),
+            [{"task_id": task_id, "group_id": task_id % GROUP_COUNT + 1}
+             for task_id in range(1, TASK_COUNT + 1, 3)],
+        )
+        for scope in STORED_SCOPES:
+            await TaskStatsRepository(AsyncSession(bind=connection)).rebuild(scope, -1, TASK_COUNT)
+        await UserTaskCountersRepository(AsyncSession(bind=connection)).check(
+            0, USER_COUNT, repair=True
+        )
+    async with engine.connect() as connection:
+        await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE"))
+
+
+async def _exercise(session_factory) -> None:
+    now = datetime.now(timezone.utc)
+    unit_of_work = UnitOfWork(session_factory, auto_commit=False)
+    async with unit_of_work:
+        repository = TaskRepository(unit_of_work.session)
+        for filters in (
+            TaskFilterSchema(),
+            TaskFilterSchema(status=TaskStatus.PENDING, priority=3),
+            TaskFilterSchema(assigned_user_id=2, status=TaskStatus.IN_PROGRESS),
+            TaskFilterSchema(group_id=1),
+            TaskFilterSchema(due_after=now + timedelta(days=10), due_before=now + timedelta(days=11)),
+        ):
+            page = await repository.get_page(filters, limit=10)
+            await repository.get_page(filters, limit=10, cursor=page.next_cursor)
+            await repository.get_page_version(filters, limit=10)
+            # An unfiltered export reads every live task by design.
+            if filters != TaskFilterSchema():
+                async for _ in repository.stream(filters, batch_size=50):
+                    pass
+        await repository.get_by_id(1)
+        await repository.get_version(1)
+        await repository.create(TaskCreateSchema(title="new", assigned_by_user_id=1))
+        await repository.create_many(
+            [TaskCreateSchema(title="bulk", assigned_user_id=2, assigned_by_user_id=1)]
+        )
+        await repository.update(2, TaskUpdateSchema(status=TaskStatus.COMPLETED))
+        await repository.transition_many([3, 4, 5], TaskStatus.COMPLETED)
+        await repository.assign_to_groups(6, [1, 2])
+        await repository.unassign_from_group(6, 2)
+        await repository.unassign_from_user(7, 8)
+        await repository.delete(8)
+        await repository.restore(8)
+
+        reminders = TaskReminderRepository(unit_of_work.session)
+        await reminders.create_reminders(ReminderKind.DUE_SOON, now, now + timedelta(days=1), 100)
+        await reminders.create_reminders(ReminderKind.OVERDUE, now, now, 100)
+
+        achievements = AchievementRepository(unit_of_work.session)
+        await achievements.start_backfill("plans")
+        checkpoint = await achievements.lock_backfill("plans")
+        await achievements.get_metrics_after(checkpoint.last_user_id, 100)
+        await achievements.advance_backfill("plans", 100, 0, finished=False)
+
+    reports = ReportService(UnitOfWork(session_factory, auto_commit=False))
+    # The unscoped overdue count reads every overdue task by design.
+    await reports.get_task_summary(family_id=1)
+    await reports.get_task_summary(group_id=1)
+    await reports.get_task_summary(user_id=2)
+    await reports.get_user_progress(2)
+    for scope in ({"user_id": 2}, {"family_id": 1}, {"group_id": 1}):
+        await reports.get_completion_trend(**scope)
+    await reports.get_user_task_report(2)
+    await reports.get_tasks_assigned_by_user(1)
+    await reports.get_group_task_report(1)
+    page = await reports.get_user_groups_tasks(2, limit=5)
+    await reports.get_user_groups_tasks(2, TaskStatus.PENDING, limit=5, cursor=page.next_cursor)
+
+
+def _full_scans(plan: dict, tables: dict, under_limit: bool = False) -> list[str]:
+    """List the relations a plan reads in full.
+
+    With sequential scans disabled the planner falls back to walking most of
+    an index instead, so index and bitmap scans expected to visit more than
+    FULL_SCAN_FRACTION of a table count too, unless a LIMIT stops them early.
+    Index-only scans never touch the heap and are left alone.
+    """
+    scans = []
+    node_type = plan.get("Node Type")
+    if node_type == "Seq Scan":
+        if plan["Relation Name"] not in SEQ_SCAN_ALLOWED:
+            scans.append(plan["Relation Name"])
+    elif node_type in ("Index Scan", "Bitmap Index Scan") and not under_limit:
+        table, row_count = tables[plan["Index Name"]]
+        if table not in SEQ_SCAN_ALLOWED and plan["Plan Rows"] > row_count * FULL_SCAN_FRACTION:
+            scans.append(f"{table} (via {plan['Index Name']})")
+    under_limit = under_limit or node_type == "Limit"
+    for child in plan.get("Plans", []):
+        scans.extend(_full_scans(child, tables, under_limit))
+    return scans
+
+
+async def _find_full_scans() -> dict[str, list[str]]:
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        await _seed(engine)
+        statements: list[tuple[str, tuple]] = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if not executemany and statement.lstrip().upper().startswith(PLANNED_PREFIXES):
+                statements.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        await _exercise(async_sessionmaker(engine, expire_on_commit=False))
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        assert statements
+
+        offenders = {}
+        async with engine.connect() as connection:
+            await connection.exec_driver_sql("SET enable_seqscan = off")
+            # Index name -> (table name, estimated table row count)
+            result = await connection.exec_driver_sql(
+                "SELECT x.indexrelid::regclass::text, c.relname, c.reltuples"
+                " FROM pg_index x JOIN pg_class c ON c.oid = x.indrelid"
+            )
+            tables = {index: (table, row_count) for index, table, row_count in result}
+            for statement, parameters in statements:
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN (FORMAT JSON) {statement}", parameters
+                )
+                scans = _full_scans(result.scalar_one()[0]["Plan"], tables)
+                if scans:
+                    offenders[statement] = scans
+        return offenders
+    finally:
+        await engine.dispose()
+
+
+def test_repository_queries_use_indexes() -> None:
+    offenders = asyncio.run(_find_full_scans())
+    assert not offenders, "\n\n".join(
+        f"Full scan of {', '.join(tables)}:\n{statement}" for statement, tables in offenders.items()
+    )
@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.ranking import LeaderboardEntry, Leaderboards
+
+
+def test_ties_share_a_rank_and_updates_reorder_every_board() -> None:
+    boards = Leaderboards()
+    boards.load(
+        {1: 30, 2: 50, 3: 30},
+        [("family", 1), ("family", 2), ("family", 3), ("family", 4), ("group", 3)],
+    )
+    assert boards.top("family", 3) == [
+        LeaderboardEntry(1, 2, 50),
+        LeaderboardEntry(2, 1, 30),
+        LeaderboardEntry(2, 3, 30),
+    ]
+    assert boards.rank("family", 4) == LeaderboardEntry(4, 4, 0)
+
+    boards.add_points({3: 25, 5: 10})
+    assert boards.rank("family", 3) == LeaderboardEntry(1, 3, 55)
+    assert boards.rank("group", 3) == LeaderboardEntry(1, 3, 55)
+    assert boards.rank("family", 1) == LeaderboardEntry(3, 1, 30)
+    assert boards.rank("family", 5) is None
+    assert boards.top("group", 10) == [LeaderboardEntry(1, 3, 55)]
+    assert boards.top("unknown", 10) == []
+
+
+def test_a_load_read_before_added_points_does_not_overwrite_them() -> None:
+    boards = Leaderboards()
+    memberships = [("family", 1), ("family", 2)]
+    assert boards.load({1: 10, 2: 20}, memberships)
+
+    # A reload reads its snapshot, then a completion commits before it loads.
+    generation = boards.generation
+    snapshot = {1: 10, 2: 20}
+    boards.add_points({1: 15})
+    assert not boards.load(snapshot, memberships, generation)
+    assert boards.top("family", 2) == [LeaderboardEntry(1, 1, 25), LeaderboardEntry(2, 2, 20)]
+
+    # The next read includes the points and replaces the boards.
+    generation = boards.generation
+    assert boards.load({1: 25, 2: 20}, memberships + [("group", 2)], generation)
+    assert boards.top("group", 10) == [LeaderboardEntry(1, 2, 20)]
+    assert boards.rank("family", 1) == LeaderboardEntry(1, 1, 25)
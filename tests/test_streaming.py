@@ -0,0 +1,70 @@
+import asyncio
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.streaming import csv_lines, ndjson_lines
+
+
+class Item(BaseModel):
+    id: int
+
+
+class Row(BaseModel):
+    id: int
+    title: str
+    note: Optional[str] = None
+
+
+async def _batches():
+    yield [Item(id=1), Item(id=2)]
+    yield []
+    yield [Item(id=3)]
+
+
+async def _collect() -> list[bytes]:
+    return [chunk async for chunk in ndjson_lines(_batches())]
+
+
+def test_ndjson_lines_yields_one_chunk_per_non_empty_batch() -> None:
+    chunks = asyncio.run(_collect())
+    assert len(chunks) == 2
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2, 3]
+
+
+async def _rows():
+    yield [Row(id=1, title="plain, with comma"), Row(id=2, title="=SUM(A1)", note="x")]
+    yield []
+
+
+async def _no_rows():
+    return
+    yield
+
+
+async def _collect_csv(batches) -> list[bytes]:
+    return [chunk async for chunk in csv_lines(batches, Row)]
+
+
+def test_csv_lines_writes_header_and_escapes_formulas() -> None:
+    chunks = asyncio.run(_collect_csv(_rows()))
+    assert len(chunks) == 1
+    rows = list(csv.reader(io.StringIO(chunks[0].decode())))
+    assert rows == [
+        ["id", "title", "note"],
+        ["1", "plain, with comma", ""],
+        ["2", "'=SUM(A1)", "x"],
+    ]
+
+
+def test_csv_lines_writes_header_without_rows() -> None:
+    assert asyncio.run(_collect_csv(_no_rows())) == [b"id,title,note\r\n"]
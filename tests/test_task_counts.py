@@ -0,0 +1,429 @@
+"""Check the task_stats rollup and user counters against tasks, on a real Postgres database.
+
+Writes go through the repositories, as in the application, and the
+incrementally maintained counters are compared with a rebuild and with
+counts taken from ``tasks`` directly.
+
+Set TEST_DATABASE_URL to an asyncpg URL to run these tests. The public
+schema of that database is dropped and recreated.
+"""
+import asyncio
+import os
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import Date, cast, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.exceptions import UserNotFoundError
+from app.database import Base, UnitOfWork
+from app.domain.families.models import Family
+from app.domain.groups.models import Group
+from app.domain.notifications.models import Notification  # noqa: F401
+from app.domain.settings.models import Setting  # noqa: F401
+from app.domain.tasks.counters import UserTaskCountersRepository
+from app.domain.tasks.models import Task, TaskStatus, UserTaskCounter
+from app.domain.tasks.repository import TaskRepository
+from app.domain.tasks.schemas import TaskCreateSchema, TaskUpdateSchema
+from app.domain.tasks.stats import STORED_SCOPES, TaskStatScope, TaskStatsRepository
+from app.domain.users.models import User
+from app.domain.users.repository import UserRepository
+from app.domain.users.schemas import UserUpdateSchema
+
+# User id -> family id
+FAMILIES = {1: 1, 2: 1, 3: 2}
+GROUP_COUNT = 2
+STORED_COUNTERS = """
+    SELECT scope, scope_id, status, priority, count, points
+    FROM task_stats
+    WHERE count <> 0 OR points <> 0
+    ORDER BY scope, scope_id, status, priority
+"""
+
+
+async def _reset(engine) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("DROP SCHEMA public CASCADE"))
+        await connection.execute(text("CREATE SCHEMA public"))
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(
+            insert(User),
+            [{"id": user_id, "username": f"user{user_id}", "email": f"user{user_id}@example.com",
+              "hashed_password": "x"}
+             for user_id in FAMILIES],
+        )
+        await connection.execute(
+            insert(Family),
+            [{"id": family_id, "name": f"family{family_id}", "created_by": 1}
+             for family_id in set(FAMILIES.values())],
+        )
+        for user_id, family_id in FAMILIES.items():
+            await connection.execute(
+                text("UPDATE users SET family_id = :family_id WHERE id = :user_id"),
+                {"family_id": family_id, "user_id": user_id},
+            )
+        await connection.execute(
+            insert(Group),
+            [{"id": group_id, "name": f"group{group_id}", "created_by": "user1", "family_id": 1}
+             for group_id in range(1, GROUP_COUNT + 1)],
+        )
+
+
+async def _stored(engine) -> list:
+    async with engine.connect() as connection:
+        return (await connection.execute(text(STORED_COUNTERS))).all()
+
+
+async def _rebuild(session_factory, chunk_size: int = 1) -> None:
+    """Rebuild every stored scope, one range of scope ids per transaction."""
+    for scope in STORED_SCOPES:
+        async with UnitOfWork(session_factory) as unit_of_work:
+            max_scope_id = await TaskStatsRepository(unit_of_work.session).get_max_scope_id(scope)
+        for lower in range(-1, max_scope_id, chunk_size):
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await TaskStatsRepository(unit_of_work.session).rebuild(
+                    scope, lower, lower + chunk_size
+                )
+
+
+async def _assert_matches_rebuild(engine, session_factory) -> None:
+    incremental = await _stored(engine)
+    await _rebuild(session_factory)
+    assert incremental == await _stored(engine)
+
+
+async def _report_counts(session_factory, scope: TaskStatScope, scope_id: int = 0) -> list:
+    async with UnitOfWork(session_factory) as unit_of_work:
+        counts = await TaskStatsRepository(unit_of_work.session).get_counts(scope, scope_id)
+    return sorted(counts)
+
+
+async def _task_counts(engine, where: str = "true") -> list:
+    """Count tasks per (status, priority) straight from ``tasks``."""
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT CASE WHEN t.deleted_at IS NOT NULL THEN 'archived'"
+                "            ELSE t.status::text END AS bucket,"
+                "       t.priority, count(*)"
+                " FROM tasks t LEFT JOIN users u ON u.id = t.assigned_user_id"
+                f" WHERE {where}"
+                " GROUP BY 1, 2 ORDER BY 1, 2"
+            )
+        )
+        return [tuple(row) for row in result]
+
+
+def _new_task(index: int, **values) -> TaskCreateSchema:
+    values = {
+        "assigned_user_id": index % (len(FAMILIES) + 1) or None,
+        "priority": index % 3 + 1,
+        "reward_points": index,
+        **values,
+    }
+    return TaskCreateSchema(title=f"task {index}", assigned_by_user_id=1, **values)
+
+
+def test_rollup_follows_task_writes() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await _reset(engine)
+            async with UnitOfWork(session_factory) as unit_of_work:
+                repository = TaskRepository(unit_of_work.session)
+                await repository.create_many([_new_task(index) for index in range(1, 13)])
+                await repository.create(_new_task(13, status=TaskStatus.COMPLETED))
+                await repository.assign_to_groups(1, [1, 2])
+                await repository.assign_to_groups(2, [2])
+            assert await _report_counts(session_factory, TaskStatScope.USER, 1) == [
+                ("completed", 2, 1), ("pending", 1, 1), ("pending", 2, 1), ("pending", 3, 1),
+            ]
+            assert await _report_counts(session_factory, TaskStatScope.GROUP, 2) == [
+                ("pending", 2, 1), ("pending", 3, 1),
+            ]
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                repository = TaskRepository(unit_of_work.session)
+                await repository.update(1, TaskUpdateSchema(status=TaskStatus.COMPLETED, priority=5))
+                await repository.update(4, TaskUpdateSchema(assigned_user_id=3))
+                await repository.transition_many([2, 3, 5, 6], TaskStatus.IN_PROGRESS)
+                await repository.unassign_from_user(7, 3)
+                await repository.unassign_from_group(1, 1)
+                await repository.delete(8)
+                await repository.delete(9)
+                await repository.restore(9)
+            assert await _report_counts(session_factory, TaskStatScope.USER, 1) == [
+                ("completed", 2, 1), ("completed", 5, 1), ("in_progress", 3, 1), ("pending", 1, 1),
+            ]
+            assert await _report_counts(session_factory, TaskStatScope.GROUP, 1) == []
+
+            # Family counts follow a user who moves to another family.
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await UserRepository(unit_of_work.session).update(2, UserUpdateSchema(family_id=2))
+            for scope, scope_id, where in (
+                (TaskStatScope.ALL, 0, "true"),
+                (TaskStatScope.FAMILY, 1, "u.family_id = 1"),
+                (TaskStatScope.FAMILY, 2, "u.family_id = 2"),
+                (TaskStatScope.USER, 2, "t.assigned_user_id = 2"),
+            ):
+                assert await _report_counts(session_factory, scope, scope_id) == await _task_counts(
+                    engine, where
+                )
+            await _assert_matches_rebuild(engine, session_factory)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_concurrent_writes_to_the_same_tasks_do_not_drift() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await _reset(engine)
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await TaskRepository(unit_of_work.session).create_many(
+                    [_new_task(index, assigned_user_id=1) for index in range(1, 5)]
+                )
+
+            first_written = asyncio.Event()
+
+            async def update_and_hold() -> None:
+                async with UnitOfWork(session_factory) as unit_of_work:
+                    await TaskRepository(unit_of_work.session).update(
+                        3, TaskUpdateSchema(status=TaskStatus.COMPLETED, priority=3)
+                    )
+                    first_written.set()
+                    # Writers below read the rollup while this is uncommitted.
+                    await asyncio.sleep(0.3)
+
+            async def update() -> None:
+                await first_written.wait()
+                async with UnitOfWork(session_factory) as unit_of_work:
+                    await TaskRepository(unit_of_work.session).update(
+                        3, TaskUpdateSchema(status=TaskStatus.CANCELLED)
+                    )
+
+            async def transition() -> None:
+                await first_written.wait()
+                async with UnitOfWork(session_factory) as unit_of_work:
+                    await TaskRepository(unit_of_work.session).transition_many(
+                        [3, 4], TaskStatus.COMPLETED
+                    )
+
+            await asyncio.gather(update_and_hold(), update(), transition())
+            assert await _report_counts(session_factory, TaskStatScope.USER, 1) == (
+                await _task_counts(engine, "t.assigned_user_id = 1")
+            )
+            await _assert_matches_rebuild(engine, session_factory)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_deleting_a_user_uncounts_their_tasks() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await _reset(engine)
+            async with UnitOfWork(session_factory) as unit_of_work:
+                repository = TaskRepository(unit_of_work.session)
+                await repository.create_many([_new_task(index) for index in range(1, 9)])
+                await repository.assign_to_groups(2, [1])
+                await repository.transition_many([2, 6], TaskStatus.COMPLETED)
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await UserRepository(unit_of_work.session).delete(2)
+            assert await _report_counts(session_factory, TaskStatScope.USER, 2) == []
+            assert await _report_counts(session_factory, TaskStatScope.GROUP, 1) == []
+            assert await _report_counts(session_factory, TaskStatScope.FAMILY, 1) == (
+                await _task_counts(engine, "u.family_id = 1")
+            )
+            assert await _report_counts(session_factory, TaskStatScope.ALL) == (
+                await _task_counts(engine)
+            )
+            await _assert_matches_rebuild(engine, session_factory)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+async def _counters(session_factory, user_id: int) -> tuple:
+    """Return (completed tasks, points, current streak, longest streak, last completed on)."""
+    async with UnitOfWork(session_factory) as unit_of_work:
+        rows = await UserTaskCountersRepository(unit_of_work.session).get_many([user_id])
+    return tuple(rows[user_id])[1:]
+
+
+async def _move_last_completion(engine, user_id: int, days_ago: int, streak: int) -> None:
+    """Move the user's last completion back ``days_ago`` days, ending a ``streak`` day run."""
+    async with engine.begin() as connection:
+        await connection.execute(
+            update(UserTaskCounter)
+            .where(UserTaskCounter.user_id == user_id)
+            .values(
+                last_completed_on=UserTaskCounter.last_completed_on - days_ago,
+                current_streak=streak,
+                longest_streak=streak,
+            )
+        )
+
+
+def test_completion_counters_extend_and_restart_streaks() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await _reset(engine)
+            async with engine.connect() as connection:
+                # Users are in UTC unless set otherwise.
+                today = await connection.scalar(
+                    select(cast(func.timezone("UTC", func.now()), Date))
+                )
+            async with UnitOfWork(session_factory) as unit_of_work:
+                repository = TaskRepository(unit_of_work.session)
+                await repository.create_many(
+                    [_new_task(index, assigned_user_id=1) for index in range(1, 6)]
+                )
+                await repository.transition_many([1, 2], TaskStatus.COMPLETED)
+            assert await _counters(session_factory, 1) == (2, 3, 1, 1, today)
+
+            await _move_last_completion(engine, 1, days_ago=1, streak=3)
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await TaskRepository(unit_of_work.session).update(
+                    3, TaskUpdateSchema(status=TaskStatus.COMPLETED)
+                )
+            assert await _counters(session_factory, 1) == (3, 6, 4, 4, today)
+
+            # Completing again on the same day, or moving a task out of
+            # completed, leaves the streak alone.
+            async with UnitOfWork(session_factory) as unit_of_work:
+                repository = TaskRepository(unit_of_work.session)
+                await repository.update(3, TaskUpdateSchema(status=TaskStatus.COMPLETED))
+                await repository.transition_many([1], TaskStatus.PENDING)
+            assert await _counters(session_factory, 1) == (2, 5, 4, 4, today)
+
+            await _move_last_completion(engine, 1, days_ago=3, streak=4)
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await TaskRepository(unit_of_work.session).update(
+                    4, TaskUpdateSchema(status=TaskStatus.COMPLETED)
+                )
+            assert await _counters(session_factory, 1) == (3, 9, 1, 4, today)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_counter_check_repairs_drift_in_local_days() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await _reset(engine)
+            async with UnitOfWork(session_factory) as unit_of_work:
+                await TaskRepository(unit_of_work.session).create_many(
+                    [_new_task(index, assigned_user_id=1 if index <= 4 else 3)
+                     for index in range(1, 7)]
+                )
+            # Completions written behind the repository's back: three
+            # consecutive days after a gap for user 1, and one late evening
+            # completion that is already the next day in user 3's zone.
+            noon = datetime.combine(date(2026, 3, 10), time(12), timezone.utc)
+            completed_at = {
+                1: noon - timedelta(days=5),
+                2: noon - timedelta(days=2),
+                3: noon - timedelta(days=1),
+                4: noon,
+                5: noon + timedelta(hours=11),
+            }
+            async with engine.begin() as connection:
+                await connection.execute(
+                    update(User).where(User.id == 3).values(timezone="Pacific/Kiritimati")
+                )
+                for task_id, at in completed_at.items():
+                    await connection.execute(
+                        update(Task)
+                        .where(Task.id == task_id)
+                        .values(status=TaskStatus.COMPLETED, completed_at=at)
+                    )
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                counters = UserTaskCountersRepository(unit_of_work.session)
+                assert await counters.check(0, 2) == [1]
+                assert await counters.check(2, 10) == [3]
+                assert await counters.check(0, 10, repair=True) == [1, 3]
+                assert await counters.check(0, 10) == []
+            assert await _counters(session_factory, 1) == (4, 10, 3, 3, date(2026, 3, 10))
+            assert await _counters(session_factory, 3) == (1, 5, 1, 1, date(2026, 3, 11))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_bulk_writes_count_the_tasks_they_touch() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            await _reset(engine)
+            items = [
+                _new_task(1, assigned_user_id=1),
+                _new_task(2, assigned_user_id=99),
+                _new_task(3, assigned_user_id=2, status=TaskStatus.COMPLETED),
+                _new_task(4, assigned_user_id=None),
+            ]
+            with pytest.raises(UserNotFoundError):
+                async with UnitOfWork(session_factory) as unit_of_work:
+                    await TaskRepository(unit_of_work.session).create_many(items)
+            assert await _stored(engine) == []
+
+            async with UnitOfWork(session_factory) as unit_of_work:
+                results = await TaskRepository(unit_of_work.session).create_many(
+                    items, atomic=False
+                )
+            assert [result.index for result in results] == [0, 1, 2, 3]
+            assert [result.task.title if result.task else None for result in results] == [
+                "task 1", None, "task 3", "task 4",
+            ]
+            assert results[1].error == "Assigned user 99 not found"
+            completed_on = results[2].task.completed_at.date()
+            assert await _counters(session_factory, 2) == (1, 3, 1, 1, completed_on)
+            await _assert_matches_rebuild(engine, session_factory)
+
+            task_ids = [results[0].task.id, results[2].task.id, results[3].task.id]
+            async with UnitOfWork(session_factory) as unit_of_work:
+                repository = TaskRepository(unit_of_work.session)
+                await repository.delete(task_ids[2])
+                tasks = await repository.transition_many(
+                    [*reversed(task_ids), 999], TaskStatus.COMPLETED
+                )
+            # Archived and missing tasks are skipped, and an already
+            # completed task keeps its completion time.
+            assert [task.id for task in tasks] == task_ids[:2]
+            assert tasks[1].completed_at == results[2].task.completed_at
+            assert await _counters(session_factory, 1) == (1, 1, 1, 1, completed_on)
+            assert await _counters(session_factory, 2) == (1, 3, 1, 1, completed_on)
+            assert await _report_counts(session_factory, TaskStatScope.ALL) == (
+                await _task_counts(engine)
+            )
+            await _assert_matches_rebuild(engine, session_factory)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,29 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.exceptions import AppError
+
+# Load the module by path so the tasks package __init__ (and its router) is not executed
+spec = importlib.util.spec_from_file_location(
+    "task_pagination", Path("app/domain/tasks/pagination.py")
+)
+pagination = importlib.util.module_from_spec(spec)
+assert spec.loader is not None  # for mypy
+spec.loader.exec_module(pagination)
+
+
+def test_cursor_round_trip() -> None:
+    cursor = pagination.encode_cursor(12345)
+    assert "=" not in cursor
+    assert pagination.decode_cursor(cursor) == 12345
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30", "eyJpZCI6LTF9", "eyJpZCI6IngifQ"])
+def test_invalid_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(AppError):
+        pagination.decode_cursor(cursor)
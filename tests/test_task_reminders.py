@@ -0,0 +1,104 @@
+"""Sweep due-date reminders against a real Postgres database.
+
+Set TEST_DATABASE_URL to an asyncpg URL to run these tests. The public
+schema of that database is dropped and recreated.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base, UnitOfWork
+from app.domain.notifications.models import Notification
+from app.domain.settings.models import Setting  # noqa: F401
+from app.domain.tasks.models import Task, TaskStatus
+from app.domain.tasks.reminders import ReminderKind, TaskReminderRepository, TaskReminderService
+from app.domain.users.models import User
+
+
+def test_new_and_rescheduled_due_dates_are_reminded_once() -> None:
+    async def run() -> None:
+        engine = create_async_engine(TEST_DATABASE_URL)
+        now = datetime.now(timezone.utc)
+        async with engine.begin() as connection:
+            await connection.execute(text("DROP SCHEMA public CASCADE"))
+            await connection.execute(text("CREATE SCHEMA public"))
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(
+                insert(User).values(id=1, username="user1", email="user1@example.com",
+                                    hashed_password="x")
+            )
+
+        async def add_task(task_id: int, due_date: datetime, **values) -> None:
+            async with engine.begin() as connection:
+                values = {"status": TaskStatus.PENDING, "assigned_user_id": 1, **values}
+                await connection.execute(
+                    insert(Task).values(
+                        id=task_id, title=f"task {task_id}", due_date=due_date,
+                        created_at=now, updated_at=now, **values,
+                    )
+                )
+
+        async def reschedule(task_id: int, due_date: datetime) -> None:
+            async with engine.begin() as connection:
+                await connection.execute(
+                    update(Task).where(Task.id == task_id).values(due_date=due_date)
+                )
+
+        service = TaskReminderService(
+            TaskReminderRepository,
+            UnitOfWork(async_sessionmaker(engine, expire_on_commit=False)),
+            lead_time=timedelta(hours=24),
+            batch_size=1,
+        )
+
+        async def sweep() -> dict:
+            return {kind: await service.sweep(kind) for kind in ReminderKind}
+
+        try:
+            await add_task(1, now + timedelta(hours=2))
+            await add_task(2, now + timedelta(days=3))
+            await add_task(3, now + timedelta(hours=3), status=TaskStatus.CANCELLED)
+            await add_task(4, now + timedelta(hours=4), assigned_user_id=None)
+            assert await sweep() == {ReminderKind.DUE_SOON: 1, ReminderKind.OVERDUE: 0}
+            assert await sweep() == {ReminderKind.DUE_SOON: 0, ReminderKind.OVERDUE: 0}
+
+            # Due before the task reminded last, which a due-date high-water
+            # mark would have skipped.
+            await add_task(5, now + timedelta(hours=1))
+            await reschedule(2, now + timedelta(hours=5))
+            assert await sweep() == {ReminderKind.DUE_SOON: 2, ReminderKind.OVERDUE: 0}
+
+            # Moved into the past: overdue, but no longer due soon.
+            await reschedule(1, now - timedelta(hours=1))
+            await add_task(6, now - timedelta(minutes=5))
+            assert await sweep() == {ReminderKind.DUE_SOON: 0, ReminderKind.OVERDUE: 2}
+            assert await sweep() == {ReminderKind.DUE_SOON: 0, ReminderKind.OVERDUE: 0}
+
+            async with engine.connect() as connection:
+                messages = (
+                    await connection.execute(select(Notification.message).order_by(Notification.id))
+                ).scalars().all()
+            assert messages == [
+                'Task "task 1" is due soon',
+                'Task "task 5" is due soon',
+                'Task "task 2" is due soon',
+                'Task "task 1" is overdue',
+                'Task "task 6" is overdue',
+            ]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.timezones import TimezoneName
+
+
+class Profile(BaseModel):
+    timezone: TimezoneName
+
+
+@pytest.mark.parametrize(
+    "name", ["right/UTC", "posix/Europe/Berlin", "posixrules", "localtime", "Factory", "Mars/Olympus"]
+)
+def test_names_postgres_does_not_list_are_rejected(name: str) -> None:
+    with pytest.raises(ValidationError, match="Unknown time zone"):
+        Profile(timezone=name)
+
+
+@pytest.mark.parametrize("name", ["Europe/Berlin", "UTC", "America/New_York"])
+def test_iana_zone_names_are_accepted(name: str) -> None:
+    assert Profile(timezone=name).timezone == name
@@ -0,0 +1,44 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.work_queue import WorkQueue, queue_stats
+
+
+def test_keys_are_coalesced_batched_and_drained() -> None:
+    batches = []
+
+    async def handler(keys) -> None:
+        await asyncio.sleep(0)
+        if 99 in keys:
+            raise RuntimeError("boom")
+        batches.append(keys)
+
+    async def run() -> None:
+        queue = WorkQueue("test-queue", handler, workers=1, batch_size=2, max_pending=3)
+        queue.put_many([1, 2, 1, 3, 4])
+        queue.start()
+        await queue.drain(timeout=1)
+        queue.put_many([5])
+        assert batches == [[1, 2], [3]]
+        assert queue_stats()["test-queue"] == {
+            "enqueued": 3,
+            "coalesced": 1,
+            "dropped": 2,
+            "processed": 3,
+            "failed": 0,
+            "batches": 2,
+            "peak_pending": 3,
+            "pending": 0,
+            "in_flight": 0,
+        }
+
+        queue.start()
+        queue.put_many([99, 6])
+        await queue.drain(timeout=1)
+        assert queue.stats.failed == 2
+        assert not queue.in_flight and not len(queue)
+
+    asyncio.run(run())